@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark Suite for Project Sentinel
+=====================================
+
+Measures every @algorithm-tagged detection function and every
+EventDetector stage (load, fraud, queue, inventory, anomaly, save) over
+generated datasets at several scales. For each measurement it reports
+throughput (records/s), wall and CPU time, peak RSS, Python peak
+allocation (tracemalloc) and allocated block counts, writes the results
+as JSON and compares them against a stored baseline to flag regressions.
+
+With --compare-backends it instead times a full detection pass with the
+python and pandas backends and checks that the pandas backend is at least
+MIN_BACKEND_SPEEDUP times faster. The python vision matcher is quadratic
+per station, so the gap widens with scale: check it at scale 50 or more,
+where it is about 30x.
+
+Usage:
+    python benchmark.py --scales 1,10
+    python benchmark.py --scales 1,10 --save-baseline
+    python benchmark.py --scales 1,10 --fail-on-regression
+    python benchmark.py --scales 10 --backend pandas --skip-algorithms
+    python benchmark.py --scales 50 --compare-backends
+
+Scale 1 approximates the competition dataset (5 stations, 2 hours).
+"""
+
+import contextlib
+import gc
+import inspect
+import io
+import json
+import math
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from event_detector import EventDetector, BACKENDS
+from algorithms import fraud_detection, queue_analyzer, inventory_monitor, anomaly_detector
+from algorithms.inventory_monitor import analyze_inventory_velocity
+from utils.data_generator import GeneratorConfig, generate_dataset
+
+
+BENCHMARK_DIR = Path(__file__).parent / "benchmarks"
+ALGORITHM_MODULES = [fraud_detection, queue_analyzer, inventory_monitor, anomaly_detector]
+
+# Timing differences below this are treated as noise when comparing to the baseline
+NOISE_FLOOR_SECONDS = 0.005
+
+# Required speedup of the pandas backend's detection pass over the python backend
+MIN_BACKEND_SPEEDUP = 20.0
+
+
+class Colors:
+    OK = '\033[92m'
+    WARN = '\033[93m'
+    FAIL = '\033[91m'
+    INFO = '\033[94m'
+    END = '\033[0m'
+
+
+def print_ok(msg):
+    print(f"{Colors.OK}[OK]{Colors.END} {msg}")
+
+
+def print_warn(msg):
+    print(f"{Colors.WARN}[WARN]{Colors.END} {msg}")
+
+
+def print_info(msg):
+    print(f"{Colors.INFO}[INFO]{Colors.END} {msg}")
+
+
+def discover_algorithms() -> List[Tuple[str, str, Callable]]:
+    """
+    Find all functions tagged with '# @algorithm' in the algorithm modules.
+
+    Returns:
+        List of (module name, algorithm title, function) tuples
+    """
+    tag = re.compile(r'^# @algorithm ([^|\n]+)\|[^\n]*\ndef (\w+)\(', re.MULTILINE)
+    found = []
+    for module in ALGORITHM_MODULES:
+        source = inspect.getsource(module)
+        for title, func_name in tag.findall(source):
+            found.append((module.__name__.split('.')[-1], title.strip(), getattr(module, func_name)))
+    return found
+
+
+def scale_config(scale: float) -> GeneratorConfig:
+    """
+    Generator configuration for a scale factor relative to the competition data.
+
+    Volume grows linearly with the scale, split between more stations and
+    longer runs so per-station and cross-station costs both show up.
+    """
+    base = GeneratorConfig()
+    stations = max(base.stations, int(round(base.stations * math.sqrt(scale))))
+    hours = base.hours * scale * base.stations / stations
+    return GeneratorConfig(
+        stations=stations,
+        hours=hours,
+        crashes=max(1, int(base.crashes * scale)),
+        queue_incidents=max(1, int(base.queue_incidents * scale))
+    )
+
+
+def prepare_dataset(scale: float, data_root: Path) -> Path:
+    """Generate (or reuse) the dataset for a scale factor."""
+    config = scale_config(scale)
+    data_dir = data_root / f"scale_{scale:g}"
+    config_file = data_dir / 'generator_config.json'
+    if config_file.exists():
+        with open(config_file, 'r', encoding='utf-8') as f:
+            if json.load(f) == json.loads(json.dumps(config.__dict__)):
+                return data_dir
+    print_info(f"Generating scale {scale:g} dataset ({config.stations} stations, {config.hours:g} hours)...")
+    generate_dataset(str(data_dir), config)
+    return data_dir
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter for this process (Linux only)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process in bytes, or None if unavailable."""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource  # Unix only
+    except ImportError:
+        try:
+            import psutil  # optional; on Windows the peak is the working set's
+        except ImportError:
+            return None
+        return getattr(psutil.Process().memory_info(), 'peak_wset', None)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _count_records(value: Any) -> int:
+    """Number of records in an input or output value."""
+    if isinstance(value, (list, tuple, dict, set)):
+        return len(value)
+    return 1 if value is not None else 0
+
+
+def measure(func: Callable[[], Any], records_in: int, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Measure one callable.
+
+    Timing and peak RSS come from the fastest of repeat plain runs, so both
+    describe the same run; Python allocation statistics come from a further
+    run under tracemalloc, which would otherwise distort timing. Peak RSS is
+    only reset between runs on Linux; elsewhere it is the process-wide peak
+    so far.
+
+    Args:
+        func: Zero-argument callable to measure
+        records_in: Number of input records, for throughput
+        repeat: Number of timed runs; the fastest is reported
+
+    Returns:
+        Dictionary of measurements
+    """
+    wall = cpu = None
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        _reset_peak_rss()
+        gen0_before = gc.get_stats()[0]['collections']
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        result = func()
+        run_wall = time.perf_counter() - wall_start
+        run_cpu = time.process_time() - cpu_start
+        if wall is None or run_wall < wall:
+            wall, cpu = run_wall, run_cpu
+            gen0_collections = gc.get_stats()[0]['collections'] - gen0_before
+            peak_rss = _peak_rss_bytes()
+        records_out = _count_records(result)
+        del result
+
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = func()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated_blocks = sys.getallocatedblocks() - blocks_before
+    del result
+
+    return {
+        'records_in': records_in,
+        'records_out': records_out,
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'throughput_rps': records_in / wall if wall > 0 else None,
+        'peak_rss_bytes': peak_rss,
+        'traced_peak_bytes': traced_peak,
+        'allocated_blocks': allocated_blocks,
+        'gc_gen0_collections': gen0_collections
+    }
+
+
+def build_algorithm_inputs(detector: EventDetector) -> Dict[str, Any]:
+    """
+    Map algorithm parameter names to inputs derived from a loaded detector.
+
+    Returns:
+        Dictionary of parameter name -> argument value
+    """
+    pos = detector.pos_transactions
+    queue = detector.queue_monitoring
+    snapshots = detector.inventory_snapshots
+    initial = snapshots[0] if snapshots else None
+    final = snapshots[-1] if snapshots else None
+
+    sold = {}
+    for transaction in pos:
+        sold[transaction.sku] = sold.get(transaction.sku, 0) + 1
+
+    return {
+        'pos_transactions': pos,
+        'rfid_readings': detector.rfid_readings,
+        'vision_predictions': detector.product_recognitions,
+        'products_catalog': detector.products_catalog,
+        'queue_data': queue,
+        'all_events': detector.build_station_timeline(),
+        'initial_snapshot': initial,
+        'final_snapshot': final,
+        'inventory': final,
+        'inventory_snapshots': snapshots,
+        'velocity': analyze_inventory_velocity(snapshots, pos),
+        'inventory_changes': ({sku: final.inventory.get(sku, 0) - qty
+                               for sku, qty in initial.inventory.items()} if initial else {}),
+        'expected_changes': {sku: -count for sku, count in sold.items()},
+        'metrics': [q.average_dwell_time for q in queue],
+        'metric1': [q.customer_count for q in queue],
+        'metric2': [q.average_dwell_time for q in queue],
+        'time_series': [(q.timestamp, float(q.customer_count)) for q in queue],
+        'transactions': [{'timestamp': t.timestamp, 'price': t.price, 'weight_g': t.weight_g}
+                         for t in pos],
+        'baseline_metrics': {'min_price': 50.0, 'max_price': 5000.0}
+    }
+
+
+def benchmark_algorithms(detector: EventDetector, repeat: int = 3) -> Dict[str, Dict]:
+    """Measure every @algorithm-tagged function on the detector's data."""
+    inputs = build_algorithm_inputs(detector)
+    results = {}
+    for module_name, title, func in discover_algorithms():
+        params = inspect.signature(func).parameters
+        required = [p for p in params.values() if p.default is inspect.Parameter.empty]
+        missing = [p.name for p in required if p.name not in inputs or inputs[p.name] is None]
+        if missing:
+            print_warn(f"Skipping {func.__name__}: no input for {', '.join(missing)}")
+            continue
+        kwargs = {p.name: inputs[p.name] for p in required}
+        records_in = sum(_count_records(v) for v in kwargs.values())
+        results[f"{module_name}.{func.__name__}"] = {
+            'title': title,
+            **measure(lambda: func(**kwargs), records_in, repeat)
+        }
+    return results
+
+
+def benchmark_stages(data_dir: Path, output_dir: Path, repeat: int = 3,
+                     backend: str = 'python') -> Tuple[Dict[str, Dict], EventDetector]:
+    """Measure each EventDetector stage on a dataset with the given detector backend."""
+    results = {}
+    output_file = output_dir / 'events.jsonl'
+
+    def fresh_detector() -> EventDetector:
+        detector = EventDetector(str(data_dir), backend=backend)
+        with contextlib.redirect_stdout(io.StringIO()):
+            detector.load_data()
+        return detector
+
+    detector = fresh_detector()
+    input_records = (len(detector.pos_transactions) + len(detector.rfid_readings)
+                     + len(detector.product_recognitions) + len(detector.queue_monitoring)
+                     + len(detector.inventory_snapshots))
+
+    def run_load():
+        d = EventDetector(str(data_dir), backend=backend)
+        d.load_data()
+        return d.pos_transactions + d.rfid_readings + d.product_recognitions + d.queue_monitoring
+
+    def stage_runner(method_name: str) -> Callable[[], List]:
+        def run():
+            detector.detected_events = []
+            getattr(detector, method_name)()
+            return detector.detected_events
+        return run
+
+    stages = [
+        ('load', run_load, input_records),
+        ('fraud', stage_runner('run_fraud_detection'),
+         len(detector.pos_transactions) + len(detector.rfid_readings) + len(detector.product_recognitions)),
+        ('queue', stage_runner('run_queue_analysis'), len(detector.queue_monitoring)),
+        ('inventory', stage_runner('run_inventory_monitoring'),
+         len(detector.inventory_snapshots) + len(detector.pos_transactions)),
+        ('anomaly', stage_runner('run_anomaly_detection'),
+         len(detector.pos_transactions) + len(detector.rfid_readings) + len(detector.queue_monitoring)),
+    ]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, func, records_in in stages:
+            results[name] = measure(func, records_in, repeat)
+
+        # Save needs the full event list
+        detector.detected_events = []
+        detector.run_all_detections()
+        events = list(detector.detected_events)
+
+        def run_save():
+            detector.detected_events = events
+            detector.save_events(str(output_file))
+            return events
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        results['save'] = measure(run_save, len(events), repeat)
+
+    return results, detector
+
+
+def compare_backends(data_dir: Path, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Time a full detection pass (all stages, data already loaded) per backend.
+
+    The pandas backend reports the fastest of repeat runs; the python
+    backend runs once, as it is long enough that noise does not matter.
+
+    Returns:
+        Dictionary of wall seconds per backend and the pandas speedup
+    """
+    seconds = {}
+    for backend in BACKENDS:
+        detector = EventDetector(str(data_dir), backend=backend)
+        with contextlib.redirect_stdout(io.StringIO()):
+            detector.load_data()
+            for _ in range(max(1, repeat) if backend == 'pandas' else 1):
+                detector.detected_events = []
+                gc.collect()
+                started = time.perf_counter()
+                detector.run_all_detections()
+                elapsed = time.perf_counter() - started
+                seconds[backend] = min(elapsed, seconds.get(backend, elapsed))
+        del detector
+    return {
+        'python_seconds': round(seconds['python'], 4),
+        'pandas_seconds': round(seconds['pandas'], 4),
+        'speedup': round(seconds['python'] / seconds['pandas'], 2)
+    }
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare wall times with a baseline run.
+
+    Returns:
+        List of human-readable regression descriptions
+    """
+    regressions = []
+    for scale, scale_results in results['scales'].items():
+        base_scale = baseline.get('scales', {}).get(scale)
+        if not base_scale:
+            continue
+        for kind in ('stages', 'algorithms'):
+            for name, current in scale_results[kind].items():
+                previous = base_scale.get(kind, {}).get(name)
+                if not previous:
+                    continue
+                slower = current['wall_seconds'] - previous['wall_seconds']
+                if (slower > NOISE_FLOOR_SECONDS
+                        and current['wall_seconds'] > previous['wall_seconds'] * (1 + tolerance)):
+                    ratio = current['wall_seconds'] / previous['wall_seconds']
+                    regressions.append(
+                        f"scale {scale} {kind[:-1]} {name}: {previous['wall_seconds']:.4f}s -> "
+                        f"{current['wall_seconds']:.4f}s ({ratio:.2f}x)"
+                    )
+    return regressions
+
+
+def print_table(title: str, rows: Dict[str, Dict]):
+    """Print measurements as an aligned table."""
+    print(f"\n{title}")
+    print("-" * 110)
+    print(f"{'name':<50}{'records':>10}{'wall s':>10}{'cpu s':>10}{'rec/s':>12}{'peak RSS MB':>12}{'py peak MB':>11}")
+    print("-" * 110)
+    for name, m in rows.items():
+        throughput = f"{m['throughput_rps']:,.0f}" if m['throughput_rps'] else '-'
+        peak_rss = f"{m['peak_rss_bytes'] / 1e6:.1f}" if m['peak_rss_bytes'] is not None else '-'
+        print(f"{name:<50}{m['records_in']:>10,}{m['wall_seconds']:>10.4f}{m['cpu_seconds']:>10.4f}"
+              f"{throughput:>12}{peak_rss:>12}{m['traced_peak_bytes'] / 1e6:>11.2f}")
+
+
+def run_backend_comparison(scales: List[float], data_root: Path, repeat: int) -> int:
+    """Check the pandas backend's speedup at each scale; 1 if any falls short."""
+    slow = 0
+    for scale in scales:
+        data_dir = prepare_dataset(scale, data_root)
+        print_info(f"Comparing backends at scale {scale:g} ({data_dir})")
+        comparison = compare_backends(data_dir, repeat)
+        summary = (f"scale {scale:g}: python {comparison['python_seconds']:.2f}s, "
+                   f"pandas {comparison['pandas_seconds']:.2f}s, {comparison['speedup']:.1f}x")
+        if comparison['speedup'] >= MIN_BACKEND_SPEEDUP:
+            print_ok(summary)
+        else:
+            print_warn(f"{summary} (expected at least {MIN_BACKEND_SPEEDUP:g}x)")
+            slow += 1
+    return 1 if slow else 0
+
+
+def main():
+    """Main benchmark function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Project Sentinel Benchmark Suite')
+    parser.add_argument('--scales', default='1,10',
+                        help='Comma-separated scale factors relative to the competition data (default: 1,10)')
+    parser.add_argument('--data-dir', default=str(BENCHMARK_DIR / 'data'),
+                        help='Where generated datasets are cached')
+    parser.add_argument('--output', default=str(BENCHMARK_DIR / 'results.json'),
+                        help='Machine-readable results file')
+    parser.add_argument('--baseline', default=str(BENCHMARK_DIR / 'baseline.json'),
+                        help='Baseline results to compare against')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store these results as the new baseline')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per measurement; the fastest is reported (default: 3)')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed slowdown before flagging a regression (default: 0.2 = 20%%)')
+    parser.add_argument('--skip-algorithms', action='store_true',
+                        help='Only benchmark EventDetector stages')
+    parser.add_argument('--backend', choices=BACKENDS, default='python',
+                        help='EventDetector backend to measure (default: python)')
+    parser.add_argument('--compare-backends', action='store_true',
+                        help=f'Only check that the pandas backend is at least {MIN_BACKEND_SPEEDUP:g}x '
+                             f'faster than the python backend (exit 1 if not)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 when a regression is found')
+
+    args = parser.parse_args()
+    scales = [float(s) for s in args.scales.split(',') if s.strip()]
+
+    print("\n" + "=" * 70)
+    print("PROJECT SENTINEL - BENCHMARK SUITE")
+    print("=" * 70)
+
+    results = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'repeat': args.repeat,
+        'platform': sys.platform,
+        'backend': args.backend,
+        'scales': {}
+    }
+
+    if args.compare_backends:
+        return run_backend_comparison(scales, Path(args.data_dir), args.repeat)
+
+    for scale in scales:
+        data_dir = prepare_dataset(scale, Path(args.data_dir))
+        print_info(f"Benchmarking scale {scale:g} ({data_dir})")
+
+        stage_results, detector = benchmark_stages(data_dir, Path(args.data_dir) / f"scale_{scale:g}_output",
+                                                  args.repeat, args.backend)
+        algorithm_results = {} if args.skip_algorithms else benchmark_algorithms(detector, args.repeat)
+
+        results['scales'][f"{scale:g}"] = {
+            'stages': stage_results,
+            'algorithms': algorithm_results
+        }
+        print_table(f"Scale {scale:g} - EventDetector stages", stage_results)
+        if algorithm_results:
+            print_table(f"Scale {scale:g} - @algorithm functions", algorithm_results)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print()
+    print_ok(f"Results written to: {output}")
+
+    regressions = []
+    baseline_file = Path(args.baseline)
+    if args.save_baseline:
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print_ok(f"Baseline saved to: {baseline_file}")
+    elif baseline_file.exists():
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        # Baselines written before --backend existed measured the python backend
+        baseline_backend = baseline.get('backend', 'python')
+        if baseline_backend != args.backend:
+            print_warn(f"Baseline {baseline_file} measured the {baseline_backend} backend, not "
+                       f"{args.backend}; skipping the comparison")
+        else:
+            regressions = compare_to_baseline(results, baseline, args.tolerance)
+            if regressions:
+                print_warn(f"{len(regressions)} regression(s) against {baseline_file}:")
+                for regression in regressions:
+                    print(f"  - {regression}")
+            else:
+                print_ok(f"No regressions against {baseline_file}")
+    else:
+        print_info("No baseline found; run with --save-baseline to create one")
+
+    return 1 if (regressions and args.fail_on_regression) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -93,8 +93,8 @@ def setup_environment():
         return False
 
 
-def run_event_detection(data_dir, output_dir):
-    """Run event detection on input data"""
+def run_event_detection(data_dir, output_dir, profile=False):
+    """Run event detection on input data, optionally under the profiler"""
     print_header("RUNNING EVENT DETECTION")
     
     # Get paths - go up two levels from executables to Team01_sentinel root
@@ -113,41 +113,40 @@ def run_event_detection(data_dir, output_dir):
     print_info(f"Output file: {output_file}")
     
     try:
-        # Run detector
-        cmd = [
-            sys.executable,
-            str(detector_script),
-            '--data-dir', str(data_dir),
-            '--output', str(output_file)
-        ]
+        # Run detector in-process instead of spawning a second interpreter
+        src_dir = str(detector_script.parent)
+        if src_dir not in sys.path:
+            sys.path.insert(0, src_dir)
+        from event_detector import EventDetector
+        from utils.profiling import RunProfiler
         
-        print_info("Running detection algorithms...")
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        profiler = None
+        if profile:
+            profiler = RunProfiler()
+            profiler.start()
         
-        # Print output
-        if result.stdout:
-            print(result.stdout)
+        print_info("Running detection algorithms...")
+        detector = EventDetector(str(data_dir), profiler=profiler)
+        try:
+            detector.detect(str(output_file))
+        finally:
+            if profiler is not None:
+                profiler.stop()
+                paths = profiler.save(str(output_dir / 'profile'))
+                print_info(f"Profile saved to: {paths['pstats']}")
+                print_info(f"Collapsed stacks saved to: {paths['collapsed']}")
         
         if output_file.exists():
             print_success(f"Events generated successfully: {output_file}")
-            
-            # Count events
-            with open(output_file, 'r') as f:
-                event_count = sum(1 for line in f if line.strip())
-            print_info(f"Total events detected: {event_count}")
+            print_info(f"Total events detected: {len(detector.detected_events)}")
             
             return True
         else:
             print_error("Output file was not created")
             return False
             
-    except subprocess.CalledProcessError as e:
-        print_error(f"Event detection failed: {e}")
-        if e.stderr:
-            print(e.stderr)
-        return False
     except Exception as e:
-        print_error(f"Unexpected error: {e}")
+        print_error(f"Event detection failed: {e}")
         return False
 
 
@@ -180,22 +179,21 @@ def generate_summary_report(output_dir):
     report_file = output_dir / 'summary_report.txt'
     
     try:
-        # Load events
-        events = []
+        # Analyze events in one streaming pass
+        total_events = 0
+        event_counts = Counter()
+        event_names = Counter()
+        stations = set()
         with open(events_file, 'r') as f:
             for line in f:
-                if line.strip():
-                    events.append(json.loads(line))
-        
-        # Analyze events
-        event_counts = Counter(e['event_id'] for e in events)
-        event_names = Counter(e['event_data'].get('event_name', 'Unknown') for e in events)
-        
-        # Station analysis
-        stations = set()
-        for e in events:
-            if 'station_id' in e['event_data']:
-                stations.add(e['event_data']['station_id'])
+                if not line.strip():
+                    continue
+                e = json.loads(line)
+                total_events += 1
+                event_counts[e['event_id']] += 1
+                event_names[e['event_data'].get('event_name', 'Unknown')] += 1
+                if 'station_id' in e['event_data']:
+                    stations.add(e['event_data']['station_id'])
         
         # Generate report
         with open(report_file, 'w') as f:
@@ -203,7 +201,7 @@ def generate_summary_report(output_dir):
             f.write("PROJECT SENTINEL - EVENT DETECTION SUMMARY\n")
             f.write("="*70 + "\n\n")
             
-            f.write(f"Total Events Detected: {len(events)}\n")
+            f.write(f"Total Events Detected: {total_events}\n")
             f.write(f"Unique Stations: {len(stations)}\n\n")
             
             f.write("Event Distribution by ID:\n")
@@ -224,7 +222,7 @@ def generate_summary_report(output_dir):
         print("\n" + "="*70)
         print("EVENT SUMMARY")
         print("="*70)
-        print(f"Total Events: {len(events)}")
+        print(f"Total Events: {total_events}")
         print(f"Unique Stations: {len(stations)}")
         print("\nEvent Distribution:")
         for event_id, count in sorted(event_counts.items()):
@@ -287,6 +285,9 @@ Examples:
   
   # Run and launch dashboard
   python3 run_demo.py --launch-dashboard
+  
+  # Profile the detection run (pstats + collapsed stacks in results/profile/)
+  python3 run_demo.py --profile
         """
     )
     
@@ -317,6 +318,12 @@ Examples:
         help='Dataset type for evidence folder (default: test)'
     )
     
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Profile event detection and write pstats and collapsed-stack files'
+    )
+    
     args = parser.parse_args()
     
     # Setup paths
@@ -356,7 +363,7 @@ Examples:
         sys.exit(1)
     
     # Step 2: Run event detection
-    if not run_event_detection(data_dir, output_dir):
+    if not run_event_detection(data_dir, output_dir, profile=args.profile):
         print_error("Event detection failed!")
         sys.exit(1)
     
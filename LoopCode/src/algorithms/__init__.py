@@ -7,6 +7,8 @@ This package contains all detection algorithms organized by category:
 - queue_analyzer: Queue management and analysis algorithms
 - inventory_monitor: Inventory tracking and reconciliation algorithms
 - anomaly_detector: System anomaly and pattern detection algorithms
+- vectorized: pandas versions of the detectors (EventDetector backend='pandas',
+  imported on demand)
 
 Author: Team 01
 Date: October 2025
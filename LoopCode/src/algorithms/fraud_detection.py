@@ -88,7 +88,9 @@ def detect_scanner_avoidance_rfid(rfid_readings: List[RFIDReading],
 # @algorithm Vision-Based Scanner Avoidance Detection | Detect items seen by vision system but not scanned at POS
 def detect_scanner_avoidance_vision(vision_predictions: List[ProductRecognition],
                                    pos_transactions: List[POSTransaction],
-                                   confidence_threshold: float = 0.70) -> List[DetectedEvent]:
+                                   confidence_threshold: float = 0.70,
+                                   window_before_seconds: float = 5.0,
+                                   window_after_seconds: float = 10.0) -> List[DetectedEvent]:
     """
     Detect scanner avoidance using vision system predictions.
     
@@ -108,10 +110,15 @@ def detect_scanner_avoidance_vision(vision_predictions: List[ProductRecognition]
     - Look back 5s: Customer may scan before vision system confirms
     - Look ahead 10s: Vision may detect before customer finishes scanning
     
+    Aggregated bursts (see utils.ingestion.aggregate_vision_bursts) are
+    matched once, with the window running to 10s after the last frame.
+    
     Args:
         vision_predictions: List of vision system predictions
         pos_transactions: List of POS transactions
         confidence_threshold: Minimum confidence to consider (default 0.70)
+        window_before_seconds: Look-back of the matching window (default 5s)
+        window_after_seconds: Look-ahead of the matching window (default 10s)
         
     Returns:
         List of detected scanner avoidance events
@@ -131,8 +138,9 @@ def detect_scanner_avoidance_vision(vision_predictions: List[ProductRecognition]
         predicted_sku = prediction.predicted_product
         
         # Define time window: -5 seconds to +10 seconds from vision detection
-        window_start = vision_time - timedelta(seconds=5)
-        window_end = vision_time + timedelta(seconds=10)
+        last_seen = datetime.fromisoformat(prediction.last_seen) if prediction.last_seen else vision_time
+        window_start = vision_time - timedelta(seconds=window_before_seconds)
+        window_end = last_seen + timedelta(seconds=window_after_seconds)
         
         # Search for matching POS transaction
         matching_found = False
@@ -164,7 +172,8 @@ def detect_scanner_avoidance_vision(vision_predictions: List[ProductRecognition]
 # @algorithm Barcode Switching Detection | Detect when a customer scans a different product barcode than what was detected
 def detect_barcode_switching(pos_transactions: List[POSTransaction],
                              vision_predictions: List[ProductRecognition],
-                             products_catalog: Dict[str, Dict]) -> List[DetectedEvent]:
+                             products_catalog: Dict[str, Dict],
+                             accuracy_threshold: float = 0.85) -> List[DetectedEvent]:
     """
     Detect barcode switching by comparing vision system predictions with POS scans.
     
@@ -177,15 +186,13 @@ def detect_barcode_switching(pos_transactions: List[POSTransaction],
         pos_transactions: List of POS transactions
         vision_predictions: List of vision system predictions
         products_catalog: Product catalog with SKU information
+        accuracy_threshold: Minimum vision accuracy for a reliable prediction
         
     Returns:
         List of detected barcode switching events
     """
     events = []
     
-    # Accuracy threshold for considering vision prediction reliable
-    ACCURACY_THRESHOLD = 0.85
-    
     # Group by station for comparison
     pos_by_station = {}
     for transaction in pos_transactions:
@@ -211,7 +218,7 @@ def detect_barcode_switching(pos_transactions: List[POSTransaction],
         
         # Simple matching: compare sequential items
         for i, prediction in enumerate(predictions):
-            if prediction.accuracy >= ACCURACY_THRESHOLD and i < len(transactions):
+            if prediction.accuracy >= accuracy_threshold and i < len(transactions):
                 transaction = transactions[i]
                 
                 # Check if predicted product differs from scanned product
@@ -0,0 +1,495 @@
+"""
+Vectorized Detection Algorithms
+===============================
+
+pandas implementations of the E000-E009 detectors, used by EventDetector
+when it runs with backend='pandas'. Every function takes the same
+arguments as its pure-Python counterpart and returns the same events in
+the same order, so both backends write identical events.jsonl files.
+
+The decisions are made on whole columns: threshold masks for the queue
+detectors, merge_asof for matching vision predictions to POS scans,
+groupby counts for inventory reconciliation and groupby diffs for the
+gaps behind system crashes. Events are then created from the original
+records, so every field keeps its original Python value.
+
+Inside a shared_frames() block, the DataFrame of each input list is
+built once and reused by every detector that reads it.
+
+Author: Team 01
+Date: October 2025
+"""
+
+import contextlib
+import sys
+import threading
+from operator import attrgetter
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_models import (DetectedEvent, POSTransaction, RFIDReading,
+                         ProductRecognition, QueueMonitoring, InventorySnapshot)
+
+# Columns taken from each record type
+POS_FIELDS = ('timestamp', 'station_id', 'status', 'sku', 'weight_g')
+RFID_FIELDS = ('station_id', 'sku')
+VISION_FIELDS = ('timestamp', 'station_id', 'predicted_product', 'accuracy', 'last_seen')
+QUEUE_FIELDS = ('station_id', 'customer_count', 'average_dwell_time')
+
+# Fields held as float64 columns; the rest stay Python objects
+NUMERIC_FIELDS = {'weight_g', 'accuracy', 'customer_count', 'average_dwell_time'}
+
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def shared_frames():
+    """Reuse the DataFrame of an input list across detectors run inside the block."""
+    previous = getattr(_local, 'frames', None)
+    if previous is None:
+        _local.frames = {}
+    try:
+        yield
+    finally:
+        _local.frames = previous
+
+
+def records_frame(records: Sequence, fields: Tuple[str, ...]) -> pd.DataFrame:
+    """
+    DataFrame with one column per field of a list of records.
+
+    Args:
+        records: Data model instances
+        fields: Attributes to take as columns
+
+    Returns:
+        DataFrame whose row i is records[i]
+    """
+    cache = getattr(_local, 'frames', None)
+    key = (id(records), fields)
+    if cache is not None and key in cache and cache[key][0] is records:
+        return cache[key][1]
+    columns = {}
+    for field in fields:
+        values = list(map(attrgetter(field), records))
+        if field in NUMERIC_FIELDS:
+            columns[field] = np.array(values, dtype=float)
+        else:
+            columns[field] = pd.Series(values, dtype=object)
+    frame = pd.DataFrame(columns, columns=list(fields))
+    if cache is not None:
+        # The list is kept alongside so its id cannot be reused while cached
+        cache[key] = (records, frame)
+    return frame
+
+
+def _times(frame: pd.DataFrame, column: str = 'timestamp') -> pd.Series:
+    """Parsed timestamps of a column (NaT where missing or malformed)."""
+    # One unit for every column: pandas infers it per column (seconds when empty)
+    return pd.to_datetime(frame[column], format='ISO8601', errors='coerce').astype('datetime64[ns]')
+
+
+def _pairs_in(left: pd.DataFrame, right: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """Mask of left rows whose values in columns appear together in some right row."""
+    keys = right[columns].drop_duplicates()
+    merged = left[columns].merge(keys, on=columns, how='left', indicator=True)
+    return (merged['_merge'] == 'both').to_numpy()
+
+
+def _station_order(stations: pd.Series, rows: np.ndarray) -> np.ndarray:
+    """Rows ordered by their station's first appearance, then by position."""
+    codes, _ = pd.factorize(stations, use_na_sentinel=False)
+    return rows[np.argsort(codes[rows], kind='stable')]
+
+
+def _expected_weights(frame: pd.DataFrame, products_catalog: Dict[str, Dict]) -> pd.Series:
+    """Catalog weight of each row's SKU (NaN when not in the catalog)."""
+    weights = {sku: info['weight'] for sku, info in products_catalog.items()}
+    return frame['sku'].map(weights).astype(float)
+
+
+def detect_scanner_avoidance_rfid(rfid_readings: List[RFIDReading],
+                                  pos_transactions: List[POSTransaction],
+                                  time_window_seconds: int = 60) -> List[DetectedEvent]:
+    """RFID-based scanner avoidance (see fraud_detection.detect_scanner_avoidance_rfid)."""
+    if not rfid_readings:
+        return []
+    rfid = records_frame(rfid_readings, RFID_FIELDS)
+    pos = records_frame(pos_transactions, POS_FIELDS)
+
+    scanned = _pairs_in(rfid, pos, ['station_id', 'sku'])
+    has_sku = (rfid['sku'].fillna('') != '').to_numpy()
+    rows = _station_order(rfid['station_id'], np.flatnonzero(has_sku & ~scanned))
+
+    first_customer = {pos_transactions[i].station_id: pos_transactions[i].customer_id
+                      for i in pos.drop_duplicates('station_id').index}
+    events = []
+    for i in rows:
+        reading = rfid_readings[i]
+        events.append(DetectedEvent.create_scanner_avoidance(
+            timestamp=reading.timestamp,
+            station_id=reading.station_id,
+            customer_id=first_customer.get(reading.station_id, "UNKNOWN"),
+            product_sku=reading.sku
+        ))
+    return events
+
+
+def unmatched_predictions(vision_predictions: List[ProductRecognition],
+                          pos_transactions: List[POSTransaction],
+                          rows: np.ndarray,
+                          window_before_seconds: float = 5.0,
+                          window_after_seconds: float = 10.0) -> np.ndarray:
+    """
+    Predictions with no scan of the same SKU at the same station in their window.
+
+    merge_asof finds, for each prediction, the first such scan at or after
+    the window start; the prediction is unmatched when there is none or it
+    falls after the window end.
+
+    Args:
+        vision_predictions: Vision system predictions
+        pos_transactions: POS transactions
+        rows: Positions of the predictions to check
+        window_before_seconds: Look-back of the matching window
+        window_after_seconds: Look-ahead of the matching window
+
+    Returns:
+        Sorted positions of the unmatched predictions among rows
+    """
+    if not len(rows):
+        return np.asarray(rows, dtype=int)
+    if not pos_transactions:
+        return np.sort(np.asarray(rows, dtype=int))
+    vision = records_frame(vision_predictions, VISION_FIELDS)
+    vision_time = _times(vision)
+    last_seen = _times(vision, 'last_seen').fillna(vision_time)
+    windows = vision[['station_id', 'predicted_product']].rename(columns={'predicted_product': 'sku'})
+    windows['window_start'] = vision_time - pd.Timedelta(seconds=window_before_seconds)
+    windows['window_end'] = last_seen + pd.Timedelta(seconds=window_after_seconds)
+    windows = windows.iloc[rows].sort_values('window_start', kind='stable')
+
+    pos = records_frame(pos_transactions, POS_FIELDS)
+    scans = pos[['station_id', 'sku']].assign(scan_time=_times(pos))
+    scans = scans.dropna(subset=['scan_time']).sort_values('scan_time', kind='stable')
+    if scans.empty:
+        return np.sort(np.asarray(rows, dtype=int))
+
+    matched = pd.merge_asof(windows, scans, left_on='window_start', right_on='scan_time',
+                            by=['station_id', 'sku'], direction='forward')
+    unmatched = ~(matched['scan_time'] <= matched['window_end'])
+    return np.sort(windows.index.to_numpy()[unmatched.to_numpy()])
+
+
+def detect_scanner_avoidance_vision(vision_predictions: List[ProductRecognition],
+                                    pos_transactions: List[POSTransaction],
+                                    confidence_threshold: float = 0.70,
+                                    window_before_seconds: float = 5.0,
+                                    window_after_seconds: float = 10.0) -> List[DetectedEvent]:
+    """Vision-based scanner avoidance (see fraud_detection.detect_scanner_avoidance_vision)."""
+    if not vision_predictions:
+        return []
+    vision = records_frame(vision_predictions, VISION_FIELDS)
+    reliable = np.flatnonzero((vision['accuracy'] >= confidence_threshold).to_numpy())
+    rows = unmatched_predictions(vision_predictions, pos_transactions, reliable,
+                                 window_before_seconds, window_after_seconds)
+
+    events = []
+    for i in rows:
+        prediction = vision_predictions[i]
+        events.append(DetectedEvent.create_scanner_avoidance(
+            timestamp=prediction.timestamp,
+            station_id=prediction.station_id,
+            customer_id="UNKNOWN",  # Vision system doesn't track customer ID
+            product_sku=prediction.predicted_product
+        ))
+    return events
+
+
+def switched_pairs(pos_transactions: List[POSTransaction],
+                   vision_predictions: List[ProductRecognition]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairs of the i-th prediction and i-th transaction of a station whose SKUs differ.
+
+    Returns:
+        (prediction positions, transaction positions) in the order barcode
+        switching events are emitted
+    """
+    empty = np.array([], dtype=int)
+    if not vision_predictions or not pos_transactions:
+        return empty, empty
+    vision = records_frame(vision_predictions, VISION_FIELDS)
+    pos = records_frame(pos_transactions, POS_FIELDS)
+
+    predictions = pd.DataFrame({
+        'row': np.arange(len(vision)),
+        'station_id': vision['station_id'],
+        'seq': vision.groupby('station_id', sort=False, dropna=False).cumcount(),
+        'predicted': vision['predicted_product']
+    })
+    transactions = pd.DataFrame({
+        'tx_row': np.arange(len(pos)),
+        'station_id': pos['station_id'],
+        'seq': pos.groupby('station_id', sort=False, dropna=False).cumcount(),
+        'sku': pos['sku']
+    })
+    paired = predictions.merge(transactions, on=['station_id', 'seq'], how='inner')
+    switched = paired[paired['predicted'] != paired['sku']].sort_values('row')
+
+    # Stations in order of their first prediction, predictions in order within each
+    codes, _ = pd.factorize(vision['station_id'], use_na_sentinel=False)
+    order = np.argsort(codes[switched['row'].to_numpy()], kind='stable')
+    return switched['row'].to_numpy()[order], switched['tx_row'].to_numpy()[order]
+
+
+def detect_barcode_switching(pos_transactions: List[POSTransaction],
+                             vision_predictions: List[ProductRecognition],
+                             products_catalog: Dict[str, Dict],
+                             accuracy_threshold: float = 0.85) -> List[DetectedEvent]:
+    """Barcode switching (see fraud_detection.detect_barcode_switching)."""
+    prediction_rows, transaction_rows = switched_pairs(pos_transactions, vision_predictions)
+    if not len(prediction_rows):
+        return []
+    accuracy = records_frame(vision_predictions, VISION_FIELDS)['accuracy'].to_numpy()
+    reliable = accuracy[prediction_rows] >= accuracy_threshold
+
+    events = []
+    for i, j in zip(prediction_rows[reliable], transaction_rows[reliable]):
+        prediction = vision_predictions[i]
+        transaction = pos_transactions[j]
+        events.append(DetectedEvent.create_barcode_switching(
+            timestamp=transaction.timestamp,
+            station_id=transaction.station_id,
+            customer_id=transaction.customer_id,
+            actual_sku=prediction.predicted_product,
+            scanned_sku=transaction.sku
+        ))
+    return events
+
+
+def detect_weight_discrepancies(pos_transactions: List[POSTransaction],
+                                products_catalog: Dict[str, Dict],
+                                tolerance_percent: float = 10.0) -> List[DetectedEvent]:
+    """Weight verification (see fraud_detection.detect_weight_discrepancies)."""
+    if not pos_transactions:
+        return []
+    pos = records_frame(pos_transactions, POS_FIELDS)
+    expected = _expected_weights(pos, products_catalog)
+    percent_diff = (pos['weight_g'] - expected).abs() / expected * 100
+    flagged = (expected > 0) & (percent_diff > tolerance_percent)
+
+    events = []
+    for i in np.flatnonzero(flagged.to_numpy()):
+        transaction = pos_transactions[i]
+        events.append(DetectedEvent.create_weight_discrepancy(
+            timestamp=transaction.timestamp,
+            station_id=transaction.station_id,
+            customer_id=transaction.customer_id,
+            product_sku=transaction.sku,
+            expected_weight=products_catalog[transaction.sku]['weight'],
+            actual_weight=transaction.weight_g
+        ))
+    return events
+
+
+def detect_success_operations(pos_transactions: List[POSTransaction],
+                              rfid_readings: List[RFIDReading],
+                              products_catalog: Dict[str, Dict],
+                              weight_tolerance: float = 15.0) -> List[DetectedEvent]:
+    """Success operations (see fraud_detection.detect_success_operations)."""
+    if not pos_transactions:
+        return []
+    pos = records_frame(pos_transactions, POS_FIELDS)
+    rfid = records_frame(rfid_readings, RFID_FIELDS)
+
+    successful = (pos['status'].str.lower() == 'success').to_numpy()
+    rfid_detected = _pairs_in(pos, rfid, ['station_id', 'sku'])
+    expected = _expected_weights(pos, products_catalog)
+    percent_diff = (pos['weight_g'] - expected).abs() / expected * 100
+    weight_ok = (expected.isna() | (expected <= 0) | (percent_diff <= weight_tolerance)).to_numpy()
+
+    events = []
+    for i in np.flatnonzero(successful & rfid_detected & weight_ok):
+        transaction = pos_transactions[i]
+        events.append(DetectedEvent.create_success_operation(
+            timestamp=transaction.timestamp,
+            station_id=transaction.station_id,
+            customer_id=transaction.customer_id,
+            product_sku=transaction.sku
+        ))
+    return events
+
+
+def detect_long_queues(queue_data: List[QueueMonitoring],
+                       max_customers_threshold: int = 5,
+                       max_wait_time_threshold: float = 300.0) -> List[DetectedEvent]:
+    """Long queues (see queue_analyzer.detect_long_queues)."""
+    if not queue_data:
+        return []
+    queue = records_frame(queue_data, QUEUE_FIELDS)
+    rows = np.flatnonzero((queue['customer_count'] > max_customers_threshold).to_numpy())
+    return [DetectedEvent.create_long_queue(
+        timestamp=queue_data[i].timestamp,
+        station_id=queue_data[i].station_id,
+        num_of_customers=queue_data[i].customer_count
+    ) for i in rows]
+
+
+def detect_long_wait_times(queue_data: List[QueueMonitoring],
+                           max_wait_time_threshold: float = 300.0) -> List[DetectedEvent]:
+    """Long wait times (see queue_analyzer.detect_long_wait_times)."""
+    if not queue_data:
+        return []
+    queue = records_frame(queue_data, QUEUE_FIELDS)
+    rows = np.flatnonzero((queue['average_dwell_time'] > max_wait_time_threshold).to_numpy())
+    return [DetectedEvent.create_long_wait_time(
+        timestamp=queue_data[i].timestamp,
+        station_id=queue_data[i].station_id,
+        wait_time_seconds=queue_data[i].average_dwell_time
+    ) for i in rows]
+
+
+def predict_staffing_needs(queue_data: List[QueueMonitoring],
+                           customer_threshold: int = 5,
+                           wait_time_threshold: float = 300.0) -> List[DetectedEvent]:
+    """Staffing needs (see queue_analyzer.predict_staffing_needs)."""
+    if not queue_data:
+        return []
+    queue = records_frame(queue_data, QUEUE_FIELDS)
+    needs_staff = ((queue['customer_count'] >= customer_threshold)
+                   | (queue['average_dwell_time'] >= wait_time_threshold)).to_numpy()
+    severe = (queue['customer_count'] >= customer_threshold * 1.5).to_numpy()
+    return [DetectedEvent.create_staffing_needs(
+        timestamp=queue_data[i].timestamp,
+        station_id=queue_data[i].station_id,
+        staff_type="Manager" if severe[i] else "Cashier"
+    ) for i in np.flatnonzero(needs_staff)]
+
+
+def manage_station_status(queue_data: List[QueueMonitoring],
+                          open_threshold: int = 5,
+                          close_threshold: int = 2) -> List[DetectedEvent]:
+    """Station open/close actions (see queue_analyzer.manage_station_status)."""
+    if not queue_data:
+        return []
+    queue = records_frame(queue_data, QUEUE_FIELDS)
+    by_station = queue.groupby('station_id', sort=False, dropna=False)
+    from_end = by_station.cumcount(ascending=False).to_numpy()
+    measurements = by_station['customer_count'].transform('size').to_numpy()
+    recent_total = (queue['customer_count'].where(from_end < 3, 0)
+                    .groupby(queue['station_id'], sort=False, dropna=False).transform('sum').to_numpy())
+
+    counts = queue['customer_count'].to_numpy()
+    latest = from_end == 0
+    open_station = latest & (counts >= open_threshold)
+    close_station = (latest & ~open_station & (counts <= close_threshold)
+                     & (measurements >= 3) & (recent_total / 3 <= close_threshold))
+
+    events = []
+    for i in _station_order(queue['station_id'], np.flatnonzero(open_station | close_station)):
+        events.append(DetectedEvent.create_checkout_action(
+            timestamp=queue_data[i].timestamp,
+            station_id=queue_data[i].station_id,
+            action="Open" if open_station[i] else "Close"
+        ))
+    return events
+
+
+def detect_inventory_discrepancies(initial_snapshot: InventorySnapshot,
+                                   final_snapshot: InventorySnapshot,
+                                   pos_transactions: List[POSTransaction],
+                                   tolerance: int = 2) -> List[DetectedEvent]:
+    """Inventory discrepancies (see inventory_monitor.detect_inventory_discrepancies)."""
+    initial = initial_snapshot.inventory
+    if not initial:
+        return []
+    pos = records_frame(pos_transactions, POS_FIELDS)
+    skus = pd.Index(list(initial))
+    sold = pos['sku'].value_counts().reindex(skus, fill_value=0).to_numpy()
+    initial_qty = np.array(list(initial.values()), dtype=float)
+    # Stock never goes below zero while deducting sales
+    expected_qty = np.where(sold > 0, np.maximum(initial_qty - sold, 0), initial_qty)
+    actual_qty = np.array([final_snapshot.inventory.get(sku, 0) for sku in initial], dtype=float)
+
+    events = []
+    for i in np.flatnonzero(np.abs(expected_qty - actual_qty) > tolerance):
+        sku = skus[i]
+        events.append(DetectedEvent.create_inventory_discrepancy(
+            timestamp=final_snapshot.timestamp,
+            sku=sku,
+            expected_inventory=max(initial[sku] - int(sold[i]), 0) if sold[i] else initial[sku],
+            actual_inventory=final_snapshot.inventory.get(sku, 0)
+        ))
+    return events
+
+
+def activity_gaps(all_events: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gaps between consecutive activity of each station.
+
+    Args:
+        all_events: Station timeline ({timestamp, station_id, type} dictionaries)
+
+    Returns:
+        (timestamps, stations, gap seconds) of every gap, named after the
+        activity that starts it, in the order crash events are emitted;
+        gaps between unparsable timestamps are NaN
+    """
+    empty = np.array([], dtype=object)
+    timeline = pd.DataFrame({
+        'timestamp': [event.get('timestamp', '') for event in all_events],
+        'station_id': [event.get('station_id', 'UNKNOWN') for event in all_events]
+    })
+    timeline = timeline.sort_values('timestamp', kind='stable')
+    timeline = timeline[timeline['station_id'] != 'UNKNOWN']
+    if timeline.empty:
+        return empty, empty, np.array([], dtype=float)
+
+    # Group by station in order of first activity, keeping time order within each
+    codes, _ = pd.factorize(timeline['station_id'], use_na_sentinel=False)
+    timeline = timeline.iloc[np.argsort(codes, kind='stable')]
+    codes = np.sort(codes, kind='stable')
+
+    times = _times(timeline)
+    gaps = (times.shift(-1) - times).dt.total_seconds().to_numpy()
+    same_station = np.append(codes[1:] == codes[:-1], False)
+    return (timeline['timestamp'].to_numpy()[same_station],
+            timeline['station_id'].to_numpy()[same_station],
+            gaps[same_station])
+
+
+def detect_system_crashes(all_events: List[Dict],
+                          min_gap_seconds: int = 120,
+                          min_crash_duration: int = 60) -> List[DetectedEvent]:
+    """System crashes from gaps in station activity (see anomaly_detector.detect_system_crashes)."""
+    if not all_events:
+        return []
+    timestamps, stations, gaps = activity_gaps(all_events)
+    crashed = (gaps >= min_gap_seconds) & (np.trunc(gaps) >= min_crash_duration)
+    return [DetectedEvent.create_system_crash(
+        timestamp=timestamps[i],
+        station_id=stations[i],
+        duration_seconds=int(gaps[i])
+    ) for i in np.flatnonzero(crashed)]
+
+
+# Detector name (as used by EventDetector) -> vectorized implementation
+DETECTORS = {
+    'success_operations': detect_success_operations,
+    'scanner_avoidance_vision': detect_scanner_avoidance_vision,
+    'scanner_avoidance_rfid': detect_scanner_avoidance_rfid,
+    'barcode_switching': detect_barcode_switching,
+    'weight_discrepancies': detect_weight_discrepancies,
+    'long_queues': detect_long_queues,
+    'long_wait_times': detect_long_wait_times,
+    'staffing_needs': predict_staffing_needs,
+    'station_status': manage_station_status,
+    'inventory_discrepancies': detect_inventory_discrepancies,
+    'system_crashes': detect_system_crashes
+}
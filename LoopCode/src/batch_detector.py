@@ -0,0 +1,284 @@
+"""
+Batch Event Detector - Multi-Store Processing
+==============================================
+
+Runs event detection for many store data directories in a process pool
+with a concurrency limit. Reference files that are byte-identical across
+stores (products_list.csv, customer_data.csv) are parsed once in the
+parent process and handed to each worker once, instead of being reloaded
+for every store.
+
+Outputs:
+    <output-dir>/<store>/events.jsonl   Events for each store
+    <output-dir>/summary.json           Per-store and combined event counts
+
+Usage:
+    python batch_detector.py --data-dirs "stores/*" --output-dir results --workers 4
+
+Author: Team 01
+Date: October 2025
+"""
+
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+
+from event_detector import EventDetector
+from utils.helpers import load_products_catalog, load_customers_data
+
+
+# Reference files shared between stores when their content is identical
+SHARED_FILES = {
+    'products_list.csv': load_products_catalog,
+    'customer_data.csv': load_customers_data
+}
+
+# Parsed shared files in a worker process: content hash -> parsed data
+_WORKER_SHARED: Dict[str, Any] = {}
+
+
+def expand_data_dirs(patterns: List[str]) -> List[Path]:
+    """
+    Expand directory paths and glob patterns into data directories.
+
+    Args:
+        patterns: Directory paths or glob patterns
+
+    Returns:
+        Sorted, de-duplicated list of existing directories
+    """
+    found = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            path = Path(match)
+            if path.is_dir():
+                found.add(path.resolve())
+    return sorted(found)
+
+
+def store_names(data_dirs: List[Path]) -> List[str]:
+    """Unique output folder names for data directories."""
+    names = []
+    seen: Dict[str, int] = {}
+    for data_dir in data_dirs:
+        name = data_dir.name
+        if data_dir.name in ('input', 'data') and data_dir.parent.name:
+            # Typical layout: <store>/input or <store>/data
+            name = data_dir.parent.name
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name}-{seen[name]}")
+    return names
+
+
+def file_digest(file_path: Path) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def collect_shared_files(data_dirs: List[Path]) -> Tuple[Dict[str, Any], List[Dict[str, str]],
+                                                         List[Optional[str]]]:
+    """
+    Parse each distinct shared reference file once.
+
+    A file that fails to parse only fails the stores using it; the rest of
+    the batch still runs.
+
+    Args:
+        data_dirs: Store data directories
+
+    Returns:
+        Tuple of (content hash -> parsed data, per-store file name -> content
+        hash, per-store error message or None)
+    """
+    shared: Dict[str, Any] = {}
+    failed: Dict[str, str] = {}
+    per_store: List[Dict[str, str]] = []
+    errors: List[Optional[str]] = []
+    for data_dir in data_dirs:
+        hashes = {}
+        error = None
+        for file_name, loader in SHARED_FILES.items():
+            file_path = data_dir / file_name
+            if not file_path.exists():
+                continue
+            try:
+                digest = file_digest(file_path)
+            except OSError as e:
+                error = error or f"{file_name}: {type(e).__name__}: {e}"
+                continue
+            if digest not in shared and digest not in failed:
+                try:
+                    shared[digest] = loader(str(file_path))
+                except Exception as e:
+                    failed[digest] = f"{type(e).__name__}: {e}"
+            if digest in failed:
+                error = error or f"{file_name}: {failed[digest]}"
+            hashes[file_name] = digest
+        per_store.append(hashes)
+        errors.append(error)
+    return shared, per_store, errors
+
+
+def _init_worker(shared: Dict[str, Any]):
+    """Receive the parsed shared files once per worker process."""
+    _WORKER_SHARED.update(shared)
+
+
+def process_store(store: str, data_dir: str, output_file: str,
+                  shared_hashes: Dict[str, str]) -> Dict:
+    """
+    Run detection for one store.
+
+    Args:
+        store: Store name
+        data_dir: Store data directory
+        output_file: Path of the store's events.jsonl
+        shared_hashes: File name -> content hash of its shared reference files
+
+    Returns:
+        Store result summary
+    """
+    started = time.perf_counter()
+    result = {'store': store, 'data_dir': data_dir, 'events_file': output_file}
+    try:
+        products = _WORKER_SHARED.get(shared_hashes.get('products_list.csv'))
+        customers = _WORKER_SHARED.get(shared_hashes.get('customer_data.csv'))
+        detector = EventDetector(data_dir, products_catalog=products, customers_data=customers)
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            detector.detect(output_file)
+        result.update(
+            success=True,
+            total_events=len(detector.detected_events),
+            event_counts=dict(sorted(detector.get_event_summary().items()))
+        )
+    except Exception as e:
+        result.update(success=False, error=f"{type(e).__name__}: {e}",
+                      total_events=0, event_counts={})
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(data_dirs: List[Path], output_dir: str, workers: Optional[int] = None,
+              progress=None) -> Dict:
+    """
+    Process stores in parallel and write the combined summary.
+
+    Args:
+        data_dirs: Store data directories
+        output_dir: Directory for per-store outputs and summary.json
+        workers: Maximum concurrent stores (default: CPU count)
+        progress: Optional callable receiving each store result as it finishes
+
+    Returns:
+        Combined summary dictionary
+    """
+    output_root = Path(output_dir)
+    output_root.mkdir(parents=True, exist_ok=True)
+    names = store_names(data_dirs)
+    shared, per_store_hashes, load_errors = collect_shared_files(data_dirs)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(data_dirs) or 1))
+
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(shared,)) as executor:
+        futures = []
+        for name, data_dir, hashes, error in zip(names, data_dirs, per_store_hashes, load_errors):
+            events_file = str(output_root / name / 'events.jsonl')
+            if error is None:
+                futures.append(executor.submit(process_store, name, str(data_dir), events_file, hashes))
+                continue
+            result = {'store': name, 'data_dir': str(data_dir), 'events_file': events_file,
+                      'success': False, 'error': error, 'total_events': 0,
+                      'event_counts': {}, 'seconds': 0.0}
+            results.append(result)
+            if progress is not None:
+                progress(result)
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if progress is not None:
+                progress(result)
+
+    results.sort(key=lambda r: r['store'])
+    combined: Dict[str, int] = {}
+    for result in results:
+        for event_id, count in result['event_counts'].items():
+            combined[event_id] = combined.get(event_id, 0) + count
+
+    summary = {
+        'generated_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+        'stores': len(results),
+        'failed_stores': sum(1 for r in results if not r['success']),
+        'workers': workers,
+        'shared_reference_files': len(shared),
+        'seconds': round(time.perf_counter() - started, 3),
+        'total_events': sum(r['total_events'] for r in results),
+        'event_counts': dict(sorted(combined.items())),
+        'results': results
+    }
+    with open(output_root / 'summary.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Project Sentinel Batch Event Detector')
+    parser.add_argument('--data-dirs', nargs='+', required=True,
+                        help='Store data directories or glob patterns (quote patterns)')
+    parser.add_argument('--output-dir', required=True,
+                        help='Directory for per-store events.jsonl and summary.json')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Maximum stores processed at the same time (default: CPU count)')
+
+    args = parser.parse_args()
+
+    data_dirs = expand_data_dirs(args.data_dirs)
+    if not data_dirs:
+        print("[ERROR] No data directories found")
+        return 1
+
+    print(f"Processing {len(data_dirs)} stores...")
+
+    def report(result):
+        if result['success']:
+            print(f"  [OK] {result['store']}: {result['total_events']} events ({result['seconds']}s)")
+        else:
+            print(f"  [FAIL] {result['store']}: {result['error']}")
+
+    summary = run_batch(data_dirs, args.output_dir, args.workers, progress=report)
+
+    print("\nCombined Event Summary:")
+    for event_id, count in summary['event_counts'].items():
+        print(f"  {event_id}: {count} events")
+    print(f"\n[OK] {summary['total_events']} events from {summary['stores']} stores "
+          f"in {summary['seconds']}s ({summary['shared_reference_files']} distinct reference files)")
+    print(f"[OK] Summary saved to: {Path(args.output_dir) / 'summary.json'}")
+    return 1 if summary['failed_stores'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,14 @@
+"""
+Dashboard Package for Project Sentinel
+=======================================
+
+Streamlit dashboard and the data-access helpers it uses:
+- dashboard_app: Interactive Streamlit dashboard
+- live_tail: Incremental events.jsonl reader for live mode
+- event_table: Server-side paged, sorted and filtered event tables
+- downsampling: LTTB and min/max downsampling for timeline charts
+- job_manager: Background queue for concurrent detection jobs
+
+Author: LoopCode
+Date: October 2025
+"""
@@ -20,18 +20,35 @@ Usage:
 
 import streamlit as st
 import pandas as pd
-import json
 from pathlib import Path
 from datetime import datetime
 import sys
 import os
-import subprocess
+import shutil
 import time
 import threading
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from event_detector import EventDetector, DetectionCancelled
+from dashboard.live_tail import EventTail, FRAUD_EVENTS
+from dashboard.event_table import EventTable, PAGE_SIZES
+from dashboard.downsampling import downsample_event_counts, METHODS
+from dashboard.job_manager import JobManager
+from utils.heavy_hitters import RiskTracker
+from utils.cardinality import CardinalityIndex, index_path_for
+
+# Maximum number of detection jobs running at the same time. Jobs are threads
+# sharing one CPU under the GIL (see job_manager); this bounds interleaving
+MAX_CONCURRENT_JOBS = 2
+
+# Serializes publishing to the shared evidence folder; the last job to finish wins
+_EVIDENCE_LOCK = threading.Lock()
+
+# Serializes updates of the persisted high-risk customer tracker
+_RISK_TRACKER_LOCK = threading.Lock()
+
 
 def open_folder_dialog():
     """Open native folder picker dialog and return selected path."""
@@ -120,97 +137,283 @@ def validate_data_folder(folder_path: str) -> tuple[bool, str]:
     return True, "Valid data folder"
 
 
-def run_event_detection(data_folder: str, dataset_type: str = "test") -> tuple[bool, str, str]:
-    """Run event detection on the selected data folder.
+def get_results_dir() -> Path:
+    """Get the directory where detection results are written."""
+    return Path(__file__).resolve().parent.parent.parent / "evidence" / "executables" / "results"
+
+
+def get_risk_tracker_path() -> Path:
+    """Get the state file of the high-risk customer tracker shared by all runs."""
+    return get_results_dir() / "risk_tracker.json"
+
+
+def run_event_detection(data_folder: str, dataset_type: str = "test",
+                        progress_callback=None,
+                        cancel_event: threading.Event = None,
+                        output_dir: Path = None) -> tuple[bool, str, str]:
+    """Run event detection in-process on the selected data folder.
+    
+    Parsed inputs (product catalog, customers and sensor streams) are cached
+    across runs, so re-running on an unchanged folder skips re-parsing.
+    
+    Args:
+        data_folder: Folder containing the input data files
+        dataset_type: Evidence folder to copy the results to ("test" or "final")
+        progress_callback: Called with (stage, step, fraction) as detection advances
+        cancel_event: When set, detection stops at the next step
+        output_dir: Where to write events.jsonl (default: the shared results folder)
     
     Returns:
         tuple: (success: bool, message: str, events_file: str)
     """
     try:
-        # Get the run_demo.py path - use absolute path
-        executables_dir = Path(__file__).resolve().parent.parent.parent / "evidence" / "executables"
-        run_demo_path = executables_dir / "run_demo.py"
-        
-        if not run_demo_path.exists():
-            return False, f"run_demo.py not found at {run_demo_path}", ""
-        
-        # Convert data folder to absolute Windows path (not Git Bash style)
         data_folder_path = Path(data_folder).resolve()
         
         # Ensure the path exists
         if not data_folder_path.exists():
             return False, f"Data folder does not exist: {data_folder_path}", ""
         
-        # Convert to Windows-style path (important for subprocess)
-        data_folder_abs = str(data_folder_path).replace('/', '\\')
-        executables_dir_abs = str(executables_dir.resolve()).replace('/', '\\')
-        run_demo_abs = str(run_demo_path.resolve()).replace('/', '\\')
-        
-        # Ensure the executables directory exists
-        if not executables_dir.exists():
-            return False, f"Executables directory not found at {executables_dir}", ""
-        
-        # Run the detection with absolute Windows paths
-        cmd = [
-            sys.executable,
-            run_demo_abs,
-            "--data-dir", data_folder_abs,
-            "--dataset-type", dataset_type
-        ]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=executables_dir_abs,
-            shell=False  # Don't use shell to avoid path interpretation issues
-        )
+        results_dir = Path(output_dir) if output_dir else get_results_dir()
+        results_dir.mkdir(parents=True, exist_ok=True)
+        events_file = results_dir / "events.jsonl"
         
-        if result.returncode == 0:
-            # Find the generated events file
-            events_file = executables_dir / "results" / "events.jsonl"
-            if events_file.exists():
-                return True, "Event detection completed successfully!", str(events_file)
-            else:
-                return False, "Detection ran but no events.jsonl was created", ""
-        else:
-            error_msg = result.stderr if result.stderr else result.stdout
-            # Include more detailed error information
-            full_error = f"Command: {' '.join(cmd)}\n\nStdout:\n{result.stdout}\n\nStderr:\n{error_msg}"
-            return False, f"Detection failed:\n{full_error[:2000]}", ""
-            
+        detector = EventDetector(
+            str(data_folder_path),
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+            use_cache=True,
+            cardinality=True
+        )
+        detector.detect(str(events_file))
+        
+        if not events_file.exists():
+            return False, "Detection ran but no events.jsonl was created", ""
+        
+        # Keep the evidence folder in sync, as run_demo.py does
+        evidence_file = get_results_dir().parent.parent / "output" / dataset_type / "events.jsonl"
+        with _EVIDENCE_LOCK:
+            evidence_file.parent.mkdir(parents=True, exist_ok=True)
+            # Readers of the evidence file never see a partial copy
+            tmp_file = evidence_file.with_suffix('.tmp')
+            shutil.copy2(events_file, tmp_file)
+            os.replace(tmp_file, evidence_file)
+        
+        # Re-running the same data is recognized and not counted twice
+        with _RISK_TRACKER_LOCK:
+            tracker = RiskTracker(state_path=str(get_risk_tracker_path()))
+            if tracker.update(detector.detected_events):
+                tracker.save()
+        
+        return True, "Event detection completed successfully!", str(events_file)
+    
+    except DetectionCancelled:
+        return False, "Event detection was cancelled", ""
     except Exception as e:
         import traceback
         return False, f"Error running detection: {str(e)}\n\nTraceback:\n{traceback.format_exc()}", ""
 
 
-def load_events(events_file: str) -> pd.DataFrame:
-    """Load events from JSONL file into DataFrame."""
-    events = []
-    with open(events_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                events.append(json.loads(line))
-    
-    if not events:
-        return pd.DataFrame()
-    
-    # Flatten event_data into main DataFrame
-    df_data = []
-    for event in events:
-        row = {
-            'timestamp': event['timestamp'],
-            'event_id': event['event_id'],
-            'event_name': event['event_data'].get('event_name', ''),
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    """Get the process-wide detection job manager shared by all sessions."""
+    results_dir = get_results_dir()
+    
+    def runner(job, progress_callback, cancel_event):
+        # Each job writes to its own folder so concurrent runs never collide
+        return run_event_detection(
+            job.data_folder, job.dataset_type,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+            output_dir=manager.output_dir(job.job_id)
+        )
+    
+    manager = JobManager(
+        runner,
+        state_file=str(results_dir / "jobs" / "jobs.json"),
+        max_workers=MAX_CONCURRENT_JOBS,
+        jobs_dir=str(results_dir / "jobs")
+    )
+    return manager
+
+
+def render_jobs_panel(job_manager: JobManager):
+    """Render recent detection jobs with live progress, cancel and load actions."""
+    jobs = job_manager.list_jobs(limit=10)
+    if not jobs:
+        return
+    
+    with st.expander("⚙️ Detection Jobs", expanded=job_manager.has_active_jobs()):
+        status_icons = {
+            'queued': '⏳', 'running': '🔄', 'completed': '✅',
+            'failed': '❌', 'cancelled': '⏹️'
         }
-        # Add all event_data fields
-        row.update(event['event_data'])
-        df_data.append(row)
+        for job in jobs:
+            col1, col2, col3 = st.columns([3, 4, 1])
+            
+            with col1:
+                st.markdown(f"{status_icons.get(job.status, '')} **{Path(job.data_folder).name}** "
+                            f"({job.dataset_type}) · `{job.job_id}`")
+                st.caption(f"Submitted {job.submitted_at}")
+            
+            with col2:
+                if job.status == 'running':
+                    step = f" – {job.step}" if job.step else ""
+                    st.progress(job.progress, text=f"{job.stage or 'starting'}{step}")
+                elif job.status == 'queued':
+                    st.text("Waiting for a free worker...")
+                elif job.status == 'completed':
+                    st.text(f"{job.event_count:,} events · finished {job.finished_at}")
+                else:
+                    st.text(job.message.splitlines()[0] if job.message else job.status)
+            
+            with col3:
+                if job.is_active:
+                    if st.button("Cancel", key=f"cancel_{job.job_id}"):
+                        job_manager.cancel(job.job_id)
+                        st.rerun()
+                elif job.status == 'completed' and job.events_file:
+                    if st.button("Load", key=f"load_{job.job_id}"):
+                        st.session_state.events_file = job.events_file
+                        st.rerun()
+        
+        if not job_manager.has_active_jobs():
+            if st.button("🗑️ Clear finished jobs"):
+                job_manager.clear_finished()
+                # The loaded results may have been in a cleared job's folder
+                if st.session_state.events_file and not Path(st.session_state.events_file).exists():
+                    st.session_state.events_file = None
+                st.rerun()
+
+
+def load_finished_session_jobs(job_manager: JobManager):
+    """Load the results of this session's most recent job once it completes."""
+    job_id = st.session_state.submitted_job
+    job = job_manager.get(job_id) if job_id else None
+    if job is None or job.is_active:
+        return
+    
+    st.session_state.submitted_job = None
+    if job.status == 'completed':
+        st.session_state.events_file = job.events_file
+        st.success(f"Event detection for {Path(job.data_folder).name} completed successfully!")
+        st.balloons()
+    elif job.status == 'failed':
+        st.error(job.message)
+
+
+@st.cache_resource(max_entries=4)
+def _load_cardinality_index(index_path: str, mtime_ns: int) -> CardinalityIndex:
+    """Load a cardinality index once per file version."""
+    return CardinalityIndex.load(index_path)
+
+
+def get_cardinality_index(events_file: str):
+    """Get the cardinality index written next to an events file, if any."""
+    index_path = Path(index_path_for(events_file))
+    if not index_path.exists():
+        return None
+    return _load_cardinality_index(str(index_path), index_path.stat().st_mtime_ns)
+
+
+def get_event_tail(events_file: str) -> EventTail:
+    """Get the session's incremental reader for the events file."""
+    tail = st.session_state.get('event_tail')
+    if tail is None or tail.events_file != Path(events_file):
+        tail = EventTail(events_file)
+        st.session_state.event_tail = tail
+    return tail
+
+
+def get_event_table(tail: EventTail) -> EventTable:
+    """Get the session's paged table over the tail's events.
+
+    The table is extended with newly tailed rows, and rebuilt only when
+    the tail started over (a new file or a rewritten one).
+    """
+    df = tail.dataframe
+    table = st.session_state.get('event_table')
+    source = st.session_state.get('event_table_source')
+    if table is None or source is None or source[0] is not tail or source[1] != tail.generation:
+        table = EventTable(df)
+        st.session_state.event_table = table
+        st.session_state.event_table_source = (tail, tail.generation)
+    elif table.df is not df:
+        table.extend(df)
+    return table
+
+
+def render_paged_table(table: EventTable, key: str, filters: dict, columns: list):
+    """Render one server-side page of a table with paging and sorting controls.
+    
+    Only the visible page is sent to the browser; filtering and sorting
+    happen on the server against the table's cached sort orders.
+    """
+    sortable = [c for c in columns if c in table.df.columns]
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    
+    with col1:
+        sort_by = st.selectbox("Sort by", sortable, key=f"{key}_sort_by")
+    with col2:
+        ascending = st.selectbox("Order", ["Descending", "Ascending"], key=f"{key}_order") == "Ascending"
+    with col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+    
+    page_count = EventTable.page_count(table.count(filters), page_size)
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > page_count:
+        # Filters or page size changed: keep the page number in range
+        st.session_state[page_key] = page_count
+    with col4:
+        page_number = st.number_input(
+            f"Page (of {page_count:,})", min_value=1, max_value=page_count,
+            step=1, key=page_key
+        )
+    
+    page_df, total_rows = table.page(
+        page_number=int(page_number),
+        page_size=page_size,
+        sort_by=sort_by,
+        ascending=ascending,
+        filters=filters,
+        columns=columns
+    )
+    st.dataframe(page_df, use_container_width=True, hide_index=True)
+    
+    first_row = (int(page_number) - 1) * page_size + 1 if total_rows else 0
+    last_row = min(int(page_number) * page_size, total_rows)
+    st.caption(f"Showing rows {first_row:,}–{last_row:,} of {total_rows:,}")
+
+
+def render_risk_tracker():
+    """Render the persisted high-risk customer ranking across all detection runs."""
+    tracker_path = get_risk_tracker_path()
+    if not tracker_path.exists():
+        return
+    
+    st.subheader("High-Risk Customers (all runs)")
+    tracker = RiskTracker(state_path=str(tracker_path))
+    top_n = st.slider("Customers shown", min_value=5, max_value=50, value=10, step=5,
+                      key="risk_top_n")
+    ranked = tracker.top(top_n)
+    if not ranked:
+        st.info("No identified customers behind fraud events yet")
+        return
     
-    df = pd.DataFrame(df_data)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    return df
+    risk_df = pd.DataFrame([{
+        'Rank': row['rank'],
+        'Customer': row['customer_id'],
+        'Fraud Events': row['fraud_events'],
+        'At Least': row['guaranteed'],
+        'By Type': ', '.join(f"{k}: {v}" for k, v in row['by_event'].items()),
+        'Stations': ', '.join(row['stations']),
+        'First Seen': row['first_seen'],
+        'Last Seen': row['last_seen']
+    } for row in ranked])
+    st.dataframe(risk_df, use_container_width=True, hide_index=True)
+    counter = tracker.counter
+    st.caption(f"{counter.total:,} fraud events from {len(tracker.batches)} runs · "
+               f"{len(counter)}/{counter.capacity} customers monitored · "
+               f"counts overestimate by at most {counter.max_error}")
 
 
 def create_dashboard(events_file: str = None):
@@ -228,11 +431,13 @@ def create_dashboard(events_file: str = None):
         st.session_state.events_file = events_file
     if 'data_folder' not in st.session_state:
         st.session_state.data_folder = None
-    if 'detection_running' not in st.session_state:
-        st.session_state.detection_running = False
+    if 'submitted_job' not in st.session_state:
+        st.session_state.submitted_job = None
     if 'folder_dialog_clicked' not in st.session_state:
         st.session_state.folder_dialog_clicked = False
     
+    job_manager = get_job_manager()
+    
     # Title and header
     st.title("🛡️ Project Sentinel - Event Monitoring Dashboard")
     st.markdown("Real-time monitoring and analysis of self-checkout events")
@@ -345,26 +550,16 @@ def create_dashboard(events_file: str = None):
                     if st.button(
                         "🚀 Run Event Detection",
                         type="primary",
-                        disabled=st.session_state.detection_running,
                         use_container_width=True
                     ):
-                        st.session_state.detection_running = True
-                        with st.spinner("Running event detection... This may take a few minutes."):
-                            success, message, events_path = run_event_detection(data_folder, dataset_type)
-                            
-                            if success:
-                                st.success(message)
-                                st.session_state.events_file = events_path
-                                st.balloons()
-                                time.sleep(1)
-                                st.rerun()
-                            else:
-                                st.error(message)
-                        
-                        st.session_state.detection_running = False
+                        job = job_manager.submit(data_folder, dataset_type)
+                        st.session_state.submitted_job = job.job_id
+                        st.toast(f"Detection job {job.job_id} queued")
                 
-                # Check for existing results
-                existing_events = Path(__file__).parent.parent.parent / "evidence" / "executables" / "results" / "events.jsonl"
+                # Check for existing results: the latest finished job, else an older shared run
+                latest_job = job_manager.latest_completed()
+                existing_events = (Path(latest_job.events_file) if latest_job
+                                   else get_results_dir() / "events.jsonl")
                 if existing_events.exists() and not st.session_state.events_file:
                     st.info(f"💡 Found existing events file. Click below to load it.")
                     if st.button("📊 Load Existing Results"):
@@ -375,11 +570,21 @@ def create_dashboard(events_file: str = None):
                 st.error(f"❌ {validation_msg}")
                 st.info("Please select a valid data folder containing the required files.")
     
+    # ========================================
+    # DETECTION JOBS SECTION
+    # ========================================
+    load_finished_session_jobs(job_manager)
+    render_jobs_panel(job_manager)
+    
     # ========================================
     # EVENTS VISUALIZATION SECTION
     # ========================================
     if not st.session_state.events_file:
         st.info("👆 Please select a data folder and run event detection to view results.")
+        if job_manager.has_active_jobs():
+            # Poll running jobs for progress
+            time.sleep(1)
+            st.rerun()
         st.stop()
     
     events_file = st.session_state.events_file
@@ -388,12 +593,35 @@ def create_dashboard(events_file: str = None):
     st.markdown(f"**Current Events File:** `{events_file}`")
     st.divider()
     
-    # Load events
+    # Live mode: poll the events file and only read what was appended
+    st.sidebar.header("🔴 Live Mode")
+    live_mode = st.sidebar.checkbox(
+        "Auto-refresh",
+        value=False,
+        help="Poll the events file and append new events as they are written"
+    )
+    refresh_seconds = st.sidebar.slider(
+        "Refresh interval (seconds)", min_value=1, max_value=60, value=5,
+        disabled=not live_mode
+    )
+    
+    # Load events (incrementally: only bytes past the last offset are parsed)
     try:
-        df = load_events(events_file)
+        tail = get_event_tail(events_file)
+        new_events = tail.poll()
+        df = tail.dataframe
+        
+        if live_mode:
+            st.sidebar.caption(
+                f"{tail.total_events:,} events loaded · {new_events:,} new · "
+                f"last refresh {datetime.now().strftime('%H:%M:%S')}"
+            )
         
         if df.empty:
             st.error("No events found in the file!")
+            if live_mode:
+                time.sleep(refresh_seconds)
+                st.rerun()
             return
         
         # Sidebar filters
@@ -410,33 +638,71 @@ def create_dashboard(events_file: str = None):
         else:
             selected_station = 'All'
         
-        # Apply filters
-        filtered_df = df.copy()
+        event_table = get_event_table(tail)
+        
+        # Apply filters (the cached DataFrame is shared across reruns, never mutate it)
+        filtered_df = df
         if selected_event != 'All':
             filtered_df = filtered_df[filtered_df['event_id'] == selected_event]
         if selected_station != 'All' and 'station_id' in filtered_df.columns:
             filtered_df = filtered_df[filtered_df['station_id'] == selected_station]
         
+        # Summaries are grouped from the tail's running aggregates, never from the rows
+        unfiltered = selected_event == 'All' and selected_station == 'All'
+        summary = tail.summary()
+        event_filter = None if selected_event == 'All' else selected_event
+        station_filter = None if selected_station == 'All' else selected_station
+        breakdown = tail.breakdown(event_filter, station_filter)
+        counts_by_event = breakdown.groupby('event_id')['count'].sum()
+        has_stations = breakdown['station_id'].notna().any()
+        
         # Key Metrics Row
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Events", len(filtered_df))
+            st.metric("Total Events", summary['total'] if unfiltered else int(counts_by_event.sum()))
         
         with col2:
-            fraud_events = len(filtered_df[filtered_df['event_id'].isin(['E001', 'E002', 'E003'])])
+            if unfiltered:
+                fraud_events = summary['fraud']
+            else:
+                fraud_events = int(counts_by_event.reindex(FRAUD_EVENTS, fill_value=0).sum())
             st.metric("Fraud Events", fraud_events)
         
         with col3:
-            queue_events = len(filtered_df[filtered_df['event_id'].isin(['E005', 'E006'])])
+            if unfiltered:
+                queue_events = summary['queue']
+            else:
+                queue_events = int(counts_by_event.reindex(['E005', 'E006'], fill_value=0).sum())
             st.metric("Queue Issues", queue_events)
         
+        # Distinct counts come from merged per-(station, hour) sketches when available
+        cardinality_index = get_cardinality_index(st.session_state.events_file)
+        traffic = None
+        if cardinality_index is not None:
+            traffic = cardinality_index.query(
+                stations=None if selected_station == 'All' else [selected_station])
+        
         with col4:
-            if 'station_id' in filtered_df.columns:
-                stations_count = filtered_df['station_id'].nunique()
+            if traffic is not None and selected_event == 'All':
+                st.metric("Stations Monitored", traffic['stations'])
+            elif has_stations:
+                if unfiltered:
+                    stations_count = summary['stations']
+                else:
+                    stations_count = breakdown['station_id'].nunique()
                 st.metric("Stations Monitored", stations_count)
             else:
-                st.metric("System Crashes", len(filtered_df[filtered_df['event_id'] == 'E004']))
+                st.metric("System Crashes", int(counts_by_event.get('E004', 0)))
+        
+        if traffic is not None:
+            col1, col2, col3, _ = st.columns(4)
+            with col1:
+                st.metric("Unique Customers", f"~{traffic['customers']:,}")
+            with col2:
+                st.metric("Unique SKUs", f"~{traffic['skus']:,}")
+            with col3:
+                st.metric("Station-Hours Observed", traffic['buckets'])
         
         st.divider()
         
@@ -447,7 +713,7 @@ def create_dashboard(events_file: str = None):
         
         with col1:
             # Event type distribution
-            event_counts = filtered_df['event_id'].value_counts().reset_index()
+            event_counts = counts_by_event.sort_values(ascending=False).reset_index()
             event_counts.columns = ['Event ID', 'Count']
             
             st.bar_chart(event_counts.set_index('Event ID'))
@@ -455,10 +721,9 @@ def create_dashboard(events_file: str = None):
         
         with col2:
             # Event names
-            if 'event_name' in filtered_df.columns:
-                event_names = filtered_df['event_name'].value_counts().head(10)
-                st.bar_chart(event_names)
-                st.caption("Top 10 events by name")
+            event_names = breakdown.groupby('event_name')['count'].sum().nlargest(10)
+            st.bar_chart(event_names)
+            st.caption("Top 10 events by name")
         
         st.divider()
         
@@ -466,63 +731,114 @@ def create_dashboard(events_file: str = None):
         st.subheader("⏱️ Timeline Analysis")
         
         # Events over time
-        filtered_df['hour'] = filtered_df['timestamp'].dt.hour
-        events_by_hour = filtered_df.groupby('hour').size().reset_index(name='count')
+        events_by_hour = breakdown.groupby('hour')['count'].sum().reset_index()
         
         st.line_chart(events_by_hour.set_index('hour'))
         st.caption("Events by hour of day")
         
+        # Event rate over time, downsampled to a fixed point budget per series
+        st.markdown("**Event Rate Over Time**")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            split_by = st.selectbox("Split by", ["Event type", "Station"], key="timeline_split")
+        with col2:
+            resolution = st.selectbox(
+                "Resolution", ["1min", "5min", "15min", "1h"], key="timeline_resolution")
+        with col3:
+            method_label = st.selectbox("Downsampling", list(METHODS), key="timeline_method")
+        with col4:
+            point_budget = st.slider(
+                "Points per series", min_value=100, max_value=2000, value=500, step=100,
+                key="timeline_budget")
+        
+        time_min = filtered_df['timestamp'].min().to_pydatetime()
+        time_max = filtered_df['timestamp'].max().to_pydatetime()
+        if time_min < time_max:
+            zoom = st.slider(
+                "Time range", min_value=time_min, max_value=time_max,
+                value=(time_min, time_max), format="YYYY-MM-DD HH:mm", key="timeline_zoom")
+        else:
+            zoom = (time_min, time_max)
+        
+        group_column = 'event_id' if split_by == "Event type" else 'station_id'
+        rate_series = downsample_event_counts(
+            filtered_df,
+            group_column=group_column,
+            resolution=resolution,
+            point_budget=point_budget,
+            method=METHODS[method_label],
+            start=pd.Timestamp(zoom[0]),
+            end=pd.Timestamp(zoom[1])
+        )
+        if not rate_series.empty:
+            st.line_chart(rate_series, x='timestamp', y='count', color='series')
+            st.caption(f"Events per {resolution} by {split_by.lower()} "
+                       f"(at most {point_budget} points per series)")
+        else:
+            st.info("No events in the selected time range")
+        
         st.divider()
         
         # Station Analysis
-        if 'station_id' in filtered_df.columns:
+        if has_stations:
             st.subheader("🏪 Station Analysis")
             
             col1, col2 = st.columns(2)
             
             with col1:
-                station_counts = filtered_df['station_id'].value_counts().head(10)
+                station_counts = breakdown.groupby('station_id')['count'].sum().nlargest(10)
                 st.bar_chart(station_counts)
                 st.caption("Events by station")
             
             with col2:
                 # Event types by station
-                if len(filtered_df) > 0:
-                    station_event_matrix = pd.crosstab(
-                        filtered_df['station_id'], 
-                        filtered_df['event_id']
-                    )
-                    st.dataframe(station_event_matrix, use_container_width=True)
-                    st.caption("Event distribution across stations")
+                station_event_matrix = breakdown.pivot_table(
+                    index='station_id', columns='event_id', values='count',
+                    aggfunc='sum', fill_value=0
+                )
+                st.dataframe(station_event_matrix, use_container_width=True)
+                st.caption("Event distribution across stations")
         
         st.divider()
         
         # Fraud Analysis
         st.subheader("🚨 Fraud Analysis")
         
-        fraud_df = filtered_df[filtered_df['event_id'].isin(['E001', 'E002', 'E003'])]
+        fraud_counts = counts_by_event.reindex(FRAUD_EVENTS, fill_value=0)
         
-        if len(fraud_df) > 0:
+        if fraud_counts.sum() > 0:
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                scanner_avoidance = len(fraud_df[fraud_df['event_id'] == 'E001'])
-                st.metric("Scanner Avoidance", scanner_avoidance)
+                st.metric("Scanner Avoidance", int(fraud_counts['E001']))
             
             with col2:
-                barcode_switching = len(fraud_df[fraud_df['event_id'] == 'E002'])
-                st.metric("Barcode Switching", barcode_switching)
+                st.metric("Barcode Switching", int(fraud_counts['E002']))
             
             with col3:
-                weight_discrepancies = len(fraud_df[fraud_df['event_id'] == 'E003'])
-                st.metric("Weight Discrepancies", weight_discrepancies)
+                st.metric("Weight Discrepancies", int(fraud_counts['E003']))
             
             # Fraud by customer
-            if 'customer_id' in fraud_df.columns:
+            customer_fraud = tail.fraud_by_customer(event_filter, station_filter).head(10)
+            if not customer_fraud.empty:
                 st.subheader("Fraud by Customer")
-                customer_fraud = fraud_df['customer_id'].value_counts().head(10)
                 st.bar_chart(customer_fraud)
                 st.caption("Top 10 customers with fraud events")
+            
+            render_risk_tracker()
+            
+            # Fraud events (server-side paged)
+            st.subheader("Fraud Events")
+            fraud_ids = [selected_event] if selected_event != 'All' else ['E001', 'E002', 'E003']
+            fraud_columns = [c for c in ['timestamp', 'event_id', 'event_name', 'station_id',
+                                         'customer_id', 'product_sku', 'actual_sku',
+                                         'scanned_sku', 'expected_weight', 'actual_weight']
+                             if c in df.columns]
+            render_paged_table(
+                event_table, "fraud_table",
+                filters={'event_id': fraud_ids, 'station_id': selected_station},
+                columns=fraud_columns
+            )
         else:
             st.info("No fraud events detected in the selected period")
         
@@ -531,18 +847,17 @@ def create_dashboard(events_file: str = None):
         # Recent Events Table
         st.subheader("📋 Recent Events")
         
-        # Show recent events
+        # Show recent events (server-side paged, newest first by default)
         display_columns = ['timestamp', 'event_id', 'event_name']
-        if 'station_id' in filtered_df.columns:
+        if 'station_id' in df.columns:
             display_columns.append('station_id')
-        if 'customer_id' in filtered_df.columns:
+        if 'customer_id' in df.columns:
             display_columns.append('customer_id')
         
-        recent_events = filtered_df.sort_values('timestamp', ascending=False).head(20)
-        st.dataframe(
-            recent_events[display_columns],
-            use_container_width=True,
-            hide_index=True
+        render_paged_table(
+            event_table, "events_table",
+            filters={'event_id': selected_event, 'station_id': selected_station},
+            columns=display_columns
         )
         
         st.divider()
@@ -552,22 +867,21 @@ def create_dashboard(events_file: str = None):
         
         col1, col2 = st.columns(2)
         
+        # Files are serialized when a button is clicked, not on every rerun
         with col1:
             # CSV download
-            csv = filtered_df.to_csv(index=False)
             st.download_button(
                 label="📥 Download as CSV",
-                data=csv,
+                data=lambda: filtered_df.to_csv(index=False),
                 file_name="sentinel_events.csv",
                 mime="text/csv"
             )
         
         with col2:
             # JSON download
-            json_str = filtered_df.to_json(orient='records', date_format='iso')
             st.download_button(
                 label="📥 Download as JSON",
-                data=json_str,
+                data=lambda: filtered_df.to_json(orient='records', date_format='iso'),
                 file_name="sentinel_events.json",
                 mime="application/json"
             )
@@ -577,6 +891,14 @@ def create_dashboard(events_file: str = None):
         st.markdown(f"**Data Source:** `{st.session_state.data_folder or 'N/A'}`")
         st.caption("Project Sentinel Dashboard v2.0 | LoopCode | October 2025")
         
+        if live_mode:
+            time.sleep(refresh_seconds)
+            st.rerun()
+        elif job_manager.has_active_jobs():
+            # Poll running jobs for progress
+            time.sleep(1)
+            st.rerun()
+        
     except FileNotFoundError:
         st.error(f"❌ Events file not found: {events_file}")
         st.info("Please run the event detector first to generate events.jsonl")
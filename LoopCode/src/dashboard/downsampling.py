@@ -0,0 +1,167 @@
+"""
+Time Series Downsampling
+=========================
+
+Downsampling for the dashboard's timeline charts. Event counts are
+bucketed at a fine resolution (down to one minute) per event type or
+per station, then reduced to a fixed point budget per series with
+Largest-Triangle-Three-Buckets (LTTB) or min/max bucket aggregation, so
+chart size stays constant regardless of the time range shown.
+
+Author: LoopCode
+Date: October 2025
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Downsampling methods offered by the dashboard
+METHODS = {
+    'LTTB': 'lttb',
+    'Min/Max buckets': 'minmax'
+}
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select points with Largest-Triangle-Three-Buckets.
+
+    Algorithm:
+    1. Always keep the first and last point
+    2. Split the remaining points into threshold - 2 equal buckets
+    3. In each bucket keep the point forming the largest triangle with the
+       previously kept point and the average of the next bucket
+
+    Args:
+        x: Monotonically increasing x values
+        y: Values to preserve the visual shape of
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (threshold - 2)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        # Average point of the next bucket
+        avg_start = int(np.floor((i + 1) * every)) + 1
+        avg_end = min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+
+        # Point in the current bucket with the largest triangle area
+        start = int(np.floor(i * every)) + 1
+        end = int(np.floor((i + 1) * every)) + 1
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    indices[-1] = n - 1
+    return indices
+
+
+def minmax_indices(y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select the minimum and maximum of equal-width buckets.
+
+    Keeps every peak and trough, which suits spiky event counts.
+
+    Args:
+        y: Values to downsample
+        threshold: Maximum number of points to keep (two per bucket plus endpoints)
+
+    Returns:
+        Sorted, unique indices of the kept points
+    """
+    n = len(y)
+    if threshold >= n or threshold < 4:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    n_buckets = (threshold - 2) // 2
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+
+    kept = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        bucket = y[start:end]
+        kept.append(start + int(np.argmin(bucket)))
+        kept.append(start + int(np.argmax(bucket)))
+    return np.unique(kept)
+
+
+def downsample_event_counts(df: pd.DataFrame,
+                            group_column: str = 'event_id',
+                            resolution: str = '1min',
+                            point_budget: int = 500,
+                            method: str = 'lttb',
+                            start: Optional[pd.Timestamp] = None,
+                            end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Build downsampled event-count time series per group.
+
+    Events are counted per resolution bucket for each group, empty buckets
+    are filled with zero so gaps show as drops, and every series is reduced
+    to at most point_budget points.
+
+    Args:
+        df: Events DataFrame with a datetime 'timestamp' column
+        group_column: Column that splits the series (event_id or station_id)
+        resolution: Pandas frequency string for count buckets
+        point_budget: Maximum points per series
+        method: 'lttb' or 'minmax'
+        start: Optional inclusive start of the time range
+        end: Optional inclusive end of the time range
+
+    Returns:
+        Long-format DataFrame with timestamp, series and count columns
+    """
+    columns = ['timestamp', 'series', 'count']
+    if df.empty or group_column not in df.columns:
+        return pd.DataFrame(columns=columns)
+
+    timestamps = df['timestamp']
+    in_range = timestamps.notna() & df[group_column].notna()
+    if start is not None:
+        in_range &= timestamps >= start
+    if end is not None:
+        in_range &= timestamps <= end
+    if not in_range.any():
+        return pd.DataFrame(columns=columns)
+
+    groups = df.loc[in_range, group_column]
+    buckets = timestamps[in_range].dt.floor(resolution)
+    counts = groups.groupby([groups, buckets]).size()
+    grid = pd.date_range(buckets.min(), buckets.max(), freq=resolution)
+
+    frames = []
+    for series_name, series_counts in counts.groupby(level=0):
+        series = series_counts.droplevel(0).reindex(grid, fill_value=0)
+        values = series.to_numpy()
+        if method == 'minmax':
+            keep = minmax_indices(values, point_budget)
+        else:
+            keep = lttb_indices(series.index.asi8, values, point_budget)
+        frames.append(pd.DataFrame({
+            'timestamp': series.index[keep],
+            'series': str(series_name),
+            'count': values[keep]
+        }))
+
+    return pd.concat(frames, ignore_index=True)
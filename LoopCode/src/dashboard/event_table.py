@@ -0,0 +1,187 @@
+"""
+Paged Event Table
+==================
+
+Server-side paging, sorting and filtering for the dashboard's event
+tables. Sort orders are computed once per column and cached, with the
+timestamp order built eagerly, so a page request only applies the filter
+mask along a cached permutation and slices out the visible rows. Only
+that page is handed to Streamlit and serialized to the browser.
+
+When live mode appends rows, the cached orders are extended by sorting
+only the new rows and merging them in with a binary search, instead of
+re-sorting the whole table.
+
+Author: LoopCode
+Date: October 2025
+"""
+
+from typing import Dict, List, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+
+# Page sizes offered by the dashboard
+PAGE_SIZES = [20, 50, 100, 500]
+
+
+class EventTable:
+    """
+    Sorted, filterable view over an events DataFrame.
+
+    The DataFrame is treated as read-only. Build a new table when the
+    underlying DataFrame changes, or call extend when rows were only
+    appended to it (a live-mode refresh).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Initialize the table and its timestamp index.
+
+        Args:
+            df: Events DataFrame as produced by events_to_dataframe
+        """
+        self.df = df
+        self._orders: Dict[str, Tuple[np.ndarray, int]] = {}
+        # Column -> sort keys of the non-null rows, in sorted order
+        self._sorted_keys: Dict[str, np.ndarray] = {}
+        if 'timestamp' in df.columns:
+            self._sort_order('timestamp')
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def _sort_keys(self, column: str, start: int = 0) -> pd.Series:
+        """Values of a column from row start on, as compared when sorting."""
+        values = self.df[column].iloc[start:].reset_index(drop=True)
+        if values.dtype == object:
+            # Mixed types: compare as strings, keep nulls as nulls
+            values = values.where(values.isna(), values.astype(str))
+        return values
+
+    def _sort_order(self, column: str) -> Tuple[np.ndarray, int]:
+        """
+        Get the cached ascending row order for a column.
+
+        Returns:
+            Tuple of (row positions with nulls last, number of non-null rows)
+        """
+        cached = self._orders.get(column)
+        if cached is None:
+            values = self._sort_keys(column)
+            order = values.sort_values(kind='stable', na_position='last').index.to_numpy()
+            cached = (order, int(values.notna().sum()))
+            self._orders[column] = cached
+            self._sorted_keys[column] = values.to_numpy()[order[:cached[1]]]
+        return cached
+
+    def extend(self, df: pd.DataFrame):
+        """
+        Switch to a DataFrame that has this table's rows followed by new ones.
+
+        Cached sort orders are updated in place of a full re-sort: the new
+        rows are sorted on their own and inserted after equal existing
+        values, which gives the same order as a stable sort of all rows.
+        Orders of columns whose dtype changed are dropped and rebuilt on use.
+
+        Args:
+            df: The grown DataFrame (its first len(self) rows must be unchanged)
+        """
+        start = len(self.df)
+        previous, self.df = self.df, df
+        for column in list(self._orders):
+            if column not in df.columns or df[column].dtype != previous[column].dtype:
+                del self._orders[column], self._sorted_keys[column]
+                continue
+            order, valid = self._orders[column]
+            values = self._sort_keys(column, start)
+            present = values.notna().to_numpy()
+            rows = np.arange(start, len(df))
+
+            keys = values.to_numpy()[present]
+            by_key = np.argsort(keys, kind='stable')
+            keys, added = keys[by_key], rows[present][by_key]
+            sorted_keys = self._sorted_keys[column]
+            positions = np.searchsorted(sorted_keys, keys, side='right')
+
+            self._sorted_keys[column] = np.insert(sorted_keys, positions, keys)
+            self._orders[column] = (
+                np.concatenate([np.insert(order[:valid], positions, added),
+                                order[valid:], rows[~present]]),
+                valid + len(added))
+        if 'timestamp' in df.columns:
+            self._sort_order('timestamp')
+
+    def build_mask(self, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Build a boolean row mask from column filters.
+
+        Args:
+            filters: Column -> value or list of values; None and 'All' are ignored
+
+        Returns:
+            Boolean mask, or None if no filter applies
+        """
+        mask = None
+        for column, value in filters.items():
+            if value is None or value == 'All' or column not in self.df.columns:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                column_mask = self.df[column].isin(list(value)).to_numpy()
+            else:
+                column_mask = (self.df[column] == value).to_numpy()
+            mask = column_mask if mask is None else (mask & column_mask)
+        return mask
+
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Number of rows matching the filters."""
+        mask = self.build_mask(filters or {})
+        return len(self.df) if mask is None else int(mask.sum())
+
+    def page(self, page_number: int = 1, page_size: int = PAGE_SIZES[0],
+             sort_by: str = 'timestamp', ascending: bool = False,
+             filters: Optional[Dict[str, Any]] = None,
+             columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, int]:
+        """
+        Get one page of filtered, sorted rows.
+
+        Args:
+            page_number: 1-based page number (clamped to the available pages)
+            page_size: Rows per page
+            sort_by: Column to sort by
+            ascending: Sort direction
+            filters: Column filters, see build_mask
+            columns: Columns to include in the page (default: all)
+
+        Returns:
+            Tuple of (page DataFrame, total number of matching rows)
+        """
+        if self.df.empty:
+            return self.df, 0
+
+        if sort_by not in self.df.columns:
+            sort_by = 'timestamp' if 'timestamp' in self.df.columns else self.df.columns[0]
+        order, valid = self._sort_order(sort_by)
+        if not ascending:
+            # Reverse the non-null part only so missing values stay last
+            order = np.concatenate([order[:valid][::-1], order[valid:]])
+
+        mask = self.build_mask(filters or {})
+        if mask is not None:
+            order = order[mask[order]]
+
+        total_rows = len(order)
+        page_number = min(max(1, page_number), self.page_count(total_rows, page_size))
+        start = (page_number - 1) * page_size
+        rows = order[start:start + page_size]
+
+        page_df = self.df.iloc[rows]
+        if columns:
+            page_df = page_df[[c for c in columns if c in page_df.columns]]
+        return page_df, total_rows
+
+    @staticmethod
+    def page_count(total_rows: int, page_size: int) -> int:
+        """Number of pages needed for a row count (at least one)."""
+        return max(1, -(-total_rows // page_size))
@@ -0,0 +1,293 @@
+"""
+Detection Job Manager
+======================
+
+Local job queue for running event detection from the dashboard without
+blocking the Streamlit script. Jobs for different data folders run
+concurrently on a worker thread pool up to a configurable limit, report
+live progress, can be cancelled, and have their status and results
+persisted to a JSON file so they survive dashboard restarts.
+
+The pool runs jobs on threads so they can share progress callbacks and
+cancel events with the dashboard. Detection is CPU-bound Python, so
+concurrent jobs interleave under the GIL rather than using more cores:
+the pool keeps the UI responsive and lets a short job finish while a
+long one runs, but two jobs take about as long as running them in turn.
+For CPU parallelism across stores use batch_detector.py.
+
+Each job writes into its own folder, <jobs_dir>/<job_id>, which is
+deleted when the job is cleared, so jobs never block each other. Jobs of
+the same dataset type all publish to evidence/output/<type>/events.jsonl
+when they finish; the runner does that under a lock, and the job that
+finishes last wins.
+
+Author: LoopCode
+Date: October 2025
+"""
+
+import json
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+# Runner signature: (job, progress_callback, cancel_event) -> (success, message, events_file)
+JobRunner = Callable[['DetectionJob', Callable, threading.Event], Tuple[bool, str, str]]
+
+
+def _now() -> str:
+    """Current time in the repository's timestamp format."""
+    return datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+
+
+@dataclass
+class DetectionJob:
+    """A detection run for one data folder"""
+    job_id: str
+    data_folder: str
+    dataset_type: str
+    status: str = QUEUED
+    stage: Optional[str] = None
+    step: Optional[str] = None
+    progress: float = 0.0
+    message: str = ''
+    events_file: str = ''
+    event_count: int = 0
+    submitted_at: str = ''
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    @property
+    def is_active(self) -> bool:
+        """True while the job is queued or running."""
+        return self.status in ACTIVE_STATES
+
+
+class JobManager:
+    """
+    Thread-pool backed queue of detection jobs.
+
+    One manager is shared by all dashboard sessions in a process, so
+    several analysts can run different stores in parallel.
+    """
+
+    def __init__(self, runner: JobRunner, state_file: str, max_workers: int = 2,
+                 jobs_dir: Optional[str] = None):
+        """
+        Initialize the manager and restore persisted jobs.
+
+        Args:
+            runner: Function that performs detection for a job
+            state_file: JSON file where job status and results are persisted
+            max_workers: Maximum number of jobs running at the same time
+            jobs_dir: Parent of the per-job output folders (default: the state file's folder)
+        """
+        self.runner = runner
+        self.state_file = Path(state_file)
+        self.jobs_dir = Path(jobs_dir) if jobs_dir else self.state_file.parent
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='sentinel-job')
+        self._lock = threading.RLock()
+        self._jobs: Dict[str, DetectionJob] = {}
+        self._futures: Dict[str, Future] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._load_state()
+
+    def _load_state(self):
+        """Restore jobs from the state file; unfinished jobs are marked failed."""
+        if not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for record in records:
+            try:
+                job = DetectionJob(**record)
+            except (TypeError, KeyError):
+                # Written by a version with different job fields
+                continue
+            if job.is_active:
+                job.status = FAILED
+                job.message = 'Interrupted: the dashboard stopped before the job finished'
+                job.finished_at = job.finished_at or _now()
+            self._jobs[job.job_id] = job
+        self._save_state()
+
+    def _save_state(self):
+        """Write all jobs to the state file atomically."""
+        with self._lock:
+            records = [asdict(job) for job in self._jobs.values()]
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(records, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+
+    def submit(self, data_folder: str, dataset_type: str = 'test') -> DetectionJob:
+        """
+        Queue a detection job.
+
+        Args:
+            data_folder: Folder containing the input data files
+            dataset_type: Evidence folder the results belong to
+
+        Returns:
+            The queued job
+        """
+        job = DetectionJob(
+            job_id=uuid.uuid4().hex[:8],
+            data_folder=str(data_folder),
+            dataset_type=dataset_type,
+            submitted_at=_now()
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._cancel_events[job.job_id] = threading.Event()
+            self._futures[job.job_id] = self._executor.submit(self._run, job.job_id)
+        self._save_state()
+        return job
+
+    def _run(self, job_id: str):
+        """Execute a job on a worker thread."""
+        with self._lock:
+            job = self._jobs[job_id]
+            cancel_event = self._cancel_events[job_id]
+            if cancel_event.is_set():
+                # Cancelled while being picked up by a worker
+                job.status = CANCELLED
+                job.message = 'Cancelled before it started'
+                job.finished_at = _now()
+                self._cancel_events.pop(job_id, None)
+                self._futures.pop(job_id, None)
+                self._save_state()
+                return
+            job.status = RUNNING
+            job.started_at = _now()
+        self._save_state()
+
+        def on_progress(stage, step, fraction):
+            job.stage = stage
+            job.step = step
+            job.progress = fraction
+
+        try:
+            success, message, events_file = self.runner(job, on_progress, cancel_event)
+        except Exception as e:
+            success, message, events_file = False, f"Error running detection: {e}", ""
+
+        with self._lock:
+            if success:
+                job.status = COMPLETED
+                job.progress = 1.0
+                job.events_file = events_file
+                job.event_count = _count_lines(events_file)
+            else:
+                job.status = CANCELLED if cancel_event.is_set() else FAILED
+            job.message = message
+            job.finished_at = _now()
+            self._cancel_events.pop(job_id, None)
+            self._futures.pop(job_id, None)
+        self._save_state()
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            True if the job was still active
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.is_active:
+                return False
+            self._cancel_events[job_id].set()
+            future = self._futures.get(job_id)
+            if future is not None and future.cancel():
+                # Never started: finalize here since _run will not execute
+                job.status = CANCELLED
+                job.message = 'Cancelled before it started'
+                job.finished_at = _now()
+                self._cancel_events.pop(job_id, None)
+                self._futures.pop(job_id, None)
+        self._save_state()
+        return True
+
+    def get(self, job_id: str) -> Optional[DetectionJob]:
+        """Get a job by ID."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self, limit: Optional[int] = None) -> List[DetectionJob]:
+        """
+        List jobs, most recently submitted first.
+
+        Args:
+            limit: Maximum number of jobs to return
+
+        Returns:
+            List of jobs
+        """
+        with self._lock:
+            # Jobs are kept in submission order
+            jobs = list(self._jobs.values())[::-1]
+        return jobs[:limit] if limit else jobs
+
+    def output_dir(self, job_id: str) -> Path:
+        """Folder a job writes its results to."""
+        return self.jobs_dir / job_id
+
+    def latest_completed(self) -> Optional[DetectionJob]:
+        """Most recently finished successful job whose results still exist."""
+        with self._lock:
+            finished = [job for job in self._jobs.values()
+                        if job.status == COMPLETED and job.events_file and Path(job.events_file).exists()]
+        return max(finished, key=lambda job: job.finished_at or '', default=None)
+
+    def has_active_jobs(self) -> bool:
+        """True if any job is queued or running."""
+        with self._lock:
+            return any(job.is_active for job in self._jobs.values())
+
+    def clear_finished(self):
+        """Forget all jobs that are no longer active and delete their output folders."""
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if not job.is_active]
+            self._jobs = {k: v for k, v in self._jobs.items() if v.is_active}
+        self._save_state()
+        for job_id in finished:
+            shutil.rmtree(self.output_dir(job_id), ignore_errors=True)
+
+    def shutdown(self, wait: bool = True):
+        """Cancel active jobs and stop the worker threads."""
+        for job in self.list_jobs():
+            if job.is_active:
+                self.cancel(job.job_id)
+        self._executor.shutdown(wait=wait)
+
+
+def _count_lines(file_path: str) -> int:
+    """Count non-empty lines in a text file (0 if it cannot be read)."""
+    try:
+        with open(file_path, 'rb') as f:
+            return sum(1 for line in f if line.strip())
+    except OSError:
+        return 0
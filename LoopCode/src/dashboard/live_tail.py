@@ -0,0 +1,337 @@
+"""
+Live Tail for Detected Events
+==============================
+
+Incremental loader for events.jsonl used by the dashboard's live mode.
+Each poll reads only the bytes appended since the previous poll, parses
+the new events and appends them to the cached DataFrame and running
+aggregates, so refresh cost is proportional to the number of new events.
+
+Events are kept in growable numpy column arrays (capacity doubles when
+full). The DataFrame handed to the dashboard is a zero-copy view of the
+filled rows, so appending a chunk copies only the chunk, never the
+history. Text columns are therefore plain object columns.
+
+Author: LoopCode
+Date: October 2025
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Number of bytes at the start of the file, and before the consumed offset,
+# used to recognise a file that was rewritten in place
+FINGERPRINT_BYTES = 256
+
+# Initial row capacity of the column arrays
+INITIAL_CAPACITY = 1024
+
+# Event IDs counted as fraud
+FRAUD_EVENTS = ('E001', 'E002', 'E003')
+
+# Columns of EventTail.breakdown()
+BREAKDOWN_COLUMNS = ['event_id', 'event_name', 'station_id', 'hour', 'count']
+
+
+def events_to_dataframe(events: List[Dict]) -> pd.DataFrame:
+    """
+    Flatten parsed events into a DataFrame.
+
+    Args:
+        events: List of parsed event dictionaries
+
+    Returns:
+        DataFrame with timestamp, event_id, event_name and all event_data fields
+    """
+    if not events:
+        return pd.DataFrame()
+
+    df_data = []
+    for event in events:
+        row = {
+            'timestamp': event['timestamp'],
+            'event_id': event['event_id'],
+            'event_name': event['event_data'].get('event_name', ''),
+        }
+        # Add all event_data fields
+        row.update(event['event_data'])
+        df_data.append(row)
+
+    df = pd.DataFrame(df_data)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df
+
+
+def _column_values(series: pd.Series) -> np.ndarray:
+    """A chunk column as a numpy array (text and mixed columns as objects, NaN for missing)."""
+    if series.dtype.kind in 'fiubM':
+        return series.to_numpy()
+    return series.to_numpy(dtype=object, na_value=np.nan)
+
+
+def _nullable(dtype: np.dtype) -> np.dtype:
+    """Dtype that can hold a missing value alongside values of dtype."""
+    if dtype.kind in 'iu':
+        return np.dtype('float64')
+    if dtype.kind == 'b':
+        return np.dtype(object)
+    return dtype
+
+
+def _missing(dtype: np.dtype):
+    return np.datetime64('NaT') if dtype.kind == 'M' else np.nan
+
+
+class _ColumnStore:
+    """
+    Growable column arrays with a zero-copy DataFrame view of the filled rows.
+
+    Rows are only ever written past the filled range, so views handed out
+    earlier never change.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.capacity = 0
+        self.columns: Dict[str, np.ndarray] = {}
+
+    def _retype(self, name: str, dtype: np.dtype):
+        """Convert a column to a wider dtype (a copy, once per dtype change)."""
+        column = np.empty(self.capacity, dtype=dtype)
+        column[:self.rows] = self.columns[name][:self.rows].astype(dtype)
+        self.columns[name] = column
+
+    def append(self, chunk: pd.DataFrame):
+        """Add a chunk's rows; columns missing on either side become missing values."""
+        start, count = self.rows, len(chunk)
+        if start + count > self.capacity:
+            self.capacity = max(INITIAL_CAPACITY, 2 * self.capacity, start + count)
+            for name, column in self.columns.items():
+                grown = np.empty(self.capacity, dtype=column.dtype)
+                grown[:start] = column[:start]
+                self.columns[name] = grown
+
+        for name in chunk.columns:
+            values = _column_values(chunk[name])
+            column = self.columns.get(name)
+            if column is None:
+                dtype = _nullable(values.dtype) if start else values.dtype
+                column = self.columns[name] = np.empty(self.capacity, dtype=dtype)
+                column[:start] = _missing(dtype)
+            elif column.dtype != values.dtype:
+                dtype = np.result_type(column.dtype, values.dtype)
+                if dtype.kind not in 'fiuM' or 'M' in (column.dtype.kind, values.dtype.kind):
+                    dtype = np.dtype(object)
+                if dtype != column.dtype:
+                    self._retype(name, dtype)
+            self.columns[name][start:start + count] = values
+
+        for name, column in self.columns.items():
+            if name not in chunk.columns:
+                dtype = _nullable(column.dtype)
+                if dtype != column.dtype:
+                    self._retype(name, dtype)
+                self.columns[name][start:start + count] = _missing(dtype)
+        self.rows += count
+
+    def view(self) -> pd.DataFrame:
+        """DataFrame over the filled rows, sharing memory with the arrays."""
+        return pd.DataFrame({name: pd.Series(column[:self.rows], dtype=column.dtype, copy=False)
+                             for name, column in self.columns.items()}, copy=False)
+
+
+class EventTail:
+    """
+    Offset-based incremental reader for an events.jsonl file.
+
+    Only complete lines are consumed; a trailing partial line is left for
+    the next poll. If the file shrinks, is replaced, or its first bytes or
+    the bytes just before the consumed offset change (the detector rewrote
+    it), the tail resets and reloads from the start. generation changes on
+    every reset, so consumers know earlier rows are no longer valid.
+    """
+
+    def __init__(self, events_file: str):
+        """
+        Initialize the tail.
+
+        Args:
+            events_file: Path to the events.jsonl file to follow
+        """
+        self.events_file = Path(events_file)
+        self._lock = threading.Lock()
+        self.generation = -1
+        self._reset()
+
+    def _reset(self):
+        """Forget everything read so far."""
+        self.offset = 0
+        self.total_events = 0
+        self.event_counts = Counter()
+        self.station_counts = Counter()
+        # (event_id, event_name, station_id, hour) -> events, and
+        # (event_id, station_id, customer_id) -> fraud events
+        self.breakdown_counts = Counter()
+        self.fraud_customer_counts = Counter()
+        self._inode = None
+        self._fingerprint = b''
+        self._tail_bytes = b''
+        self._store = _ColumnStore()
+        self._frame: Optional[pd.DataFrame] = pd.DataFrame()
+        self.generation += 1
+
+    def _file_replaced(self, f, stat: os.stat_result) -> bool:
+        """Check whether the file was truncated, replaced or rewritten."""
+        if self._inode is not None and stat.st_ino != self._inode:
+            return True
+        if stat.st_size < self.offset:
+            return True
+        if self._fingerprint:
+            f.seek(0)
+            if f.read(len(self._fingerprint)) != self._fingerprint:
+                return True
+        if self._tail_bytes:
+            # A rewrite that kept the header and grew past the offset
+            f.seek(self.offset - len(self._tail_bytes))
+            if f.read(len(self._tail_bytes)) != self._tail_bytes:
+                return True
+        return False
+
+    def poll(self) -> int:
+        """
+        Read events appended since the last poll.
+
+        Returns:
+            Number of new events read (after a reset, all events in the file)
+
+        Raises:
+            FileNotFoundError: If the events file does not exist
+        """
+        with self._lock:
+            with open(self.events_file, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                if self._file_replaced(f, stat):
+                    self._reset()
+
+                if stat.st_size == self.offset:
+                    return 0
+
+                f.seek(self.offset)
+                chunk = f.read(stat.st_size - self.offset)
+
+            # Only consume complete lines
+            end = chunk.rfind(b'\n')
+            if end < 0:
+                return 0
+            chunk = chunk[:end + 1]
+
+            events = []
+            for line in chunk.splitlines():
+                if line.strip():
+                    events.append(json.loads(line))
+
+            if self.offset == 0:
+                self._inode = stat.st_ino
+                self._fingerprint = chunk[:FINGERPRINT_BYTES]
+            self._tail_bytes = (self._tail_bytes + chunk)[-FINGERPRINT_BYTES:]
+            self.offset += len(chunk)
+
+            if events:
+                self._update_aggregates(events)
+                self._store.append(events_to_dataframe(events))
+                self._frame = None
+            return len(events)
+
+    def _update_aggregates(self, events: List[Dict]):
+        """Fold new events into the running aggregates."""
+        self.total_events += len(events)
+        for event in events:
+            event_id = event['event_id']
+            data = event['event_data']
+            self.event_counts[event_id] += 1
+            station_id = data.get('station_id')
+            if station_id is not None:
+                self.station_counts[station_id] += 1
+            hour = datetime.fromisoformat(event['timestamp']).hour
+            self.breakdown_counts[(event_id, data.get('event_name', ''), station_id, hour)] += 1
+            if event_id in FRAUD_EVENTS and data.get('customer_id') is not None:
+                self.fraud_customer_counts[(event_id, station_id, data['customer_id'])] += 1
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """
+        All events read so far.
+
+        The same object is returned until new events arrive. A new one
+        shares memory with the previous one and starts with the same rows
+        (unless generation changed), so tables can extend their indexes.
+        """
+        with self._lock:
+            if self._frame is None:
+                self._frame = self._store.view()
+            return self._frame
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Get headline counts without touching the DataFrame.
+
+        Returns:
+            Dictionary with total, fraud, queue, crash and station counts
+        """
+        with self._lock:
+            return {
+                'total': self.total_events,
+                'fraud': sum(self.event_counts[e] for e in FRAUD_EVENTS),
+                'queue': sum(self.event_counts[e] for e in ('E005', 'E006')),
+                'crashes': self.event_counts['E004'],
+                'stations': len(self.station_counts)
+            }
+
+    def breakdown(self, event_id: Optional[str] = None, station_id: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get running event counts by event, name, station and hour of day.
+
+        Filtered summaries are grouped from these counts, so their cost
+        depends on the number of distinct keys, not on the number of events.
+
+        Args:
+            event_id: Only this event type (all if None)
+            station_id: Only this station (all if None)
+
+        Returns:
+            DataFrame with event_id, event_name, station_id, hour and count columns
+        """
+        with self._lock:
+            rows = [(*key, count) for key, count in self.breakdown_counts.items()
+                    if (event_id is None or key[0] == event_id)
+                    and (station_id is None or key[2] == station_id)]
+        return pd.DataFrame(rows, columns=BREAKDOWN_COLUMNS)
+
+    def fraud_by_customer(self, event_id: Optional[str] = None,
+                          station_id: Optional[str] = None) -> pd.Series:
+        """
+        Get running fraud event counts per customer, largest first.
+
+        Args:
+            event_id: Only this event type (all fraud events if None)
+            station_id: Only this station (all if None)
+
+        Returns:
+            Series of counts indexed by customer_id
+        """
+        counts = Counter()
+        with self._lock:
+            for (fraud_id, fraud_station, customer_id), count in self.fraud_customer_counts.items():
+                if ((event_id is None or fraud_id == event_id)
+                        and (station_id is None or fraud_station == station_id)):
+                    counts[customer_id] += count
+        return pd.Series(dict(counts.most_common()), name='count', dtype='int64')
@@ -82,6 +82,8 @@ class RFIDReading:
     epc: str
     location: str
     sku: str
+    last_seen: Optional[str] = None  # Set when repeated reads were collapsed
+    read_count: int = 1
     
     @classmethod
     def from_stream(cls, stream_data: Dict) -> 'RFIDReading':
@@ -104,7 +106,10 @@ class ProductRecognition:
     station_id: str
     status: str
     predicted_product: str
-    accuracy: float
+    accuracy: float  # Highest accuracy when a burst of frames was aggregated
+    last_seen: Optional[str] = None  # Set when a burst of frames was aggregated
+    frame_count: int = 1
+    mean_accuracy: Optional[float] = None
     
     @classmethod
     def from_stream(cls, stream_data: Dict) -> 'ProductRecognition':
@@ -162,14 +167,18 @@ class DetectedEvent:
     timestamp: str
     event_id: str
     event_data: Dict[str, Any]
+    catalog_version: Optional[int] = None  # Set when detection used a versioned catalog
     
     def to_json(self) -> str:
         """Convert to JSON string for output"""
-        return json.dumps({
+        record = {
             'timestamp': self.timestamp,
             'event_id': self.event_id,
             'event_data': self.event_data
-        })
+        }
+        if self.catalog_version is not None:
+            record['catalog_version'] = self.catalog_version
+        return json.dumps(record)
     
     @staticmethod
     def create_success_operation(timestamp: str, station_id: str, 
@@ -11,8 +11,12 @@ Date: October 2025
 
 # -*- coding: utf-8 -*-
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Callable, Optional
+from dataclasses import replace
 from pathlib import Path
+import contextlib
+import functools
+import threading
 import sys
 
 # Add parent directory to path for imports
@@ -39,8 +43,54 @@ from algorithms.anomaly_detector import (
 )
 from utils.helpers import (
     load_products_catalog, load_customers_data,
-    load_jsonl_file, save_events_to_jsonl
+    load_jsonl_file, save_events_to_jsonl, load_cached
 )
+from utils.instrumentation import RunRecorder, count_records, report_path_for
+from utils.profiling import RunProfiler
+from utils.catalog_service import CatalogService, CatalogSnapshot
+from utils.ingestion import deduplicate_rfid, aggregate_vision_bursts
+from utils.heavy_hitters import RiskTracker
+from utils.cardinality import CardinalityIndex, index_path_for
+from utils.thresholds import ThresholdRules
+
+
+# Progress callback: (stage, step name, fraction of the run completed)
+ProgressCallback = Callable[[str, Optional[str], float], None]
+
+# Detector name -> pure-Python implementation (the 'python' backend)
+PYTHON_DETECTORS = {
+    'success_operations': detect_success_operations,
+    'scanner_avoidance_vision': detect_scanner_avoidance_vision,
+    'scanner_avoidance_rfid': detect_scanner_avoidance_rfid,
+    'barcode_switching': detect_barcode_switching,
+    'weight_discrepancies': detect_weight_discrepancies,
+    'long_queues': detect_long_queues,
+    'long_wait_times': detect_long_wait_times,
+    'staffing_needs': predict_staffing_needs,
+    'station_status': manage_station_status,
+    'inventory_discrepancies': detect_inventory_discrepancies,
+    'system_crashes': detect_system_crashes
+}
+
+# Detector backends selectable with EventDetector(backend=...)
+BACKENDS = ('python', 'pandas')
+
+
+class DetectionCancelled(Exception):
+    """Raised when a detection run is cancelled before it completes."""
+
+
+def _instrumented_stage(stage: str):
+    """Decorator measuring a pipeline stage when instrumentation is enabled."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.recorder is None:
+                return method(self, *args, **kwargs)
+            with self.recorder.span(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
 
 
 class EventDetector:
@@ -51,14 +101,83 @@ class EventDetector:
     and generates the events.jsonl output file.
     """
     
-    def __init__(self, data_dir: str):
+    # Pipeline stages in execution order with the number of progress steps in each
+    STAGES = {
+        'load': 7,
+        'fraud': 5,
+        'queue': 4,
+        'inventory': 1,
+        'anomaly': 1,
+        'save': 1
+    }
+    
+    def __init__(self, data_dir: str,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 use_cache: bool = False,
+                 instrument: bool = False,
+                 trace_memory: bool = False,
+                 profiler: Optional[RunProfiler] = None,
+                 products_catalog: Optional[Dict[str, Dict]] = None,
+                 customers_data: Optional[Dict[str, Dict]] = None,
+                 catalog_service: Optional[CatalogService] = None,
+                 rfid_dedup_window: Optional[float] = None,
+                 vision_burst_window: Optional[float] = None,
+                 cardinality: bool = False,
+                 backend: str = 'python',
+                 thresholds: Optional[ThresholdRules] = None):
         """
         Initialize EventDetector with data directory.
         
         Args:
             data_dir: Path to directory containing input data
+            progress_callback: Called after every load step and detector call
+            cancel_event: When set, the run stops at the next step boundary
+            use_cache: Reuse parsed input files across runs while they are unchanged
+            instrument: Record timing and record counts per stage and detector call
+            trace_memory: Also record tracemalloc peaks (implies instrument)
+            profiler: Started RunProfiler; each detector call and file load becomes a section
+            products_catalog: Already parsed catalog to use instead of products_list.csv
+            customers_data: Already parsed customers to use instead of customer_data.csv
+            catalog_service: Versioned catalog to use instead of products_list.csv;
+                events are stamped with the catalog version they were detected with
+            rfid_dedup_window: Collapse repeated reads of the same tag at a station
+                that are at most this many seconds apart (disabled if None)
+            vision_burst_window: Merge per-frame predictions of the same product at a
+                station that are at most this many seconds apart (disabled if None)
+            cardinality: Build HyperLogLog sketches of unique customers and SKUs
+                per (station, hour) and write them next to the output
+            backend: 'python' runs the detectors in algorithms/ record by record;
+                'pandas' runs the vectorized ones in algorithms/vectorized.py,
+                which produce the same events
+            thresholds: Compiled threshold configuration (store- and station-level
+                overrides of the detectors' default thresholds)
         """
         self.data_dir = Path(data_dir)
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.use_cache = use_cache
+        self.recorder = RunRecorder(trace_memory) if (instrument or trace_memory) else None
+        self.profiler = profiler
+        self.shared_products_catalog = products_catalog
+        self.shared_customers_data = customers_data
+        self.catalog_service = catalog_service
+        self.catalog_version: Optional[int] = None
+        # Lookup indexes of products_catalog when no catalog service is used
+        self._catalog_index: Optional[CatalogSnapshot] = None
+        self.rfid_dedup_window = rfid_dedup_window
+        self.vision_burst_window = vision_burst_window
+        self.cardinality_index: Optional[CardinalityIndex] = CardinalityIndex() if cardinality else None
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend {backend!r} (expected one of {', '.join(BACKENDS)})")
+        self.backend = backend
+        if backend == 'pandas':
+            # Imported on demand so the default backend does not load pandas
+            from algorithms import vectorized
+            self.detectors = vectorized.DETECTORS
+        else:
+            self.detectors = PYTHON_DETECTORS
+        self.thresholds = thresholds
         self.products_catalog = {}
         self.customers_data = {}
         self.pos_transactions = []
@@ -67,127 +186,274 @@ class EventDetector:
         self.queue_monitoring = []
         self.inventory_snapshots = []
         self.detected_events = []
+        self._completed_steps = 0
+    
+    def _check_cancelled(self):
+        """Raise DetectionCancelled if the cancel event has been set."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise DetectionCancelled("Detection cancelled")
+    
+    def _advance(self, stage: str, step: Optional[str] = None):
+        """Record a completed step and report progress."""
+        self._completed_steps += 1
+        if self.progress_callback is not None:
+            total_steps = sum(self.STAGES.values())
+            fraction = min(1.0, self._completed_steps / total_steps)
+            self.progress_callback(stage, step, fraction)
     
+    def _profile_section(self, stage: str, name: str):
+        """Profiler section for a step, or a no-op context when not profiling."""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.section(f"{stage}.{name}")
+    
+    def _detector_scope(self):
+        """Context for the detectors of one run (shared input frames for the pandas backend)."""
+        if self.backend == 'pandas':
+            from algorithms.vectorized import shared_frames
+            return shared_frames()
+        return contextlib.nullcontext()
+    
+    def _run_detector(self, stage: str, name: str, detector: Callable,
+                      *args, **kwargs) -> List[DetectedEvent]:
+        """Run a single detector, collect its events and report progress."""
+        self._check_cancelled()
+        if self.thresholds is not None:
+            detector = self.thresholds.bind(name, detector)
+        with self._profile_section(stage, name):
+            if self.recorder is None:
+                events = detector(*args, **kwargs)
+            else:
+                records_in = sum(count_records(arg) for arg in args)
+                with self.recorder.span(stage, name, records_in) as span:
+                    events = detector(*args, **kwargs)
+                    span.records_out = len(events)
+        if self.catalog_version is not None:
+            for event in events:
+                event.catalog_version = self.catalog_version
+        self.detected_events.extend(events)
+        self._advance(stage, name)
+        return events
+    
+    def _load_file(self, file_path: Path, loader: Callable, key: str):
+        """Load an input file, going through the shared cache when enabled."""
+        self._check_cancelled()
+        with self._profile_section('load', file_path.name):
+            if self.recorder is None:
+                return self._read_file(file_path, loader, key)
+            with self.recorder.span('load', file_path.name) as span:
+                data = self._read_file(file_path, loader, key)
+                span.records_in = span.records_out = count_records(data)
+        return data
+    
+    def _read_file(self, file_path: Path, loader: Callable, key: str):
+        """Read an input file directly or through the shared cache."""
+        if self.use_cache:
+            return load_cached(str(file_path), loader, key=key)
+        return loader(str(file_path))
+    
+    def _load_stream(self, file_path: Path, model) -> List:
+        """Load a JSONL stream file into a list of data model instances."""
+        return self._load_file(
+            file_path,
+            lambda path: [model.from_stream(d) for d in load_jsonl_file(path)],
+            key=model.__name__
+        )
+    
+    @_instrumented_stage('load')
     def load_data(self):
         """Load all input data from files."""
         print("Loading input data...")
         
         # Load CSV files
         products_csv = self.data_dir / 'products_list.csv'
-        if products_csv.exists():
-            self.products_catalog = load_products_catalog(str(products_csv))
+        if self.shared_products_catalog is not None:
+            self.products_catalog = self.shared_products_catalog
+            print(f"  [OK] Using shared catalog of {len(self.products_catalog)} products")
+        elif self.catalog_service is not None:
+            self.refresh_catalog()
+            print(f"  [OK] Using catalog version {self.catalog_version} "
+                  f"with {len(self.products_catalog)} products")
+        elif products_csv.exists():
+            self.products_catalog = self._load_file(
+                products_csv, load_products_catalog, 'products')
             print(f"  [OK] Loaded {len(self.products_catalog)} products")
+        self._advance('load', 'products_list.csv')
         
         customers_csv = self.data_dir / 'customer_data.csv'
-        if customers_csv.exists():
-            self.customers_data = load_customers_data(str(customers_csv))
+        if self.shared_customers_data is not None:
+            self.customers_data = self.shared_customers_data
+            print(f"  [OK] Using shared data of {len(self.customers_data)} customers")
+        elif customers_csv.exists():
+            self.customers_data = self._load_file(
+                customers_csv, load_customers_data, 'customers')
             print(f"  [OK] Loaded {len(self.customers_data)} customers")
+        self._advance('load', 'customer_data.csv')
         
         # Load JSONL files
         pos_file = self.data_dir / 'pos_transactions.jsonl'
         if pos_file.exists():
-            pos_data = load_jsonl_file(str(pos_file))
-            self.pos_transactions = [POSTransaction.from_stream(d) for d in pos_data]
+            self.pos_transactions = [self.resolve_sku(transaction) for transaction
+                                     in self._load_stream(pos_file, POSTransaction)]
             print(f"  [OK] Loaded {len(self.pos_transactions)} POS transactions")
+        self._advance('load', pos_file.name)
         
         rfid_file = self.data_dir / 'rfid_readings.jsonl'
         if rfid_file.exists():
-            rfid_data = load_jsonl_file(str(rfid_file))
-            self.rfid_readings = [RFIDReading.from_stream(d) for d in rfid_data]
+            self.rfid_readings = [self.resolve_sku(reading) for reading
+                                  in self._load_stream(rfid_file, RFIDReading)]
             print(f"  [OK] Loaded {len(self.rfid_readings)} RFID readings")
+            if self.rfid_dedup_window is not None:
+                reads = len(self.rfid_readings)
+                self.rfid_readings = deduplicate_rfid(self.rfid_readings, self.rfid_dedup_window)
+                print(f"  [OK] Collapsed {reads} RFID reads into {len(self.rfid_readings)} records")
+        self._advance('load', rfid_file.name)
         
         recognition_file = self.data_dir / 'product_recognition.jsonl'
         if recognition_file.exists():
-            recognition_data = load_jsonl_file(str(recognition_file))
-            self.product_recognitions = [ProductRecognition.from_stream(d) for d in recognition_data]
+            self.product_recognitions = self._load_stream(recognition_file, ProductRecognition)
             print(f"  [OK] Loaded {len(self.product_recognitions)} product recognitions")
+            if self.vision_burst_window is not None:
+                frames = len(self.product_recognitions)
+                self.product_recognitions = aggregate_vision_bursts(self.product_recognitions,
+                                                                    self.vision_burst_window)
+                print(f"  [OK] Aggregated {frames} vision predictions into "
+                      f"{len(self.product_recognitions)} bursts")
+        self._advance('load', recognition_file.name)
         
         queue_file = self.data_dir / 'queue_monitoring.jsonl'
         if queue_file.exists():
-            queue_data = load_jsonl_file(str(queue_file))
-            self.queue_monitoring = [QueueMonitoring.from_stream(d) for d in queue_data]
+            self.queue_monitoring = self._load_stream(queue_file, QueueMonitoring)
             print(f"  [OK] Loaded {len(self.queue_monitoring)} queue measurements")
+        self._advance('load', queue_file.name)
         
         inventory_file = self.data_dir / 'inventory_snapshots.jsonl'
         if inventory_file.exists():
-            inventory_data = load_jsonl_file(str(inventory_file))
-            self.inventory_snapshots = [InventorySnapshot.from_stream(d) for d in inventory_data]
+            self.inventory_snapshots = self._load_stream(inventory_file, InventorySnapshot)
             print(f"  [OK] Loaded {len(self.inventory_snapshots)} inventory snapshots")
+        self._advance('load', inventory_file.name)
         
         print("Data loading complete!\n")
     
+    def refresh_catalog(self):
+        """Switch to the catalog service's latest snapshot."""
+        snapshot = self.catalog_service.current
+        self.products_catalog = snapshot.products
+        self.catalog_version = snapshot.version
+    
+    @property
+    def catalog_index(self) -> CatalogSnapshot:
+        """Barcode and EPC indexes of the catalog in use."""
+        if self.catalog_service is not None:
+            return self.catalog_service.current
+        if self._catalog_index is None or self._catalog_index.products is not self.products_catalog:
+            self._catalog_index = CatalogSnapshot(self.products_catalog, 0)
+        return self._catalog_index
+    
+    def resolve_sku(self, record):
+        """
+        Fill in the SKU of a record that only identifies its product otherwise.
+        
+        RFID reads without a SKU are resolved from their EPC tag, POS scans
+        from their barcode. Records are shared with the load cache, so a
+        resolved record is a copy.
+        
+        Args:
+            record: RFIDReading or POSTransaction
+            
+        Returns:
+            The record, or a copy with the SKU found in the catalog
+        """
+        if record.sku:
+            return record
+        if isinstance(record, RFIDReading) and record.epc:
+            sku = self.catalog_index.sku_for_epc(record.epc)
+        elif isinstance(record, POSTransaction) and record.barcode:
+            sku = self.catalog_index.sku_for_barcode(record.barcode)
+        else:
+            return record
+        return replace(record, sku=sku) if sku else record
+    
+    @_instrumented_stage('fraud')
     def run_fraud_detection(self):
         """Run all fraud detection algorithms."""
         print("Running fraud detection algorithms...")
         
         # Detect success operations
-        success_events = detect_success_operations(
+        success_events = self._run_detector(
+            'fraud', 'success_operations',
+            self.detectors['success_operations'],
             self.pos_transactions,
             self.rfid_readings,
             self.products_catalog
         )
-        self.detected_events.extend(success_events)
         print(f"  [OK] Detected {len(success_events)} success operations")
         
         # Detect scanner avoidance (PRIMARY: Vision-based detection)
         # This aligns with Zebra documentation about vision system predictions
-        avoidance_events_vision = detect_scanner_avoidance_vision(
+        avoidance_events_vision = self._run_detector(
+            'fraud', 'scanner_avoidance_vision',
+            self.detectors['scanner_avoidance_vision'],
             self.product_recognitions,
             self.pos_transactions
         )
-        self.detected_events.extend(avoidance_events_vision)
         print(f"  [OK] Detected {len(avoidance_events_vision)} scanner avoidance events (vision-based)")
         
         # Detect scanner avoidance (SECONDARY: RFID-based detection)
         # Additional layer using RFID tags for redundancy
-        avoidance_events_rfid = detect_scanner_avoidance_rfid(
+        avoidance_events_rfid = self._run_detector(
+            'fraud', 'scanner_avoidance_rfid',
+            self.detectors['scanner_avoidance_rfid'],
             self.rfid_readings,
             self.pos_transactions
         )
-        self.detected_events.extend(avoidance_events_rfid)
         print(f"  [OK] Detected {len(avoidance_events_rfid)} scanner avoidance events (RFID-based)")
         
         # Detect barcode switching
-        switching_events = detect_barcode_switching(
+        switching_events = self._run_detector(
+            'fraud', 'barcode_switching',
+            self.detectors['barcode_switching'],
             self.pos_transactions,
             self.product_recognitions,
             self.products_catalog
         )
-        self.detected_events.extend(switching_events)
         print(f"  [OK] Detected {len(switching_events)} barcode switching events")
         
         # Detect weight discrepancies
-        weight_events = detect_weight_discrepancies(
+        weight_events = self._run_detector(
+            'fraud', 'weight_discrepancies',
+            self.detectors['weight_discrepancies'],
             self.pos_transactions,
             self.products_catalog
         )
-        self.detected_events.extend(weight_events)
         print(f"  [OK] Detected {len(weight_events)} weight discrepancy events")
     
+    @_instrumented_stage('queue')
     def run_queue_analysis(self):
         """Run all queue analysis algorithms."""
         print("\nRunning queue analysis algorithms...")
         
         # Detect long queues
-        long_queue_events = detect_long_queues(self.queue_monitoring)
-        self.detected_events.extend(long_queue_events)
+        long_queue_events = self._run_detector(
+            'queue', 'long_queues', self.detectors['long_queues'], self.queue_monitoring)
         print(f"  [OK] Detected {len(long_queue_events)} long queue events")
         
         # Detect long wait times
-        wait_time_events = detect_long_wait_times(self.queue_monitoring)
-        self.detected_events.extend(wait_time_events)
+        wait_time_events = self._run_detector(
+            'queue', 'long_wait_times', self.detectors['long_wait_times'], self.queue_monitoring)
         print(f"  [OK] Detected {len(wait_time_events)} long wait time events")
         
         # Predict staffing needs
-        staffing_events = predict_staffing_needs(self.queue_monitoring)
-        self.detected_events.extend(staffing_events)
+        staffing_events = self._run_detector(
+            'queue', 'staffing_needs', self.detectors['staffing_needs'], self.queue_monitoring)
         print(f"  [OK] Detected {len(staffing_events)} staffing needs events")
         
         # Manage station status
-        station_events = manage_station_status(self.queue_monitoring)
-        self.detected_events.extend(station_events)
+        station_events = self._run_detector(
+            'queue', 'station_status', self.detectors['station_status'], self.queue_monitoring)
         print(f"  [OK] Detected {len(station_events)} checkout station actions")
     
+    @_instrumented_stage('inventory')
     def run_inventory_monitoring(self):
         """Run inventory monitoring algorithms."""
         print("\nRunning inventory monitoring algorithms...")
@@ -197,44 +463,70 @@ class EventDetector:
             initial_snapshot = self.inventory_snapshots[0]
             final_snapshot = self.inventory_snapshots[-1]
             
-            inventory_events = detect_inventory_discrepancies(
+            inventory_events = self._run_detector(
+                'inventory', 'inventory_discrepancies',
+                self.detectors['inventory_discrepancies'],
                 initial_snapshot,
                 final_snapshot,
                 self.pos_transactions
             )
-            self.detected_events.extend(inventory_events)
             print(f"  [OK] Detected {len(inventory_events)} inventory discrepancy events")
         else:
             print("  [WARN] Not enough inventory snapshots for discrepancy detection")
+            self._advance('inventory', 'inventory_discrepancies')
+    
+    @staticmethod
+    def timeline_entries(record, kind: str) -> List[Dict]:
+        """
+        Activity timeline entries of one POS, RFID or queue record.
+        
+        Args:
+            record: POSTransaction, RFIDReading or QueueMonitoring
+            kind: 'pos', 'rfid' or 'queue'
+            
+        Returns:
+            List of {timestamp, station_id, type} dictionaries
+        """
+        entries = [{
+            'timestamp': record.timestamp,
+            'station_id': record.station_id,
+            'type': kind
+        }]
+        if kind == 'rfid' and record.read_count > 1:
+            # A collapsed record also shows the station was alive when last seen
+            entries.append({
+                'timestamp': record.last_seen,
+                'station_id': record.station_id,
+                'type': kind
+            })
+        return entries
     
+    def build_station_timeline(self) -> List[Dict]:
+        """
+        Build the per-station activity timeline used for crash detection.
+        
+        Returns:
+            List of {timestamp, station_id, type} dictionaries
+        """
+        all_events = []
+        for records, kind in ((self.pos_transactions, 'pos'),
+                              (self.rfid_readings, 'rfid'),
+                              (self.queue_monitoring, 'queue')):
+            for record in records:
+                all_events.extend(self.timeline_entries(record, kind))
+        return all_events
+    
+    @_instrumented_stage('anomaly')
     def run_anomaly_detection(self):
         """Run anomaly detection algorithms."""
         print("\nRunning anomaly detection algorithms...")
         
         # Prepare all events for crash detection
-        all_events = []
-        for transaction in self.pos_transactions:
-            all_events.append({
-                'timestamp': transaction.timestamp,
-                'station_id': transaction.station_id,
-                'type': 'pos'
-            })
-        for reading in self.rfid_readings:
-            all_events.append({
-                'timestamp': reading.timestamp,
-                'station_id': reading.station_id,
-                'type': 'rfid'
-            })
-        for queue in self.queue_monitoring:
-            all_events.append({
-                'timestamp': queue.timestamp,
-                'station_id': queue.station_id,
-                'type': 'queue'
-            })
+        all_events = self.build_station_timeline()
         
         # Detect system crashes
-        crash_events = detect_system_crashes(all_events)
-        self.detected_events.extend(crash_events)
+        crash_events = self._run_detector(
+            'anomaly', 'system_crashes', self.detectors['system_crashes'], all_events)
         print(f"  [OK] Detected {len(crash_events)} system crash events")
     
     def run_all_detections(self):
@@ -243,15 +535,17 @@ class EventDetector:
         print("STARTING EVENT DETECTION")
         print("="*60 + "\n")
         
-        self.run_fraud_detection()
-        self.run_queue_analysis()
-        self.run_inventory_monitoring()
-        self.run_anomaly_detection()
+        with self._detector_scope():
+            self.run_fraud_detection()
+            self.run_queue_analysis()
+            self.run_inventory_monitoring()
+            self.run_anomaly_detection()
         
         print("\n" + "="*60)
         print(f"TOTAL EVENTS DETECTED: {len(self.detected_events)}")
         print("="*60 + "\n")
     
+    @_instrumented_stage('save')
     def save_events(self, output_path: str):
         """
         Save detected events to JSONL file.
@@ -259,11 +553,99 @@ class EventDetector:
         Args:
             output_path: Path to output events.jsonl file
         """
+        self._check_cancelled()
+        
         # Sort events by timestamp
         sorted_events = sorted(self.detected_events, key=lambda e: e.timestamp)
         
-        save_events_to_jsonl(sorted_events, output_path)
+        if self.recorder is None:
+            save_events_to_jsonl(sorted_events, output_path)
+        else:
+            with self.recorder.span('save', Path(output_path).name, len(sorted_events)) as span:
+                save_events_to_jsonl(sorted_events, output_path)
+                span.records_out = len(sorted_events)
         print(f"[OK] Events saved to: {output_path}\n")
+        self._advance('save', Path(output_path).name)
+    
+    def detect(self, output_path: Optional[str] = None) -> List[DetectedEvent]:
+        """
+        Run the complete pipeline in-process: load, detect and optionally save.
+        
+        Progress is reported through the progress callback after every load
+        step and detector call, and the cancel event is checked in between.
+        
+        Args:
+            output_path: Optional path of the events.jsonl file to write
+            
+        Returns:
+            List of detected events
+            
+        Raises:
+            DetectionCancelled: If the cancel event was set during the run
+        """
+        self.detected_events = []
+        self._completed_steps = 0
+        if self.recorder is not None:
+            self.recorder.reset()
+        
+        self.load_data()
+        self.run_all_detections()
+        
+        if self.cardinality_index is not None:
+            self.build_cardinality_index()
+        
+        if output_path:
+            self.save_events(output_path)
+            self.write_run_report(output_path)
+            self.write_cardinality_index(output_path)
+        elif self.progress_callback is not None:
+            self._advance('save')
+        
+        return self.detected_events
+    
+    def write_run_report(self, output_path: str) -> Optional[str]:
+        """
+        Write the instrumentation report next to an events.jsonl file.
+        
+        Args:
+            output_path: Path of the events.jsonl file
+            
+        Returns:
+            Path of the report, or None if instrumentation is disabled
+        """
+        if self.recorder is None:
+            return None
+        self.recorder.stop()
+        report_path = report_path_for(output_path)
+        self.recorder.save(report_path)
+        return report_path
+    
+    def build_cardinality_index(self) -> CardinalityIndex:
+        """
+        Sketch unique customers and SKUs per (station, hour) from the POS stream.
+        
+        Returns:
+            The detector's cardinality index
+        """
+        self.cardinality_index = CardinalityIndex()
+        self.cardinality_index.add_transactions(self.pos_transactions)
+        return self.cardinality_index
+    
+    def write_cardinality_index(self, output_path: str) -> Optional[str]:
+        """
+        Write the cardinality index next to an events.jsonl file.
+        
+        Args:
+            output_path: Path of the events.jsonl file
+            
+        Returns:
+            Path of the index, or None if sketching is disabled
+        """
+        if self.cardinality_index is None:
+            return None
+        index_path = index_path_for(output_path)
+        self.cardinality_index.save(index_path)
+        return index_path
     
     def get_event_summary(self) -> Dict[str, int]:
         """
@@ -286,11 +668,53 @@ def main():
     parser = argparse.ArgumentParser(description='Project Sentinel Event Detector')
     parser.add_argument('--data-dir', required=True, help='Directory containing input data')
     parser.add_argument('--output', required=True, help='Output events.jsonl file path')
+    parser.add_argument('--report', action='store_true',
+                        help='Write a per-stage timing report (run_report.json) next to the output')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Include tracemalloc peaks in the report (slower)')
+    parser.add_argument('--report-table', action='store_true',
+                        help='Also print the report as a table')
+    parser.add_argument('--rfid-dedup-window', type=float, metavar='SECONDS',
+                        help='Collapse repeated RFID reads of the same tag within SECONDS')
+    parser.add_argument('--vision-burst-window', type=float, metavar='SECONDS',
+                        help='Merge vision predictions of the same product at a station within SECONDS')
+    parser.add_argument('--cardinality', action='store_true',
+                        help='Write unique customer/SKU sketches per station and hour (cardinality.json)')
+    parser.add_argument('--backend', choices=BACKENDS, default='python',
+                        help='Detector implementation: python loops or vectorized pandas (default: python)')
+    parser.add_argument('--thresholds', metavar='CONFIG_FILE',
+                        help='Threshold configuration with store and station overrides (JSON)')
+    parser.add_argument('--store', help='Store in the threshold configuration whose overrides apply')
+    parser.add_argument('--risk-tracker', metavar='STATE_FILE',
+                        help='Feed fraud events into a persistent high-risk customer tracker')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile the run, write pstats and collapsed-stack files and print the slowest functions')
+    parser.add_argument('--profile-dir',
+                        help='Directory for profile files (default: profile/ next to the output)')
     
     args = parser.parse_args()
     
+    thresholds = None
+    if args.thresholds:
+        thresholds = ThresholdRules.load(args.thresholds, args.store)
+    elif args.store:
+        parser.error('--store requires --thresholds')
+    
+    profiler = None
+    if args.profile:
+        profiler = RunProfiler()
+        profiler.start()
+    
     # Initialize detector
-    detector = EventDetector(args.data_dir)
+    detector = EventDetector(args.data_dir,
+                             instrument=args.report or args.report_table,
+                             trace_memory=args.trace_memory,
+                             profiler=profiler,
+                             rfid_dedup_window=args.rfid_dedup_window,
+                             vision_burst_window=args.vision_burst_window,
+                             cardinality=args.cardinality,
+                             backend=args.backend,
+                             thresholds=thresholds)
     
     # Load data
     detector.load_data()
@@ -307,6 +731,34 @@ def main():
     # Save events
     detector.save_events(args.output)
     
+    if args.cardinality:
+        detector.build_cardinality_index()
+        print(f"[OK] Cardinality index saved to: {detector.write_cardinality_index(args.output)}")
+    
+    if args.risk_tracker:
+        tracker = RiskTracker(state_path=args.risk_tracker)
+        counted = tracker.update(detector.detected_events)
+        tracker.save()
+        print(f"[OK] Risk tracker updated with {counted} fraud events: {args.risk_tracker}")
+    
+    report_path = detector.write_run_report(args.output)
+    if report_path:
+        print(f"[OK] Run report saved to: {report_path}")
+        if args.report_table:
+            print()
+            print(detector.recorder.format_table())
+            print()
+    
+    if profiler is not None:
+        profiler.stop()
+        profile_dir = args.profile_dir or str(Path(args.output).parent / 'profile')
+        paths = profiler.save(profile_dir)
+        print(f"[OK] Profile saved to: {paths['pstats']}")
+        print(f"[OK] Collapsed stacks saved to: {paths['collapsed']}")
+        print()
+        print(profiler.format_summary().strip('\n'))
+        print()
+    
     print("[OK] Detection complete!")
 
 
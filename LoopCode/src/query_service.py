@@ -0,0 +1,335 @@
+"""
+Event Query Service
+===================
+
+Read-only HTTP API over a detector's events.jsonl, backed by the SQLite
+index in utils/event_store.py, so dashboards and scripts can ask for
+the events they need instead of re-scanning the file.
+
+Endpoints (GET):
+    /events     Matching events as JSON lines, streamed in chunks
+                ?event_id=E001&event_id=E002&station_id=SCC1&customer_id=C001
+                &sku=PRD_F_01&start=2025-08-13T16:00:00&end=...&limit=100
+                &offset=0&order=desc
+    /count      {"count": N} for the same filters
+    /aggregate  Counts per time bucket, e.g. ?bucket=15min&group_by=station_id
+    /summary    Totals per event_id and station and the time range
+    /health     {"status": "ok", "events": N}
+
+The index is refreshed before each request, so events appended by the
+streaming detector show up immediately. Responses of repeated queries
+are served from an LRU cache until the index changes.
+
+Usage:
+    python query_service.py --events ../evidence/output/final/events.jsonl --port 8765
+
+Author: Team 01
+Date: October 2025
+"""
+
+# -*- coding: utf-8 -*-
+
+from typing import Dict, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+import json
+import sys
+import threading
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+
+from utils.event_store import EventStore, FILTER_FIELDS
+
+NDJSON = 'application/x-ndjson'
+JSON = 'application/json'
+
+# Responses larger than this are streamed but not cached
+MAX_CACHED_BYTES = 1 << 20
+
+# Bytes written per chunk of a streamed response
+CHUNK_BYTES = 64 * 1024
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of response bodies."""
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Responses kept (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        """Cached body for a key, marking it most recently used."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Tuple, body: bytes):
+        """Store a body, evicting the least recently used beyond max_entries."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class QueryError(ValueError):
+    """Invalid query parameters (answered with 400)"""
+
+
+def _single(params: Dict[str, List[str]], name: str) -> Optional[str]:
+    """Last value of a query parameter, or None."""
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def _integer(params: Dict[str, List[str]], name: str, default: Optional[int]) -> Optional[int]:
+    """Non-negative integer query parameter."""
+    value = _single(params, name)
+    if value is None:
+        return default
+    if not value.isdigit():
+        raise QueryError(f"{name} must be a non-negative integer")
+    return int(value)
+
+
+def _filters(params: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Filter values from query parameters (repeated or comma-separated)."""
+    filters = {}
+    for field in FILTER_FIELDS:
+        values = [v for value in params.get(field, []) for v in value.split(',') if v]
+        if values:
+            filters[field] = values
+    return filters
+
+
+class QueryService:
+    """Answers queries against an EventStore, caching repeated ones."""
+
+    def __init__(self, store: EventStore, cache_size: int = 128):
+        """
+        Initialize the service.
+
+        Args:
+            store: Indexed events
+            cache_size: Responses kept in the LRU cache
+        """
+        self.store = store
+        self.cache = ResponseCache(cache_size)
+
+    def _cache_key(self, path: str, params: Dict[str, List[str]]) -> Tuple:
+        return (self.store.generation, path,
+                tuple(sorted((k, tuple(v)) for k, v in params.items())))
+
+    def handle(self, path: str, params: Dict[str, List[str]]) -> Tuple[str, Iterator[bytes], Optional[Tuple]]:
+        """
+        Run a query.
+
+        Args:
+            path: Request path
+            params: Parsed query string
+
+        Returns:
+            Tuple of (content type, body chunks, cache key or None if uncacheable)
+
+        Raises:
+            KeyError: Unknown path
+            QueryError: Invalid parameters
+        """
+        self.store.refresh()
+        key = self._cache_key(path, params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return (NDJSON if path == '/events' else JSON), iter([cached]), None
+
+        filters = _filters(params)
+        start, end = _single(params, 'start'), _single(params, 'end')
+
+        if path == '/events':
+            order = _single(params, 'order') or 'asc'
+            if order not in ('asc', 'desc'):
+                raise QueryError("order must be asc or desc")
+            lines = self.store.query(filters, start, end,
+                                     limit=_integer(params, 'limit', None),
+                                     offset=_integer(params, 'offset', 0),
+                                     descending=order == 'desc')
+            return NDJSON, self._chunks(lines), key
+
+        if path == '/count':
+            body = {'count': self.store.count(filters, start, end)}
+        elif path == '/aggregate':
+            try:
+                buckets = self.store.aggregate(_single(params, 'bucket') or '1h',
+                                               _single(params, 'group_by'), filters, start, end)
+            except ValueError as e:
+                raise QueryError(str(e))
+            body = {'bucket': _single(params, 'bucket') or '1h', 'buckets': buckets}
+        elif path == '/summary':
+            body = self.store.summary()
+        elif path == '/health':
+            return JSON, iter([json.dumps({'status': 'ok', 'events': self.store.count()}).encode()]), None
+        else:
+            raise KeyError(path)
+        return JSON, iter([json.dumps(body).encode('utf-8')]), key
+
+    @staticmethod
+    def _chunks(lines: Iterator[str]) -> Iterator[bytes]:
+        """Group JSON lines into chunks of about CHUNK_BYTES."""
+        buffer: List[str] = []
+        size = 0
+        for line in lines:
+            buffer.append(line)
+            size += len(line) + 1
+            if size >= CHUNK_BYTES:
+                yield ('\n'.join(buffer) + '\n').encode('utf-8')
+                buffer, size = [], 0
+        if buffer:
+            yield ('\n'.join(buffer) + '\n').encode('utf-8')
+
+
+class QueryServer:
+    """Serves a QueryService over HTTP from a background thread"""
+
+    def __init__(self, service: QueryService, host: str = '127.0.0.1', port: int = 8765):
+        """
+        Initialize the server (not started).
+
+        Args:
+            service: Query service to expose
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.service = service
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(handler):
+                url = urlsplit(handler.path)
+                params = parse_qs(url.query)
+                try:
+                    content_type, chunks, cache_key = service.handle(url.path, params)
+                    first = next(chunks, b'')
+                except KeyError:
+                    handler._send_json(404, {'error': f"unknown endpoint {url.path}"})
+                    return
+                except QueryError as e:
+                    handler._send_json(400, {'error': str(e)})
+                    return
+
+                handler.send_response(200)
+                handler.send_header('Content-Type', content_type)
+                handler.send_header('Transfer-Encoding', 'chunked')
+                handler.end_headers()
+
+                # Stream the body, keeping a copy for the cache while it is small
+                kept: Optional[List[bytes]] = [] if cache_key is not None else None
+                kept_size = 0
+                try:
+                    chunk = first
+                    while chunk:
+                        handler._write_chunk(chunk)
+                        if kept is not None:
+                            kept_size += len(chunk)
+                            if kept_size <= MAX_CACHED_BYTES:
+                                kept.append(chunk)
+                            else:
+                                kept = None
+                        chunk = next(chunks, b'')
+                    handler.wfile.write(b'0\r\n\r\n')
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+                if kept is not None:
+                    service.cache.put(cache_key, b''.join(kept))
+
+            def _write_chunk(handler, chunk: bytes):
+                handler.wfile.write(f"{len(chunk):X}\r\n".encode('ascii') + chunk + b'\r\n')
+
+            def _send_json(handler, status: int, body: Dict):
+                data = json.dumps(body).encode('utf-8')
+                handler.send_response(status)
+                handler.send_header('Content-Type', JSON)
+                handler.send_header('Content-Length', str(len(data)))
+                handler.end_headers()
+                handler.wfile.write(data)
+
+            def log_message(handler, format, *args):
+                # Dashboards poll often; keep the console quiet
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Bound (host, port)."""
+        return self._server.server_address[:2]
+
+    def start(self):
+        """Start serving on a daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='sentinel-query', daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """Serve on the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Project Sentinel Event Query Service')
+    parser.add_argument('--events', required=True, help='events.jsonl file to serve')
+    parser.add_argument('--index', help='Index database (default: <events>.index.sqlite)')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8765, help='Port to bind (default: 8765)')
+    parser.add_argument('--cache-size', type=int, default=128,
+                        help='Query responses kept in the LRU cache (default: 128)')
+
+    args = parser.parse_args()
+
+    store = EventStore(args.events, args.index)
+    indexed = store.refresh()
+    print(f"[OK] Indexed {indexed} new events into {store.index_path}")
+
+    server = QueryServer(QueryService(store, args.cache_size), args.host, args.port)
+    host, port = server.address
+    print(f"[OK] Serving queries at http://{host}:{port}/events")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
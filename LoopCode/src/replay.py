@@ -0,0 +1,468 @@
+"""
+Recorded Stream Replay
+======================
+
+Feeds a recorded dataset (the *.jsonl files of an input directory) to
+the streaming detector as if it were live. The files are merged by
+timestamp with a k-way merge, so only one pending record per file is held
+in memory, and served over TCP in the envelope format the streaming
+detector reads:
+
+    {"dataset": "POS_Transactions", "sequence": 1, "event": {...record...}}
+
+Records are sent at 1x (the recorded inter-arrival times), Nx (the same
+times divided by N) or as fast as the client reads. With --loop the
+recording is replayed again and again, each pass with its timestamps
+moved past the end of the previous one. A connection that
+reads too slowly pushes back through the socket, so sending falls behind
+schedule; the lag is reported per connection.
+
+With --find-max-throughput the replay runs against an in-process
+StreamingDetector at increasing speeds and reports the highest record
+rate at which the detector's processing lag stays bounded. Trials loop
+the recording, so a short dataset still fills every trial. What is
+measured is the live path: parsing plus the detector's flushes, each of
+which only looks at new records and open per-station windows, so the
+cost per record does not grow with the length of the trial. The batch
+pass that rewrites events.jsonl at the end of a stream is skipped.
+
+Usage:
+    python replay.py --data-dir data/input --port 8765 --speed 10
+    python replay.py --data-dir data/input --port 8765 --speed 100 --loop
+    python streaming_detector.py --data-dir data/input --output out/events.jsonl --port 8765
+
+    python replay.py --data-dir data/input --find-max-throughput
+
+Author: Team 01
+Date: October 2025
+"""
+
+# -*- coding: utf-8 -*-
+
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+import heapq
+import json
+import math
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+
+from streaming_detector import DATASET_ALIASES, StreamingDetector, open_stream
+from utils.helpers import parse_timestamp, format_timestamp
+
+# Recorded file name -> envelope dataset name
+RECORDED_FILES = {f"{stream}.jsonl": dataset for dataset, stream in DATASET_ALIASES.items()}
+
+# Envelopes written to the socket at once while on or behind schedule
+SEND_BATCH = 256
+
+
+class RecordedStreams:
+    """
+    Time-ordered envelopes of a recorded dataset.
+
+    Each recorded file must be in time order, as written by the sensors;
+    records with equal timestamps are sent in file order.
+    """
+
+    def __init__(self, data_dir: str, duration: Optional[float] = None, loop: bool = False):
+        """
+        Find the recorded streams of a dataset.
+
+        Args:
+            data_dir: Directory containing the recorded *.jsonl files
+            duration: Only replay this many seconds of recorded time (all if None)
+            loop: Start over when the recording ends, with timestamps shifted
+                to follow the previous pass (endless unless duration is set)
+
+        Raises:
+            FileNotFoundError: If the directory holds none of the stream files
+        """
+        self.data_dir = Path(data_dir)
+        self.duration = duration
+        self.loop = loop
+        self.files = [(self.data_dir / name, dataset) for name, dataset in RECORDED_FILES.items()
+                      if (self.data_dir / name).exists()]
+        if not self.files:
+            raise FileNotFoundError(f"no recorded streams in {data_dir} "
+                                    f"(expected any of {', '.join(RECORDED_FILES)})")
+
+    @staticmethod
+    def _read(path: Path, dataset: str, order: int) -> Iterator[Tuple[float, int, int, str, str, bytes]]:
+        """Yield (epoch seconds, file order, line number, dataset, timestamp, record) of a file."""
+        seconds: Dict[str, float] = {}
+        with open(path, 'rb') as f:
+            for line_number, line in enumerate(f):
+                line = line.strip()
+                if not line:
+                    continue
+                timestamp = json.loads(line)['timestamp']
+                when = seconds.get(timestamp)
+                if when is None:
+                    if len(seconds) > 4096:
+                        seconds.clear()
+                    when = seconds[timestamp] = parse_timestamp(timestamp).timestamp()
+                yield when, order, line_number, dataset, timestamp, line
+
+    def envelopes(self) -> Iterator[Tuple[float, bytes]]:
+        """
+        Yield (offset in recorded seconds, envelope line) in timestamp order.
+
+        The record is embedded as recorded, without re-serializing it; on
+        looped passes only its timestamp value is replaced.
+        """
+        start = None
+        sequence = 0
+        # Whole seconds added to the recorded timestamps of the current pass
+        shift = 0
+        while True:
+            merged = heapq.merge(*(self._read(path, dataset, order)
+                                   for order, (path, dataset) in enumerate(self.files)))
+            shifted: Dict[str, bytes] = {}
+            last = None
+            for when, _, _, dataset, timestamp, record in merged:
+                if start is None:
+                    start = when
+                offset = when - start + shift
+                if self.duration is not None and offset >= self.duration:
+                    return
+                if shift:
+                    value = shifted.get(timestamp)
+                    if value is None:
+                        if len(shifted) > 4096:
+                            shifted.clear()
+                        value = shifted[timestamp] = format_timestamp(
+                            parse_timestamp(timestamp) + timedelta(seconds=shift)).encode('ascii')
+                    record = record.replace(timestamp.encode('ascii'), value, 1)
+                sequence += 1
+                last = when
+                yield offset, (b'{"dataset": "' + dataset.encode('ascii') + b'", "sequence": '
+                               + str(sequence).encode('ascii') + b', "event": ' + record + b'}\n')
+            if not self.loop or last is None:
+                return
+            # The next pass starts one second after this one ended
+            shift += math.ceil(last - start) + 1
+
+
+@dataclass
+class ReplayStats:
+    """Outcome of replaying to one connection"""
+    records: int = 0
+    recorded_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    # How far sending fell behind the paced schedule
+    max_lag_seconds: float = 0.0
+    final_lag_seconds: float = 0.0
+    completed: bool = False
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def replay(streams: RecordedStreams, sink: BinaryIO, speed: Optional[float] = 1.0,
+           offsets: Optional[List[float]] = None) -> ReplayStats:
+    """
+    Write a dataset's envelopes to a sink on the recorded schedule.
+
+    A record recorded t seconds after the first one is due t / speed
+    seconds after the replay starts. Records already due are written in
+    batches; the sink is flushed before each wait.
+
+    Args:
+        streams: Recorded dataset
+        sink: Binary writer (socket file or regular file)
+        speed: Replay speed factor (None or 0 sends as fast as the sink accepts)
+        offsets: If given, receives the recorded offset of every record sent
+
+    Returns:
+        ReplayStats
+    """
+    stats = ReplayStats()
+    started = time.monotonic()
+    batch: List[bytes] = []
+    lag = 0.0
+
+    def send():
+        sink.write(b''.join(batch))
+        batch.clear()
+
+    try:
+        for offset, envelope in streams.envelopes():
+            if speed:
+                delay = started + offset / speed - time.monotonic()
+                if delay > 0:
+                    if batch:
+                        send()
+                    sink.flush()
+                    time.sleep(delay)
+                    lag = 0.0
+                else:
+                    lag = -delay
+                    stats.max_lag_seconds = max(stats.max_lag_seconds, lag)
+            batch.append(envelope)
+            stats.records += 1
+            stats.recorded_seconds = offset
+            if offsets is not None:
+                offsets.append(offset)
+            if len(batch) >= SEND_BATCH:
+                send()
+        if batch:
+            send()
+        sink.flush()
+        stats.completed = True
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+    stats.wall_seconds = time.monotonic() - started
+    stats.final_lag_seconds = lag
+    return stats
+
+
+class ReplayServer:
+    """Replays a dataset to every client that connects, from a background thread"""
+
+    def __init__(self, streams: RecordedStreams, speed: Optional[float] = 1.0,
+                 host: str = '127.0.0.1', port: int = 8765):
+        """
+        Initialize the server (not started).
+
+        Args:
+            streams: Recorded dataset to replay
+            speed: Replay speed factor (None or 0 for maximum speed)
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.streams = streams
+        self.speed = speed
+        # Stats of finished connections, in the order they ended
+        self.completed: List[ReplayStats] = []
+        # Recorded offsets of the next connection's records (used by the throughput probe)
+        self.offsets: Optional[List[float]] = None
+        self.started_at: Optional[float] = None
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(handler):
+                server.started_at = time.monotonic()
+                stats = replay(server.streams, handler.wfile, server.speed, server.offsets)
+                server.completed.append(stats)
+
+        self._server = socketserver.ThreadingTCPServer((host, port), Handler, bind_and_activate=False)
+        self._server.allow_reuse_address = True
+        self._server.daemon_threads = True
+        self._server.server_bind()
+        self._server.server_activate()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Bound (host, port)."""
+        return self._server.server_address[:2]
+
+    def start(self):
+        """Start serving on a daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='sentinel-replay', daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """Serve on the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def probe_speed(data_dir: str, speed: Optional[float], duration: Optional[float],
+                flush_interval: float = 5.0, loop: bool = False) -> Dict:
+    """
+    Replay a dataset into an in-process StreamingDetector at one speed.
+
+    The lag of a record is the time between when it was due to be sent and
+    when the detector finished processing it, so it includes time spent in
+    the socket, the intake queue and behind flushes. The detector's final
+    batch pass is skipped: it runs once after the stream and is not part of
+    keeping up with it.
+
+    Args:
+        data_dir: Dataset directory (recorded streams and reference data)
+        speed: Replay speed factor (None for maximum speed)
+        duration: Recorded seconds to replay
+        flush_interval: Detector's seconds between flushes
+        loop: Loop the recording until duration is reached
+
+    Returns:
+        Dictionary with speed, records, offered and processed rates and lags
+    """
+    streams = RecordedStreams(data_dir, duration, loop)
+    server = ReplayServer(streams, speed, port=0)
+    server.offsets = []
+    server.start()
+
+    processed: List[float] = []
+    with tempfile.TemporaryDirectory(prefix='sentinel-replay-') as work_dir:
+        detector = StreamingDetector(data_dir, str(Path(work_dir) / 'events.jsonl'),
+                                     flush_interval=flush_interval)
+        process_line = detector.process_line
+
+        def timed(line: bytes):
+            process_line(line)
+            processed.append(time.monotonic())
+
+        detector.process_line = timed
+        detector.finish = lambda: None
+        source = open_stream(*server.address)
+        try:
+            detector.run(source)
+        finally:
+            source.close()
+            server.stop()
+
+    stats = server.completed[-1]
+    started = server.started_at
+    lags = ([done - (started + offset / speed) for done, offset in zip(processed, server.offsets)]
+            if speed else [])
+    recorded = stats.recorded_seconds
+    return {
+        'speed': speed,
+        'records': len(processed),
+        'recorded_seconds': recorded,
+        'offered_per_second': round(stats.records / (recorded / speed), 1) if speed and recorded else None,
+        'processed_per_second': round(len(processed) / (processed[-1] - started), 1) if processed else 0.0,
+        'max_lag_seconds': round(max(lags), 3) if lags else None,
+        'final_lag_seconds': round(lags[-1], 3) if lags else None
+    }
+
+
+def find_max_throughput(data_dir: str, probe_seconds: float = 20.0, start_speed: float = 1.0,
+                        max_lag: float = 2.0, flush_interval: float = 5.0) -> Dict:
+    """
+    Find the fastest replay the streaming detector keeps up with.
+
+    The dataset is first replayed at maximum speed to measure the
+    detector's raw rate. Then the speed doubles from start_speed, each trial
+    replaying probe_seconds of wall time (looping the recording when it is
+    shorter), until the lag of the last records exceeds max_lag: a detector
+    that keeps up ends a trial with a small lag, one that falls behind ends
+    it with the backlog it accumulated.
+
+    Args:
+        data_dir: Dataset directory
+        probe_seconds: Wall-clock length of each paced trial
+        start_speed: First speed factor tried
+        max_lag: Largest final lag (seconds) still counted as keeping up
+        flush_interval: Detector's seconds between flushes
+
+    Returns:
+        Dictionary with the maximum-speed run, every trial and the best sustained trial
+    """
+    unpaced = probe_speed(data_dir, None, None, flush_interval)
+    print(f"  [OK] Maximum speed: {unpaced['records']} records at "
+          f"{unpaced['processed_per_second']:.0f} records/s")
+
+    trials = []
+    sustained = None
+    speed = start_speed
+    while True:
+        trial = probe_speed(data_dir, speed, probe_seconds * speed, flush_interval, loop=True)
+        trial['sustained'] = trial['final_lag_seconds'] is not None and trial['final_lag_seconds'] <= max_lag
+        trials.append(trial)
+        print(f"  {speed:>8g}x  {trial['records']:>8} records  offered {trial['offered_per_second'] or 0:>9.0f}/s"
+              f"  final lag {trial['final_lag_seconds'] or 0:>7.2f}s  max lag {trial['max_lag_seconds'] or 0:>7.2f}s"
+              f"  {'ok' if trial['sustained'] else 'falling behind'}")
+        if not trial['sustained']:
+            break
+        sustained = trial
+        speed *= 2
+
+    return {'maximum_speed': unpaced, 'trials': trials, 'sustained': sustained}
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Replay recorded Project Sentinel streams over TCP')
+    parser.add_argument('--data-dir', required=True, help='Directory containing the recorded *.jsonl streams')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8765, help='Port to bind (default: 8765)')
+    parser.add_argument('--speed', default='1',
+                        help='Replay speed factor, e.g. 1, 10 or max (default: 1)')
+    parser.add_argument('--duration', type=float, metavar='SECONDS',
+                        help='Replay only the first SECONDS of recorded time')
+    parser.add_argument('--loop', action='store_true',
+                        help='Replay the recording repeatedly with shifted timestamps')
+    parser.add_argument('--find-max-throughput', action='store_true',
+                        help='Measure the streaming detector\'s maximum sustainable throughput instead of serving')
+    parser.add_argument('--probe-seconds', type=float, default=20.0,
+                        help='Wall-clock seconds of each throughput trial (default: 20)')
+    parser.add_argument('--max-lag', type=float, default=2.0,
+                        help='Final lag in seconds still counted as keeping up (default: 2)')
+    parser.add_argument('--flush-interval', type=float, default=5.0,
+                        help='Detector seconds between flushes during trials (default: 5)')
+    parser.add_argument('--output', help='Write the throughput results as JSON')
+
+    args = parser.parse_args()
+
+    if args.speed == 'max':
+        speed = None
+    else:
+        try:
+            speed = float(args.speed)
+        except ValueError:
+            parser.error(f"--speed must be a number or 'max', got {args.speed!r}")
+        if speed <= 0:
+            parser.error('--speed must be positive')
+
+    if args.find_max_throughput:
+        results = find_max_throughput(args.data_dir, args.probe_seconds, speed or 1.0,
+                                      args.max_lag, args.flush_interval)
+        sustained = results['sustained']
+        if sustained is None:
+            print(f"[FAIL] Detector fell behind already at {speed or 1.0:g}x")
+        else:
+            print(f"[OK] Maximum sustainable throughput: {sustained['offered_per_second']:.0f} records/s "
+                  f"({sustained['speed']:g}x recorded speed)")
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"[OK] Results written to: {args.output}")
+        return 0 if sustained is not None else 1
+
+    streams = RecordedStreams(args.data_dir, args.duration, args.loop)
+    server = ReplayServer(streams, speed, args.host, args.port)
+    host, port = server.address
+    print(f"[OK] Replaying {len(streams.files)} streams from {args.data_dir} at "
+          f"{'maximum speed' if speed is None else f'{speed:g}x'} on {host}:{port}")
+    server.start()
+    try:
+        reported = 0
+        while True:
+            time.sleep(0.5)
+            for stats in server.completed[reported:]:
+                print(f"[OK] Sent {stats.records} records ({stats.recorded_seconds:.0f}s recorded) in "
+                      f"{stats.wall_seconds:.1f}s, max lag {stats.max_lag_seconds:.2f}s"
+                      + ("" if stats.completed else " (client disconnected)"))
+            reported = len(server.completed)
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,719 @@
+"""
+Streaming Event Detector
+=========================
+
+Runs detection continuously over live sensor streams instead of
+finished files. Records arrive as JSON lines over a TCP socket (or from
+a file), one envelope per record:
+
+    {"dataset": "RFID_data", "sequence": 1, "event": {...record...}}
+
+A reader thread only does I/O and hands lines to a bounded intake queue;
+the processing thread parses them into the data models, keeps them for
+the final pass and feeds them to LiveDetection, which holds per-station
+windows in event time. Every flush interval the events that have become
+final are appended to the output file: an event is final once the
+watermark (the newest event time received, less the allowed lateness)
+has passed the end of the window it depends on, so no emitted event is
+ever revised. A flush only looks at new records and open windows.
+
+When the stream ends, one batch pass over all records rewrites
+events.jsonl sorted, identical to a batch run over the same records. It
+adds the events that depend on the whole stream (RFID scanner avoidance,
+station status, inventory discrepancies).
+
+Operational metrics can be exposed in Prometheus format with
+--metrics-port.
+
+Author: Team 01
+Date: October 2025
+"""
+
+# -*- coding: utf-8 -*-
+
+from typing import Callable, Deque, Dict, BinaryIO, List, Optional, Tuple
+from collections import Counter, defaultdict, deque
+from pathlib import Path
+import contextlib
+import io
+import json
+import math
+import queue
+import socket
+import sys
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+
+from data_models import (
+    POSTransaction, RFIDReading, ProductRecognition,
+    QueueMonitoring, InventorySnapshot, DetectedEvent
+)
+from event_detector import EventDetector
+from utils.helpers import load_products_catalog, load_customers_data, parse_timestamp
+from utils.catalog_service import CatalogService
+from utils.ingestion import RFIDDeduplicator, VisionBurstAggregator, in_arrival_order
+from utils.cardinality import CardinalityIndex, index_path_for
+from utils.thresholds import ThresholdRules, default_thresholds
+from utils.metrics import (
+    MetricsRegistry, MetricsServer, CounterBatch, resident_memory_bytes
+)
+
+
+# Stream name -> (EventDetector attribute, data model)
+STREAMS = {
+    'pos_transactions': ('pos_transactions', POSTransaction),
+    'rfid_readings': ('rfid_readings', RFIDReading),
+    'product_recognition': ('product_recognitions', ProductRecognition),
+    'queue_monitoring': ('queue_monitoring', QueueMonitoring),
+    'inventory_snapshots': ('inventory_snapshots', InventorySnapshot)
+}
+
+# Dataset names used by the competition stream server
+DATASET_ALIASES = {
+    'POS_Transactions': 'pos_transactions',
+    'RFID_data': 'rfid_readings',
+    'Product_recognism': 'product_recognition',
+    'Queue_monitor': 'queue_monitoring',
+    'Current_inventory_data': 'inventory_snapshots'
+}
+
+# Marks the end of the input stream in the intake queue
+_END_OF_STREAM = object()
+
+
+def _epoch_seconds(timestamp: str) -> float:
+    """Seconds since the epoch for an ISO timestamp."""
+    return parse_timestamp(timestamp).timestamp()
+
+
+def open_stream(host: str, port: int, retries: int = 10, delay: float = 0.5) -> BinaryIO:
+    """
+    Connect to a JSONL stream server.
+
+    Args:
+        host: Server host
+        port: Server port
+        retries: Connection attempts before giving up
+        delay: Seconds between attempts
+
+    Returns:
+        Binary file object reading from the socket
+    """
+    for attempt in range(retries):
+        try:
+            connection = socket.create_connection((host, port))
+            return connection.makefile('rb')
+        except OSError:
+            if attempt == retries - 1:
+                raise
+            time.sleep(delay)
+
+
+class LiveDetection:
+    """
+    Incremental detection over records in arrival order.
+
+    Every event is returned once, when it is final:
+
+    - weight discrepancies and the queue detectors look at one record and
+      run on each record as it arrives;
+    - success operations run once an RFID read of the scanned SKU has been
+      seen at the station, barcode switching once a station's i-th
+      prediction and i-th transaction have both arrived;
+    - vision scanner avoidance runs once the watermark passes the end of
+      the prediction's POS window, crash detection once it passes the
+      record that ends a gap.
+
+    RFID scanner avoidance, station status and inventory discrepancies
+    depend on the whole stream and are left to the final batch pass.
+
+    Windows are kept per station and pruned as the watermark advances.
+    Success checks waiting for an RFID read and predictions or
+    transactions not yet paired are held until they resolve.
+    """
+
+    def __init__(self, detector: EventDetector, collapsers: Dict,
+                 observe_latency: Optional[Callable[[str, float], None]] = None):
+        """
+        Initialize live detection.
+
+        Args:
+            detector: EventDetector providing the detector functions,
+                thresholds and catalog
+            collapsers: Stream attribute -> collapser of that stream
+            observe_latency: Called with the detector name and wall time of each call
+        """
+        self.detector = detector
+        self.collapsers = collapsers
+        self.observe_latency = observe_latency
+        self.watermark: Optional[float] = None
+        self._defaults = default_thresholds()
+        # Records of the single-record detectors since the last advance
+        self._new_transactions: List[POSTransaction] = []
+        self._new_measurements: List[QueueMonitoring] = []
+        # Station -> (event time, transaction) kept for vision windows, and
+        # the event time before which they have been pruned
+        self._pos_window: Dict[str, List[Tuple[float, POSTransaction]]] = defaultdict(list)
+        self._pos_pruned_before: Dict[str, float] = {}
+        # Station -> (window end, prediction) not yet final
+        self._vision_pending: Dict[str, List[Tuple[float, ProductRecognition]]] = defaultdict(list)
+        # Station -> collapsed (event time, sequence, prediction) not yet in final order
+        self._vision_unordered: Dict[str, List[Tuple[float, int, ProductRecognition]]] = defaultdict(list)
+        # Station -> predictions and transactions not yet paired for barcode switching
+        self._unpaired_predictions: Dict[str, Deque[ProductRecognition]] = defaultdict(deque)
+        self._unpaired_transactions: Dict[str, Deque[POSTransaction]] = defaultdict(deque)
+        # (station, SKU) -> an RFID read of it; successful scans waiting for one
+        self._rfid_seen: Dict[Tuple[str, str], RFIDReading] = {}
+        self._awaiting_rfid: Dict[Tuple[str, str], List[POSTransaction]] = defaultdict(list)
+        self._success_ready: List[POSTransaction] = []
+        # Station -> (event time, entry) timeline entries not yet final, and the last final one
+        self._timeline: Dict[str, List[Tuple[float, Dict]]] = defaultdict(list)
+        self._timeline_last: Dict[str, Tuple[float, Dict]] = {}
+
+    def _threshold(self, name: str, param: str, station: str) -> float:
+        """Effective threshold of a detector at a station."""
+        rules = self.detector.thresholds
+        values = rules.values(name, station) if rules is not None else self._defaults[name]
+        return values[param]
+
+    def _detect(self, name: str, *args) -> List[DetectedEvent]:
+        """Run one detector with the configured thresholds."""
+        detector = self.detector.detectors[name]
+        if self.detector.thresholds is not None:
+            detector = self.detector.thresholds.bind(name, detector)
+        started = time.perf_counter()
+        events = detector(*args)
+        if self.observe_latency is not None:
+            self.observe_latency(name, time.perf_counter() - started)
+        if self.detector.catalog_version is not None:
+            for event in events:
+                event.catalog_version = self.detector.catalog_version
+        return events
+
+    def add(self, attribute: str, record, at: float, closed: List[Tuple[int, object]]) -> bool:
+        """
+        Take one record as it arrives.
+
+        Args:
+            attribute: EventDetector attribute of the record's stream
+            record: The record as received
+            at: Event time of the record in epoch seconds
+            closed: (sequence, record) pairs the stream's collapser closed
+                with this record, or the record itself when not collapsed
+
+        Returns:
+            True if the record arrived behind the watermark
+        """
+        late = self.watermark is not None and at <= self.watermark
+        if attribute == 'pos_transactions':
+            station = record.station_id
+            self._new_transactions.append(record)
+            self._pos_window[station].append((at, record))
+            self._unpaired_transactions[station].append(record)
+            if record.status.lower() == 'success':  # the detector skips the rest
+                key = (station, record.sku)
+                if key in self._rfid_seen:
+                    self._success_ready.append(record)
+                else:
+                    self._awaiting_rfid[key].append(record)
+            self._add_to_timeline(record, 'pos')
+        elif attribute == 'rfid_readings':
+            # Raw reads: whether a SKU was seen does not depend on collapsing
+            key = (record.station_id, record.sku)
+            if key not in self._rfid_seen:
+                self._rfid_seen[key] = record
+                self._success_ready.extend(self._awaiting_rfid.pop(key, ()))
+            for _, reading in closed:
+                self._add_to_timeline(reading, 'rfid')
+        elif attribute == 'product_recognitions':
+            for sequence, prediction in closed:
+                self._add_prediction(sequence, prediction, attribute in self.collapsers)
+        elif attribute == 'queue_monitoring':
+            self._new_measurements.append(record)
+            self._add_to_timeline(record, 'queue')
+        return late
+
+    def _add_prediction(self, sequence: int, prediction: ProductRecognition, collapsed: bool):
+        """Queue a closed prediction for its avoidance window and for pairing."""
+        station = prediction.station_id
+        at = _epoch_seconds(prediction.timestamp)
+        before = self._threshold('scanner_avoidance_vision', 'window_before_seconds', station)
+        if at - before >= self._pos_pruned_before.get(station, -math.inf):
+            # Otherwise the window's transactions are gone; only the final pass checks it
+            last_seen = _epoch_seconds(prediction.last_seen) if prediction.last_seen else at
+            after = self._threshold('scanner_avoidance_vision', 'window_after_seconds', station)
+            self._vision_pending[station].append((last_seen + after, prediction))
+        if collapsed:
+            # Collapsed records close out of order; they are paired in first-seen order
+            self._vision_unordered[station].append((at, sequence, prediction))
+        else:
+            self._unpaired_predictions[station].append(prediction)
+
+    def _add_to_timeline(self, record, kind: str):
+        """Add a record's activity timeline entries, unless the timeline has moved past them."""
+        for entry in self.detector.timeline_entries(record, kind):
+            station = entry['station_id']
+            at = _epoch_seconds(entry['timestamp'])
+            last = self._timeline_last.get(station)
+            if last is None or at >= last[0]:
+                self._timeline[station].append((at, entry))
+
+    def _open_since(self, attribute: str) -> Dict[str, float]:
+        """Station -> earliest first-seen time of the records a collapser holds open."""
+        collapser = self.collapsers.get(attribute)
+        earliest = {}
+        if collapser is not None:
+            for _, record in collapser.open_records():
+                at = _epoch_seconds(record.timestamp)
+                if at < earliest.get(record.station_id, math.inf):
+                    earliest[record.station_id] = at
+        return earliest
+
+    def advance(self, watermark: float) -> List[DetectedEvent]:
+        """
+        Move the watermark and return the events that became final.
+
+        Args:
+            watermark: Event time (epoch seconds) up to which input is
+                taken to be complete
+
+        Returns:
+            Newly final events, in no particular order
+        """
+        if self.watermark is not None:
+            watermark = max(watermark, self.watermark)
+        self.watermark = watermark
+        catalog = self.detector.products_catalog
+        open_predictions = self._open_since('product_recognitions')
+        open_readings = self._open_since('rfid_readings')
+        events = []
+
+        if self._new_transactions:
+            transactions, self._new_transactions = self._new_transactions, []
+            events.extend(self._detect('weight_discrepancies', transactions, catalog))
+        if self._new_measurements:
+            measurements, self._new_measurements = self._new_measurements, []
+            for name in ('long_queues', 'long_wait_times', 'staffing_needs'):
+                events.extend(self._detect(name, measurements))
+
+        if self._success_ready:
+            transactions, self._success_ready = self._success_ready, []
+            readings = [self._rfid_seen[(t.station_id, t.sku)] for t in transactions]
+            events.extend(self._detect('success_operations', transactions, readings, catalog))
+
+        events.extend(self._barcode_switching(watermark, open_predictions, catalog))
+        events.extend(self._vision_avoidance(watermark, open_predictions))
+        events.extend(self._system_crashes(watermark, open_readings))
+        return events
+
+    def _barcode_switching(self, watermark: float, open_predictions: Dict[str, float],
+                           catalog: Dict) -> List[DetectedEvent]:
+        """Pair each station's predictions and transactions in order as both arrive."""
+        for station, unordered in self._vision_unordered.items():
+            # Collapsed predictions take their place once nothing earlier can still close
+            frontier = open_predictions.get(station, math.inf)
+            ready = [p for p in unordered if p[0] <= watermark and p[0] < frontier]
+            if ready:
+                unordered[:] = [p for p in unordered if not (p[0] <= watermark and p[0] < frontier)]
+                ready.sort(key=lambda p: (p[2].timestamp, p[1]))
+                self._unpaired_predictions[station].extend(p[2] for p in ready)
+
+        transactions, predictions = [], []
+        for station, unpaired in self._unpaired_predictions.items():
+            waiting = self._unpaired_transactions.get(station)
+            while unpaired and waiting:
+                predictions.append(unpaired.popleft())
+                transactions.append(waiting.popleft())
+        if not predictions:
+            return []
+        return self._detect('barcode_switching', transactions, predictions, catalog)
+
+    def _vision_avoidance(self, watermark: float, open_predictions: Dict[str, float]) -> List[DetectedEvent]:
+        """Check predictions whose POS window the watermark has passed, then prune the windows."""
+        predictions, transactions = [], []
+        for station, pending in self._vision_pending.items():
+            if not any(ends_at <= watermark for ends_at, _ in pending):
+                continue
+            predictions.extend(p for ends_at, p in pending if ends_at <= watermark)
+            pending[:] = [(ends_at, p) for ends_at, p in pending if ends_at > watermark]
+            transactions.extend(t for _, t in self._pos_window.get(station, ()))
+        events = self._detect('scanner_avoidance_vision', predictions, transactions) if predictions else []
+
+        for station, window in self._pos_window.items():
+            # Keep what pending, open and future predictions may still look back to
+            earliest = min([watermark, open_predictions.get(station, math.inf)]
+                           + [_epoch_seconds(p.timestamp) for _, p in self._vision_pending.get(station, ())])
+            cutoff = earliest - self._threshold('scanner_avoidance_vision', 'window_before_seconds', station)
+            if window and min(at for at, _ in window) < cutoff:
+                window[:] = [(at, t) for at, t in window if at >= cutoff]
+            self._pos_pruned_before[station] = max(cutoff, self._pos_pruned_before.get(station, -math.inf))
+        return events
+
+    def _system_crashes(self, watermark: float, open_readings: Dict[str, float]) -> List[DetectedEvent]:
+        """Look for gaps in the part of each station's timeline the watermark has passed."""
+        timeline = []
+        for station, pending in self._timeline.items():
+            # An open RFID record still adds an entry at its first-seen time
+            frontier = open_readings.get(station, math.inf)
+            ready = [e for e in pending if e[0] <= watermark and e[0] < frontier]
+            if not ready:
+                continue
+            pending[:] = [e for e in pending if not (e[0] <= watermark and e[0] < frontier)]
+            ready.sort(key=lambda e: e[1]['timestamp'])
+            last = self._timeline_last.get(station)
+            if last is not None:
+                timeline.append(last[1])
+            timeline.extend(entry for _, entry in ready)
+            self._timeline_last[station] = ready[-1]
+        return self._detect('system_crashes', timeline) if timeline else []
+
+
+class StreamingDetector:
+    """
+    Continuous detection over a JSONL record stream.
+
+    Events are emitted once they are final (see LiveDetection); the file
+    written when the stream ends is the same as EventDetector's over the
+    same records.
+    """
+
+    def __init__(self, data_dir: str, output_path: str,
+                 flush_interval: float = 5.0, queue_size: int = 10000,
+                 registry: Optional[MetricsRegistry] = None,
+                 catalog_service: Optional[CatalogService] = None,
+                 rfid_dedup_window: Optional[float] = None,
+                 vision_burst_window: Optional[float] = None,
+                 cardinality: bool = False,
+                 thresholds: Optional[ThresholdRules] = None,
+                 allowed_lateness: float = 5.0):
+        """
+        Initialize the streaming detector.
+
+        Args:
+            data_dir: Directory containing products_list.csv and customer_data.csv
+            output_path: Path of the events.jsonl file to write
+            flush_interval: Seconds between flushes of live events
+            queue_size: Maximum lines buffered between reader and processor
+            registry: Metrics registry (a private one is created if omitted)
+            catalog_service: Hot-reloaded catalog; each flush uses its latest version
+            rfid_dedup_window: Collapse repeated RFID reads of a tag within this many seconds
+            vision_burst_window: Merge vision predictions of a product within this many seconds
+            cardinality: Sketch unique customers and SKUs per (station, hour) as POS records arrive
+            thresholds: Compiled threshold configuration for live detection and the final pass
+            allowed_lateness: Seconds of event time the watermark trails the newest record;
+                records arriving later may be missing from live events
+        """
+        self.data_dir = Path(data_dir)
+        self.output_path = Path(output_path)
+        self.flush_interval = flush_interval
+        self.intake: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.catalog_service = catalog_service
+        self.detector = EventDetector(str(data_dir), instrument=True,
+                                      catalog_service=catalog_service,
+                                      thresholds=thresholds)
+        self.allowed_lateness = allowed_lateness
+        self.records_processed = 0
+        self.flush_count = 0
+        # Newest event time received (epoch seconds)
+        self._stream_time: Optional[float] = None
+        # Live events per event_id, so the final pass only counts the rest
+        self._live_counts: Counter = Counter()
+        self._station_lag: Dict[str, float] = {}
+        # Stream attribute -> collapser merging repeated records before detection
+        self._collapsers = {}
+        if rfid_dedup_window:
+            self._collapsers['rfid_readings'] = RFIDDeduplicator(rfid_dedup_window)
+        if vision_burst_window:
+            self._collapsers['product_recognitions'] = VisionBurstAggregator(vision_burst_window)
+        self._closed = {attribute: [] for attribute in self._collapsers}
+        self.cardinality_index = CardinalityIndex() if cardinality else None
+        self._reader: Optional[threading.Thread] = None
+
+        self.registry = registry or MetricsRegistry()
+        self._register_metrics()
+        self.live = LiveDetection(
+            self.detector, self._collapsers,
+            lambda name, seconds: self._detector_latency.observe(seconds, (('detector', name),)))
+
+    def _register_metrics(self):
+        """Register metrics and the thread-owned counter batches."""
+        registry = self.registry
+        self._ingested = CounterBatch(
+            registry, 'sentinel_records_ingested_total',
+            'Records ingested per input stream', 'stream')
+        self._invalid = CounterBatch(
+            registry, 'sentinel_records_invalid_total',
+            'Records that could not be parsed, per input stream', 'stream')
+        self._late = CounterBatch(
+            registry, 'sentinel_records_late_total',
+            'Records that arrived behind the watermark, per input stream', 'stream')
+        self._emitted_counter = CounterBatch(
+            registry, 'sentinel_events_emitted_total',
+            'Detected events emitted per event_id', 'event_id', flush_every=1)
+        registry.gauge(
+            'sentinel_station_lag_seconds',
+            'Seconds from the event time of the latest event emitted per station to its emission',
+            lambda: {(('station_id', s),): lag for s, lag in dict(self._station_lag).items()})
+        registry.gauge(
+            'sentinel_queue_depth', 'Records waiting in a processing queue',
+            lambda: {(('queue', 'intake'),): self.intake.qsize()})
+        registry.gauge(
+            'sentinel_process_resident_memory_bytes', 'Resident memory of the detector process',
+            resident_memory_bytes)
+        self._detector_latency = registry.histogram(
+            'sentinel_detector_latency_seconds', 'Wall time of each detector call')
+        self._flush_latency = registry.histogram(
+            'sentinel_flush_duration_seconds', 'Wall time of a flush')
+
+    def load_reference_data(self):
+        """Load the product catalog and customer data."""
+        products_csv = self.data_dir / 'products_list.csv'
+        if self.catalog_service is not None:
+            self.detector.refresh_catalog()
+        elif products_csv.exists():
+            self.detector.products_catalog = load_products_catalog(str(products_csv))
+        customers_csv = self.data_dir / 'customer_data.csv'
+        if customers_csv.exists():
+            self.detector.customers_data = load_customers_data(str(customers_csv))
+
+    def start_reader(self, source: BinaryIO):
+        """
+        Read lines from a source on a background thread.
+
+        Args:
+            source: Binary file object (socket file or regular file)
+        """
+        def read():
+            try:
+                for line in source:
+                    if line.strip():
+                        self.intake.put(line)
+            finally:
+                self.intake.put(_END_OF_STREAM)
+
+        self._reader = threading.Thread(target=read, name='sentinel-reader', daemon=True)
+        self._reader.start()
+
+    def process_line(self, line: bytes):
+        """
+        Parse one envelope and add its record to the detector.
+
+        Args:
+            line: JSON line
+        """
+        envelope = None
+        try:
+            envelope = json.loads(line)
+            dataset = envelope.get('dataset')
+            stream = DATASET_ALIASES.get(dataset, dataset)
+            attribute, model = STREAMS[stream]
+            record = model.from_stream(envelope['event'])
+            at = _epoch_seconds(record.timestamp)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self._invalid.inc(str(envelope.get('dataset')) if isinstance(envelope, dict) else 'unknown')
+            return
+
+        if stream in ('pos_transactions', 'rfid_readings'):
+            # Resolved against the catalog version current at arrival
+            record = self.detector.resolve_sku(record)
+        if self.cardinality_index is not None and stream == 'pos_transactions':
+            self.cardinality_index.add(record.station_id, record.timestamp, record.customer_id, record.sku)
+        collapser = self._collapsers.get(attribute)
+        if collapser is not None:
+            closed = collapser.add(record)
+            self._closed[attribute].extend(closed)
+        else:
+            getattr(self.detector, attribute).append(record)
+            closed = [(self.records_processed, record)]
+        if self.live.add(attribute, record, at, closed):
+            self._late.inc(stream)
+        if self._stream_time is None or at > self._stream_time:
+            self._stream_time = at
+        self.records_processed += 1
+        self._ingested.inc(stream)
+
+    def flush(self) -> int:
+        """
+        Append the events that became final since the last flush.
+
+        The watermark trails the newest event time received by
+        allowed_lateness.
+
+        Returns:
+            Number of events appended to the output file
+        """
+        started = time.perf_counter()
+        if self.catalog_service is not None:
+            self.detector.refresh_catalog()
+        events = []
+        if self._stream_time is not None:
+            events = self.live.advance(self._stream_time - self.allowed_lateness)
+
+        if events:
+            events.sort(key=lambda e: e.timestamp)
+            emitted_at = time.time()
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.output_path, 'a', encoding='utf-8') as f:
+                for event in events:
+                    f.write(event.to_json() + '\n')
+                    self._emitted_counter.inc(event.event_id)
+                    self._live_counts[event.event_id] += 1
+                    station_id = event.event_data.get('station_id')
+                    if station_id is not None:
+                        self._station_lag[station_id] = emitted_at - _epoch_seconds(event.timestamp)
+
+        self._ingested.flush()
+        self._invalid.flush()
+        self._late.flush()
+        self.flush_count += 1
+        self._flush_latency.observe(time.perf_counter() - started)
+        return len(events)
+
+    def finish(self):
+        """Close open records, run one batch pass over all records and rewrite the events file."""
+        detector = self.detector
+        for attribute, collapser in self._collapsers.items():
+            self._closed[attribute].extend(collapser.flush())
+            setattr(detector, attribute, in_arrival_order(self._closed[attribute]))
+        detector.detected_events = []
+        detector.recorder.reset()
+        if self.catalog_service is not None:
+            detector.refresh_catalog()
+        with contextlib.redirect_stdout(io.StringIO()):
+            detector.run_all_detections()
+            detector.save_events(str(self.output_path))
+
+        for stage in detector.recorder.stages:
+            for call in stage.children:
+                self._detector_latency.observe(call.wall_seconds, (('detector', call.name),))
+        final_counts = Counter(event.event_id for event in detector.detected_events)
+        for event_id, count in final_counts.items():
+            if count > self._live_counts[event_id]:
+                self._emitted_counter.inc(event_id, count - self._live_counts[event_id])
+        self._ingested.flush()
+        self._invalid.flush()
+        self._late.flush()
+
+    def run(self, source: BinaryIO):
+        """
+        Process a stream until it ends, then write the sorted events file.
+
+        Args:
+            source: Binary file object to read envelopes from
+        """
+        self.load_reference_data()
+        if self.output_path.exists():
+            self.output_path.unlink()
+        self.start_reader(source)
+
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self.intake.get(timeout=min(self.flush_interval, 0.5))
+            except queue.Empty:
+                item = None
+            if item is _END_OF_STREAM:
+                break
+            if item is not None:
+                self.process_line(item)
+            if time.monotonic() - last_flush >= self.flush_interval:
+                self.flush()
+                last_flush = time.monotonic()
+
+        self.finish()
+        if self.cardinality_index is not None:
+            self.cardinality_index.save(index_path_for(str(self.output_path)))
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Project Sentinel Streaming Event Detector')
+    parser.add_argument('--data-dir', required=True,
+                        help='Directory containing products_list.csv and customer_data.csv')
+    parser.add_argument('--output', required=True, help='Output events.jsonl file path')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--port', type=int, help='Stream server port')
+    source.add_argument('--input', help='Read envelopes from a JSONL file instead of a socket')
+    parser.add_argument('--host', default='127.0.0.1', help='Stream server host')
+    parser.add_argument('--flush-interval', type=float, default=5.0,
+                        help='Seconds between flushes of live events (default: 5)')
+    parser.add_argument('--queue-size', type=int, default=10000,
+                        help='Maximum lines buffered between reader and processor')
+    parser.add_argument('--allowed-lateness', type=float, default=5.0, metavar='SECONDS',
+                        help='Event-time delay before live events are final (default: 5)')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Serve Prometheus metrics on this port (disabled if omitted)')
+    parser.add_argument('--metrics-host', default='127.0.0.1', help='Metrics server interface')
+    parser.add_argument('--rfid-dedup-window', type=float, metavar='SECONDS',
+                        help='Collapse repeated RFID reads of the same tag within SECONDS')
+    parser.add_argument('--vision-burst-window', type=float, metavar='SECONDS',
+                        help='Merge vision predictions of the same product at a station within SECONDS')
+    parser.add_argument('--cardinality', action='store_true',
+                        help='Write unique customer/SKU sketches per station and hour (cardinality.json)')
+    parser.add_argument('--thresholds', metavar='CONFIG_FILE',
+                        help='Threshold configuration with store and station overrides (JSON)')
+    parser.add_argument('--store', help='Store in the threshold configuration whose overrides apply')
+    parser.add_argument('--watch-catalog', type=float, metavar='SECONDS',
+                        help='Reload products_list.csv when it changes, checking every SECONDS; '
+                             'events then record the catalog version they were detected with')
+
+    args = parser.parse_args()
+
+    thresholds = None
+    if args.thresholds:
+        thresholds = ThresholdRules.load(args.thresholds, args.store)
+    elif args.store:
+        parser.error('--store requires --thresholds')
+
+    catalog_service = None
+    if args.watch_catalog is not None:
+        catalog_service = CatalogService(str(Path(args.data_dir) / 'products_list.csv'),
+                                         poll_interval=args.watch_catalog)
+        catalog_service.add_listener(
+            lambda snapshot: print(f"[OK] Catalog version {snapshot.version} loaded "
+                                   f"({len(snapshot)} products)"))
+        catalog_service.start()
+
+    detector = StreamingDetector(args.data_dir, args.output,
+                                 flush_interval=args.flush_interval,
+                                 queue_size=args.queue_size,
+                                 catalog_service=catalog_service,
+                                 rfid_dedup_window=args.rfid_dedup_window,
+                                 vision_burst_window=args.vision_burst_window,
+                                 cardinality=args.cardinality,
+                                 thresholds=thresholds,
+                                 allowed_lateness=args.allowed_lateness)
+
+    metrics_server = None
+    if args.metrics_port is not None:
+        metrics_server = MetricsServer(detector.registry, args.metrics_host, args.metrics_port)
+        metrics_server.start()
+        host, port = metrics_server.address
+        print(f"[OK] Metrics available at http://{host}:{port}/metrics")
+
+    if args.input:
+        source = open(args.input, 'rb')
+    else:
+        print(f"Connecting to stream at {args.host}:{args.port}...")
+        source = open_stream(args.host, args.port)
+
+    try:
+        detector.run(source)
+    finally:
+        source.close()
+        if metrics_server is not None:
+            metrics_server.stop()
+        if catalog_service is not None:
+            catalog_service.stop()
+
+    print(f"[OK] Processed {detector.records_processed} records in {detector.flush_count} flushes")
+    print(f"[OK] {len(detector.detector.detected_events)} events saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
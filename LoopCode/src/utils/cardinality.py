@@ -0,0 +1,281 @@
+"""
+HyperLogLog Distinct Counts per Station and Hour
+=================================================
+
+Keeps unique-customer and unique-SKU sketches for every (station, hour)
+seen in the POS stream. Each sketch is a HyperLogLog (Flajolet et al.):
+2^p one-byte registers holding the longest run of leading zeros seen
+among the hashed values routed to them, giving about 1.04 / sqrt(2^p)
+relative error in fixed memory.
+
+Sketches merge by taking the register-wise maximum, so distinct counts
+for any hour range, set of stations, or set of runs (e.g. months of
+history) come from merging the matching sketches instead of rescanning
+raw events. Sketches with few distinct values are stored sparsely.
+
+Author: Team 01
+Date: October 2025
+"""
+
+import base64
+import hashlib
+import json
+import math
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# File written next to events.jsonl
+CARDINALITY_INDEX_NAME = 'cardinality.json'
+
+# Default precision: 1024 registers, about 3.3% relative error
+DEFAULT_PRECISION = 10
+
+# Quantities sketched per (station, hour)
+DIMENSIONS = ('customers', 'skus')
+
+
+def _hash64(value: str) -> int:
+    """Stable 64-bit hash of a string."""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch."""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            precision: log2 of the number of registers (4-16)
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError(f"precision must be between 4 and 16, got {precision}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str):
+        """Add a value to the sketch."""
+        h = _hash64(value)
+        index = h >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        rank = remaining_bits - (h & ((1 << remaining_bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog'):
+        """Merge another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError(f"cannot merge precision {other.precision} into {self.precision}")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """Estimated number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self) -> Dict:
+        """Serializable form (sparse when most registers are empty)."""
+        nonzero = [(i, r) for i, r in enumerate(self.registers) if r]
+        if len(nonzero) * 4 < len(self.registers):
+            return {'p': self.precision, 'sparse': nonzero}
+        return {'p': self.precision, 'dense': base64.b64encode(bytes(self.registers)).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'HyperLogLog':
+        """Restore a sketch saved with to_dict."""
+        sketch = cls(state['p'])
+        if 'dense' in state:
+            sketch.registers = bytearray(base64.b64decode(state['dense']))
+        else:
+            for index, rank in state['sparse']:
+                sketch.registers[index] = rank
+        return sketch
+
+
+def hour_bucket(timestamp: str) -> str:
+    """Hour a timestamp falls in, e.g. '2025-08-13T16'."""
+    return datetime.fromisoformat(timestamp).strftime('%Y-%m-%dT%H')
+
+
+class CardinalityIndex:
+    """
+    HyperLogLog sketches of unique customers and SKUs per (station, hour).
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        """
+        Initialize an empty index.
+
+        Args:
+            precision: Precision of every sketch in the index
+        """
+        self.precision = precision
+        # (station_id, hour) -> dimension -> sketch
+        self.sketches: Dict[Tuple[str, str], Dict[str, HyperLogLog]] = {}
+
+    def _bucket(self, station_id: str, timestamp: str) -> Dict[str, HyperLogLog]:
+        key = (station_id, hour_bucket(timestamp))
+        bucket = self.sketches.get(key)
+        if bucket is None:
+            bucket = {dimension: HyperLogLog(self.precision) for dimension in DIMENSIONS}
+            self.sketches[key] = bucket
+        return bucket
+
+    def add(self, station_id: str, timestamp: str, customer_id: Optional[str] = None,
+            sku: Optional[str] = None):
+        """
+        Record one observation.
+
+        Args:
+            station_id: Station the observation came from
+            timestamp: ISO timestamp of the observation
+            customer_id: Customer involved, if known
+            sku: Product involved, if known
+        """
+        bucket = self._bucket(station_id, timestamp)
+        if customer_id:
+            bucket['customers'].add(customer_id)
+        if sku:
+            bucket['skus'].add(sku)
+
+    def add_transactions(self, transactions: Iterable):
+        """Record POS transactions (anything with station_id, timestamp, customer_id and sku)."""
+        for transaction in transactions:
+            self.add(transaction.station_id, transaction.timestamp,
+                     transaction.customer_id, transaction.sku)
+
+    def merge(self, other: 'CardinalityIndex'):
+        """Merge another index (e.g. a different run or month) into this one."""
+        for key, bucket in other.sketches.items():
+            target = self.sketches.get(key)
+            if target is None:
+                target = {dimension: HyperLogLog(self.precision) for dimension in DIMENSIONS}
+                self.sketches[key] = target
+            for dimension, sketch in bucket.items():
+                target[dimension].merge(sketch)
+
+    def stations(self) -> List[str]:
+        """Stations with at least one observation."""
+        return sorted({station for station, _ in self.sketches})
+
+    def hours(self) -> List[str]:
+        """Hours with at least one observation."""
+        return sorted({hour for _, hour in self.sketches})
+
+    def query(self, stations: Optional[Iterable[str]] = None, start: Optional[str] = None,
+              end: Optional[str] = None) -> Dict[str, int]:
+        """
+        Distinct counts over a set of stations and an hour range.
+
+        Args:
+            stations: Stations to include (all if None)
+            start: First hour or timestamp to include (inclusive)
+            end: Last hour or timestamp to include (inclusive)
+
+        Returns:
+            Dictionary with estimated unique customers and SKUs, and the
+            number of stations and (station, hour) buckets merged
+        """
+        station_set = set(stations) if stations is not None else None
+        start_hour = start[:13] if start else None
+        end_hour = end[:13] if end else None
+
+        merged = {dimension: HyperLogLog(self.precision) for dimension in DIMENSIONS}
+        matched_stations = set()
+        buckets = 0
+        for (station, hour), bucket in self.sketches.items():
+            if station_set is not None and station not in station_set:
+                continue
+            if (start_hour and hour < start_hour) or (end_hour and hour > end_hour):
+                continue
+            for dimension, sketch in bucket.items():
+                merged[dimension].merge(sketch)
+            matched_stations.add(station)
+            buckets += 1
+
+        result = {dimension: sketch.count() for dimension, sketch in merged.items()}
+        result.update(stations=len(matched_stations), buckets=buckets)
+        return result
+
+    def per_bucket(self) -> List[Dict]:
+        """Distinct counts of every (station, hour) bucket."""
+        return [{'station_id': station, 'hour': hour,
+                 **{dimension: sketch.count() for dimension, sketch in bucket.items()}}
+                for (station, hour), bucket in sorted(self.sketches.items())]
+
+    def save(self, path: str):
+        """Write the index as JSON (atomically replacing the previous file)."""
+        state = {
+            'precision': self.precision,
+            'buckets': [{'station_id': station, 'hour': hour,
+                         **{dimension: sketch.to_dict() for dimension, sketch in bucket.items()}}
+                        for (station, hour), bucket in sorted(self.sketches.items())]
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'CardinalityIndex':
+        """Read an index written by save."""
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        index = cls(state['precision'])
+        for entry in state['buckets']:
+            index.sketches[(entry['station_id'], entry['hour'])] = {
+                dimension: HyperLogLog.from_dict(entry[dimension]) for dimension in DIMENSIONS
+            }
+        return index
+
+
+def index_path_for(events_path: str) -> str:
+    """Path of the cardinality index that belongs to an events.jsonl file."""
+    return str(Path(events_path).parent / CARDINALITY_INDEX_NAME)
+
+
+def main():
+    """Query one or more merged cardinality indexes from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Distinct customers and SKUs from cardinality indexes')
+    parser.add_argument('indexes', nargs='+', help='cardinality.json files (merged together)')
+    parser.add_argument('--stations', nargs='*', help='Stations to include (default: all)')
+    parser.add_argument('--start', help='First hour to include, e.g. 2025-08-13T16')
+    parser.add_argument('--end', help='Last hour to include, e.g. 2025-08-13T18')
+    parser.add_argument('--per-bucket', action='store_true', help='Also print every (station, hour)')
+
+    args = parser.parse_args()
+
+    index = CardinalityIndex.load(args.indexes[0])
+    for path in args.indexes[1:]:
+        index.merge(CardinalityIndex.load(path))
+
+    if args.per_bucket:
+        print(f"{'station':<10}{'hour':<16}{'customers':>10}{'skus':>8}")
+        print("-" * 44)
+        for row in index.per_bucket():
+            print(f"{row['station_id']:<10}{row['hour']:<16}{row['customers']:>10}{row['skus']:>8}")
+        print()
+
+    result = index.query(args.stations, args.start, args.end)
+    print(f"Stations: {result['stations']}  Hour buckets: {result['buckets']}")
+    print(f"Unique customers: ~{result['customers']}")
+    print(f"Unique SKUs: ~{result['skus']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
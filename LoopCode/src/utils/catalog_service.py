@@ -0,0 +1,184 @@
+"""
+Versioned Product Catalog Service
+==================================
+
+Keeps a long-running detector's product catalog in sync with
+products_list.csv. A watcher thread polls the file's modification time
+and size; when it changes, the catalog and its lookup indexes (SKU,
+barcode, EPC interval) are rebuilt on the watcher thread and swapped in as a new immutable
+snapshot with the next version number. Readers take one snapshot
+reference per detection pass, so a pass never sees a half-updated
+catalog and the hot path never waits for a reload.
+
+Author: Team 01
+Date: October 2025
+"""
+
+import bisect
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.helpers import load_products_catalog
+
+
+class CatalogSnapshot:
+    """
+    Immutable catalog version with lookup indexes.
+
+    products has the same shape as load_products_catalog, so it can be
+    passed to the detection algorithms unchanged.
+    """
+
+    def __init__(self, products: Dict[str, Dict], version: int,
+                 signature: Optional[Tuple[int, int]] = None):
+        """
+        Build the indexes for a catalog.
+
+        Args:
+            products: SKU -> product attributes
+            version: Catalog version number
+            signature: (mtime_ns, size) of the source file
+        """
+        self.products = products
+        self.version = version
+        self.signature = signature
+        self.loaded_at = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+
+        self.by_barcode: Dict[str, str] = {}
+        intervals: List[Tuple[str, str, str]] = []
+        for sku, product in products.items():
+            if product.get('barcode'):
+                self.by_barcode.setdefault(product['barcode'], sku)
+            epc_range = product.get('epc_range', '')
+            if '-' in epc_range:
+                start, end = epc_range.split('-', 1)
+                intervals.append((start, end, sku))
+        intervals.sort()
+        self._epc_starts = [start for start, _, _ in intervals]
+        self._epc_intervals = intervals
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def sku_for_barcode(self, barcode: str) -> str:
+        """SKU for a barcode, or an empty string."""
+        return self.by_barcode.get(barcode, '')
+
+    def sku_for_epc(self, epc: str) -> str:
+        """
+        SKU whose EPC range contains a tag, found by binary search.
+
+        Returns:
+            SKU if found, empty string otherwise
+        """
+        i = bisect.bisect_right(self._epc_starts, epc) - 1
+        if i >= 0:
+            start, end, sku = self._epc_intervals[i]
+            if start <= epc <= end:
+                return sku
+        return ''
+
+
+class CatalogService:
+    """
+    Watches products_list.csv and publishes versioned catalog snapshots.
+
+    If the file cannot be parsed (for example while it is half-written),
+    the current snapshot stays in place and the error is kept in
+    last_error until the next successful reload. A failed reload never
+    stops the watcher, so the next valid edit is still picked up.
+    """
+
+    def __init__(self, csv_path: str, poll_interval: float = 2.0):
+        """
+        Load the initial catalog (version 1).
+
+        Args:
+            csv_path: Path to products_list.csv
+            poll_interval: Seconds between file checks once started
+        """
+        self.csv_path = Path(csv_path)
+        self.poll_interval = poll_interval
+        self.last_error: Optional[str] = None
+        self._listeners: List[Callable[[CatalogSnapshot], None]] = []
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._snapshot = CatalogSnapshot(
+            load_products_catalog(str(self.csv_path)), 1, self._signature())
+
+    @property
+    def current(self) -> CatalogSnapshot:
+        """The latest catalog snapshot (a single atomic reference read)."""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Version number of the latest snapshot."""
+        return self._snapshot.version
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the catalog file, None if missing."""
+        try:
+            stat = self.csv_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def add_listener(self, listener: Callable[[CatalogSnapshot], None]):
+        """Call a function with every newly swapped-in snapshot."""
+        self._listeners.append(listener)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the catalog if the file changed.
+
+        Args:
+            force: Rebuild even if the file signature is unchanged
+
+        Returns:
+            True if a new snapshot was swapped in
+        """
+        with self._reload_lock:
+            signature = self._signature()
+            if signature is None or (not force and signature == self._snapshot.signature):
+                return False
+            try:
+                products = load_products_catalog(str(self.csv_path))
+                snapshot = CatalogSnapshot(products, self._snapshot.version + 1, signature)
+            except Exception as e:
+                # Any malformed row (a half-written line fails as TypeError)
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+            self._snapshot = snapshot
+            self.last_error = None
+
+        for listener in self._listeners:
+            listener(snapshot)
+        return True
+
+    def start(self):
+        """Start watching the file on a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(self.poll_interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    # A failing listener must not end hot reload
+                    self.last_error = f"{type(e).__name__}: {e}"
+
+        self._thread = threading.Thread(target=watch, name='sentinel-catalog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
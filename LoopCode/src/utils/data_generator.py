@@ -0,0 +1,415 @@
+"""
+Synthetic Store Data Generator for Project Sentinel
+====================================================
+
+Generates complete input datasets (products_list.csv, customer_data.csv
+and the five JSONL sensor streams) in the same formats as the competition
+data, at any scale. Fraud, system crash and queue scenarios are injected
+at configurable rates and written to ground_truth.jsonl in the
+events.jsonl format, so detector output can be checked against labels.
+
+Usage:
+    python src/utils/data_generator.py --output-dir /tmp/store --stations 20 --hours 8
+
+Author: Team 01
+Date: October 2025
+"""
+
+import csv
+import json
+import random
+import sys
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_models import DetectedEvent
+from utils.helpers import format_timestamp, save_events_to_jsonl
+
+
+# All streams are sampled on a fixed tick, as in the competition data
+TICK_SECONDS = 5
+
+
+@dataclass
+class GeneratorConfig:
+    """Size, rates and injected scenarios for a generated dataset"""
+    stations: int = 5
+    hours: float = 2.0
+    skus: int = 50
+    customers: int = 60
+    scan_rate: float = 6.0              # items scanned per station per minute while busy
+    arrival_rate: float = 0.5           # new checkout sessions per station per minute
+    max_items_per_session: int = 10
+    scanner_avoidance_rate: float = 0.02
+    barcode_switching_rate: float = 0.02
+    weight_discrepancy_rate: float = 0.02
+    crashes: int = 2                    # crash windows across all stations
+    queue_incidents: int = 4            # long queue / long wait windows across all stations
+    inventory_interval_minutes: int = 10
+    start_time: str = '2025-08-13T16:00:00'
+    seed: int = 42
+
+
+@dataclass
+class _StationState:
+    """Mutable simulation state for one checkout station"""
+    station_id: str
+    customer_id: Optional[str] = None
+    items_left: int = 0
+    queue_count: int = 1
+    crash_ticks: Optional[Dict[int, int]] = None      # crash start tick -> duration in ticks
+    crashed_until: int = -1
+    incident_ticks: Optional[Dict[int, int]] = None   # incident start tick -> duration in ticks
+    incident_until: int = -1
+    last_tick: int = -1
+
+
+def _station_ids(count: int) -> List[str]:
+    """Station IDs: one regular counter (RC1) followed by self-checkouts."""
+    ids = ['RC1'] if count > 0 else []
+    ids.extend(f"SCC{i}" for i in range(1, count))
+    return ids
+
+
+def generate_products(rng: random.Random, config: GeneratorConfig,
+                      total_items_estimate: int) -> List[Dict]:
+    """
+    Generate the product catalog.
+
+    Stock quantities are sized from the expected sales volume so shelves
+    never run empty, which keeps inventory labels unambiguous.
+
+    Returns:
+        List of product rows keyed by products_list.csv column names
+    """
+    products = []
+    per_sku_sales = total_items_estimate / max(1, config.skus)
+    epc_block = 100
+    for i in range(1, config.skus + 1):
+        quantity = int(per_sku_sales * 1.5) + 50
+        epc_start = (i - 1) * max(epc_block, quantity) + 1
+        epc_end = epc_start + max(epc_block, quantity) - 1
+        products.append({
+            'SKU': f"PRD_G_{i:04d}",
+            'product_name': f"Generated Product {i:04d}",
+            'quantity': quantity,
+            'EPC_range': f"E28011606{epc_start:016d}-E28011606{epc_end:016d}",
+            'barcode': f"479{i:010d}",
+            'weight': rng.choice([25, 50, 100, 150, 200, 250, 400, 500, 750, 1000]),
+            'price': rng.choice([80, 120, 180, 250, 320, 450, 600, 850, 1200, 2000])
+        })
+    return products
+
+
+def generate_customers(rng: random.Random, config: GeneratorConfig) -> List[Dict]:
+    """
+    Generate customer records.
+
+    Returns:
+        List of customer rows keyed by customer_data.csv column names
+    """
+    return [
+        {
+            'Customer_ID': f"C{i:04d}",
+            'Name': f"Customer {i:04d}",
+            'Age': rng.randint(18, 80),
+            'Address': f"{rng.randint(1, 999)} Generated Road, Colombo {rng.randint(1, 15):02d}",
+            'TP': f"+9477{rng.randint(1000000, 9999999)}"
+        }
+        for i in range(1, config.customers + 1)
+    ]
+
+
+def _write_csv(path: Path, rows: List[Dict]):
+    """Write rows to a CSV file with a header."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _schedule_windows(rng: random.Random, stations: List[_StationState], count: int,
+                      total_ticks: int, min_ticks: int, max_ticks: int, attribute: str):
+    """Place non-overlapping scenario windows at random stations and times."""
+    for state in stations:
+        setattr(state, attribute, {})
+    if total_ticks <= max_ticks * 2:
+        return
+    for _ in range(count):
+        state = rng.choice(stations)
+        windows = getattr(state, attribute)
+        for _attempt in range(20):
+            start = rng.randint(1, total_ticks - max_ticks - 1)
+            duration = rng.randint(min_ticks, max_ticks)
+            overlaps = any(start <= s + d + 1 and s <= start + duration + 1
+                           for s, d in windows.items())
+            if not overlaps:
+                windows[start] = duration
+                break
+
+
+def generate_dataset(output_dir: str, config: Optional[GeneratorConfig] = None) -> Dict[str, int]:
+    """
+    Generate a complete dataset with ground-truth labels.
+
+    Args:
+        output_dir: Directory to write the dataset to (created if missing)
+        config: Generator configuration (defaults approximate the competition data)
+
+    Returns:
+        Dictionary mapping each written file name to its record count
+    """
+    config = config or GeneratorConfig()
+    rng = random.Random(config.seed)
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    start = datetime.fromisoformat(config.start_time)
+    total_ticks = int(config.hours * 3600 / TICK_SECONDS)
+    tick_minutes = TICK_SECONDS / 60
+    scan_probability = min(1.0, config.scan_rate * tick_minutes)
+    arrival_probability = min(1.0, config.arrival_rate * tick_minutes)
+
+    # Expected sales volume, used to size stock levels
+    mean_session = (1 + config.max_items_per_session) / 2
+    busy_fraction = min(1.0, config.arrival_rate * mean_session / max(config.scan_rate, 1e-9))
+    total_items_estimate = int(config.stations * total_ticks * scan_probability * busy_fraction) + 1
+
+    products = generate_products(rng, config, total_items_estimate)
+    customers = generate_customers(rng, config)
+    _write_csv(out / 'products_list.csv', products)
+    _write_csv(out / 'customer_data.csv', customers)
+
+    skus = [p['SKU'] for p in products]
+    catalog = {p['SKU']: p for p in products}
+    customer_ids = [c['Customer_ID'] for c in customers]
+    epc_next = {p['SKU']: int(p['EPC_range'].split('-')[0][9:]) for p in products}
+
+    stations = [_StationState(station_id) for station_id in _station_ids(config.stations)]
+    _schedule_windows(rng, stations, config.crashes, total_ticks,
+                      min_ticks=180 // TICK_SECONDS, max_ticks=600 // TICK_SECONDS,
+                      attribute='crash_ticks')
+    _schedule_windows(rng, stations, config.queue_incidents, total_ticks,
+                      min_ticks=120 // TICK_SECONDS, max_ticks=600 // TICK_SECONDS,
+                      attribute='incident_ticks')
+
+    initial_stock = {p['SKU']: p['quantity'] for p in products}
+    removed = {sku: 0 for sku in skus}      # items physically leaving the store
+    pos_count = {sku: 0 for sku in skus}    # items as recorded by the POS
+    labels: List[DetectedEvent] = []
+
+    files = {
+        'pos_transactions.jsonl': open(out / 'pos_transactions.jsonl', 'w', encoding='utf-8'),
+        'rfid_readings.jsonl': open(out / 'rfid_readings.jsonl', 'w', encoding='utf-8'),
+        'product_recognition.jsonl': open(out / 'product_recognition.jsonl', 'w', encoding='utf-8'),
+        'queue_monitoring.jsonl': open(out / 'queue_monitoring.jsonl', 'w', encoding='utf-8'),
+        'inventory_snapshots.jsonl': open(out / 'inventory_snapshots.jsonl', 'w', encoding='utf-8')
+    }
+    counts = {name: 0 for name in files}
+
+    def emit(name: str, record: Dict):
+        files[name].write(json.dumps(record) + '\n')
+        counts[name] += 1
+
+    def snapshot(timestamp: str):
+        emit('inventory_snapshots.jsonl', {
+            'timestamp': timestamp,
+            'data': {sku: initial_stock[sku] - removed[sku] for sku in skus}
+        })
+
+    inventory_every = max(1, int(config.inventory_interval_minutes * 60 / TICK_SECONDS))
+
+    try:
+        for tick in range(total_ticks):
+            timestamp = format_timestamp(start + timedelta(seconds=tick * TICK_SECONDS))
+
+            if tick % inventory_every == 0:
+                snapshot(timestamp)
+
+            for state in stations:
+                station_id = state.station_id
+
+                # Crash windows: the station goes completely silent
+                if tick in state.crash_ticks:
+                    duration = state.crash_ticks[tick]
+                    state.crashed_until = tick + duration
+                    if state.last_tick >= 0:
+                        last_time = start + timedelta(seconds=state.last_tick * TICK_SECONDS)
+                        gap = (state.crashed_until - state.last_tick) * TICK_SECONDS
+                        labels.append(DetectedEvent.create_system_crash(
+                            timestamp=format_timestamp(last_time),
+                            station_id=station_id,
+                            duration_seconds=gap
+                        ))
+                if tick < state.crashed_until:
+                    continue
+                state.last_tick = tick
+
+                # Queue monitoring
+                if tick in state.incident_ticks:
+                    state.incident_until = tick + state.incident_ticks[tick]
+                if tick < state.incident_until:
+                    customer_count = rng.randint(6, 10)
+                    dwell_time = round(rng.uniform(200.0, 480.0), 1)
+                else:
+                    state.queue_count = max(0, min(4, state.queue_count + rng.choice((-1, 0, 0, 1))))
+                    customer_count = state.queue_count
+                    dwell_time = round(rng.uniform(20.0, 250.0), 1) if customer_count else 0.0
+                emit('queue_monitoring.jsonl', {
+                    'timestamp': timestamp, 'station_id': station_id, 'status': 'Active',
+                    'data': {'customer_count': customer_count, 'average_dwell_time': dwell_time}
+                })
+                if customer_count > 5:
+                    labels.append(DetectedEvent.create_long_queue(timestamp, station_id, customer_count))
+                if dwell_time > 300.0:
+                    labels.append(DetectedEvent.create_long_wait_time(timestamp, station_id, dwell_time))
+
+                # Checkout sessions
+                if state.items_left == 0 and rng.random() < arrival_probability:
+                    state.customer_id = rng.choice(customer_ids)
+                    state.items_left = rng.randint(1, config.max_items_per_session)
+
+                if state.items_left == 0 or rng.random() >= scan_probability:
+                    emit('rfid_readings.jsonl', {
+                        'timestamp': timestamp, 'station_id': station_id, 'status': 'Active',
+                        'data': {'epc': None, 'location': None, 'sku': None}
+                    })
+                    continue
+
+                state.items_left -= 1
+                customer_id = state.customer_id
+                sku = rng.choice(skus)
+                product = catalog[sku]
+                removed[sku] += 1
+
+                epc = f"E28011606{epc_next[sku]:016d}"
+                epc_next[sku] += 1
+                emit('rfid_readings.jsonl', {
+                    'timestamp': timestamp, 'station_id': station_id, 'status': 'Active',
+                    'data': {'epc': epc, 'location': 'IN_SCAN_AREA', 'sku': sku}
+                })
+
+                roll = rng.random()
+                accuracy = round(rng.uniform(0.90, 0.99), 2)
+                emit('product_recognition.jsonl', {
+                    'timestamp': timestamp, 'station_id': station_id, 'status': 'Active',
+                    'data': {'predicted_product': sku, 'accuracy': accuracy}
+                })
+
+                if roll < config.scanner_avoidance_rate:
+                    # Item leaves the store without a POS record
+                    labels.append(DetectedEvent.create_scanner_avoidance(
+                        timestamp, station_id, customer_id, sku))
+                    continue
+
+                scanned = product
+                weight = float(product['weight'])
+                roll -= config.scanner_avoidance_rate
+                if roll < config.barcode_switching_rate:
+                    scanned = catalog[rng.choice([s for s in skus if s != sku] or [sku])]
+                    weight = float(scanned['weight'])
+                    labels.append(DetectedEvent.create_barcode_switching(
+                        timestamp, station_id, customer_id, sku, scanned['SKU']))
+                elif roll - config.barcode_switching_rate < config.weight_discrepancy_rate:
+                    factor = rng.choice((rng.uniform(0.4, 0.7), rng.uniform(1.3, 1.8)))
+                    weight = round(weight * factor, 1)
+                    labels.append(DetectedEvent.create_weight_discrepancy(
+                        timestamp, station_id, customer_id, sku, product['weight'], weight))
+                else:
+                    weight = round(weight * rng.uniform(0.97, 1.03), 1)
+
+                pos_count[scanned['SKU']] += 1
+                emit('pos_transactions.jsonl', {
+                    'timestamp': timestamp, 'station_id': station_id, 'status': 'Active',
+                    'data': {
+                        'customer_id': customer_id,
+                        'sku': scanned['SKU'],
+                        'product_name': scanned['product_name'],
+                        'barcode': scanned['barcode'],
+                        'price': float(scanned['price']),
+                        'weight_g': weight
+                    }
+                })
+
+        end_time = format_timestamp(start + timedelta(seconds=total_ticks * TICK_SECONDS))
+        snapshot(end_time)
+    finally:
+        for f in files.values():
+            f.close()
+
+    # Inventory labels use the same reconciliation rule as the detector
+    for sku in skus:
+        expected = max(0, initial_stock[sku] - pos_count[sku])
+        actual = initial_stock[sku] - removed[sku]
+        if abs(expected - actual) > 2:
+            labels.append(DetectedEvent.create_inventory_discrepancy(end_time, sku, expected, actual))
+
+    labels.sort(key=lambda e: e.timestamp)
+    save_events_to_jsonl(labels, str(out / 'ground_truth.jsonl'))
+    counts['ground_truth.jsonl'] = len(labels)
+
+    with open(out / 'generator_config.json', 'w', encoding='utf-8') as f:
+        json.dump(asdict(config), f, indent=2)
+
+    counts['products_list.csv'] = len(products)
+    counts['customer_data.csv'] = len(customers)
+    return counts
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(description='Project Sentinel Synthetic Data Generator')
+    parser.add_argument('--output-dir', required=True, help='Directory to write the dataset to')
+    parser.add_argument('--stations', type=int, default=defaults.stations, help='Number of checkout stations')
+    parser.add_argument('--hours', type=float, default=defaults.hours, help='Simulated duration in hours')
+    parser.add_argument('--skus', type=int, default=defaults.skus, help='Number of products in the catalog')
+    parser.add_argument('--customers', type=int, default=defaults.customers, help='Number of customers')
+    parser.add_argument('--scan-rate', type=float, default=defaults.scan_rate,
+                        help='Items scanned per station per minute while busy')
+    parser.add_argument('--arrival-rate', type=float, default=defaults.arrival_rate,
+                        help='New checkout sessions per station per minute')
+    parser.add_argument('--scanner-avoidance-rate', type=float, default=defaults.scanner_avoidance_rate,
+                        help='Fraction of items not scanned (E001)')
+    parser.add_argument('--barcode-switching-rate', type=float, default=defaults.barcode_switching_rate,
+                        help='Fraction of items scanned with another barcode (E002)')
+    parser.add_argument('--weight-discrepancy-rate', type=float, default=defaults.weight_discrepancy_rate,
+                        help='Fraction of items with a wrong weight (E003)')
+    parser.add_argument('--crashes', type=int, default=defaults.crashes, help='Number of crash windows (E004)')
+    parser.add_argument('--queue-incidents', type=int, default=defaults.queue_incidents,
+                        help='Number of long queue / long wait windows (E005/E006)')
+    parser.add_argument('--seed', type=int, default=defaults.seed, help='Random seed')
+
+    args = parser.parse_args()
+
+    config = GeneratorConfig(
+        stations=args.stations,
+        hours=args.hours,
+        skus=args.skus,
+        customers=args.customers,
+        scan_rate=args.scan_rate,
+        arrival_rate=args.arrival_rate,
+        scanner_avoidance_rate=args.scanner_avoidance_rate,
+        barcode_switching_rate=args.barcode_switching_rate,
+        weight_discrepancy_rate=args.weight_discrepancy_rate,
+        crashes=args.crashes,
+        queue_incidents=args.queue_incidents,
+        seed=args.seed
+    )
+
+    print(f"Generating dataset in {args.output_dir}...")
+    counts = generate_dataset(args.output_dir, config)
+    for name, count in counts.items():
+        print(f"  [OK] {name}: {count} records")
+    print("[OK] Generation complete!")
+
+
+if __name__ == '__main__':
+    main()
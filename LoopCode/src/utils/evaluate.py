@@ -0,0 +1,264 @@
+"""
+Detection Accuracy Evaluation
+=============================
+
+Scores a detector's events.jsonl against a ground-truth events file (e.g.
+the data generator's ground_truth.jsonl) and reports precision, recall and
+F1 per event type and per station.
+
+A detected event matches a labeled one when both have the same event_id,
+the same key fields (station, products; see KEY_FIELDS) and timestamps at
+most the event type's tolerance apart. Each event matches at most once.
+
+Algorithm:
+1. Reduce every event to (event_id, key fields, seconds since epoch) and
+   sort both files by that tuple. Detector output and labels are already
+   in time order, so the sort is close to linear in practice
+2. Walk the two sorted lists with two pointers. Within a key, the earlier
+   of the two current events is unmatched if the other is more than the
+   tolerance later; otherwise both match and both pointers advance. This
+   greedy pass finds a maximum matching and visits each event once
+
+Usage:
+    python utils/evaluate.py ../../benchmarks/data/scale_1/ground_truth.jsonl events.jsonl
+    python utils/evaluate.py truth.jsonl events.jsonl --tolerance E001=10 --key E003=station_id
+
+Author: Team 01
+Date: October 2025
+"""
+
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.helpers import scan_jsonl, parse_timestamp
+
+# event_data fields that must agree for two events to match. Customer IDs
+# are left out: scanner avoidance is reported with customer "UNKNOWN"
+KEY_FIELDS = {
+    'E000': ('station_id', 'product_sku'),
+    'E001': ('station_id', 'product_sku'),
+    'E002': ('station_id', 'actual_sku', 'scanned_sku'),
+    'E003': ('station_id', 'product_sku'),
+    'E004': ('station_id',),
+    'E005': ('station_id',),
+    'E006': ('station_id',),
+    'E007': ('SKU',),
+    'E008': ('station_id',),
+    'E009': ('station_id', 'Action')
+}
+
+# Allowed timestamp difference in seconds, by event_id
+DEFAULT_TOLERANCE = 5.0
+TOLERANCE_SECONDS = {
+    # Crashes are timed from the last activity before the gap
+    'E004': 10.0,
+    # Inventory is reconciled at the final snapshot
+    'E007': 60.0
+}
+
+# Station column for events without a station
+STORE_WIDE = '-'
+
+
+@dataclass
+class Score:
+    """Matched and unmatched event counts"""
+    true_positives: int = 0
+    false_positives: int = 0
+    false_negatives: int = 0
+
+    @property
+    def precision(self) -> float:
+        detected = self.true_positives + self.false_positives
+        return self.true_positives / detected if detected else 0.0
+
+    @property
+    def recall(self) -> float:
+        labeled = self.true_positives + self.false_negatives
+        return self.true_positives / labeled if labeled else 0.0
+
+    @property
+    def f1(self) -> float:
+        total = self.precision + self.recall
+        return 2 * self.precision * self.recall / total if total else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'true_positives': self.true_positives,
+            'false_positives': self.false_positives,
+            'false_negatives': self.false_negatives,
+            'precision': round(self.precision, 4),
+            'recall': round(self.recall, 4),
+            'f1': round(self.f1, 4)
+        }
+
+
+@dataclass
+class Evaluation:
+    """Scores of a detection run against ground truth"""
+    overall: Score = field(default_factory=Score)
+    by_event: Dict[str, Score] = field(default_factory=dict)
+    by_station: Dict[str, Score] = field(default_factory=dict)
+    # (event_id, station) -> Score
+    by_event_station: Dict[Tuple[str, str], Score] = field(default_factory=dict)
+
+    def count(self, event_id: str, station: str, outcome: str):
+        """Add one true_positives/false_positives/false_negatives outcome."""
+        for score in (self.overall,
+                      self.by_event.setdefault(event_id, Score()),
+                      self.by_station.setdefault(station, Score()),
+                      self.by_event_station.setdefault((event_id, station), Score())):
+            setattr(score, outcome, getattr(score, outcome) + 1)
+
+    def to_dict(self) -> Dict:
+        return {
+            'overall': self.overall.to_dict(),
+            'by_event': {k: v.to_dict() for k, v in sorted(self.by_event.items())},
+            'by_station': {k: v.to_dict() for k, v in sorted(self.by_station.items())},
+            'by_event_station': {f"{event_id}/{station}": v.to_dict()
+                                 for (event_id, station), v in sorted(self.by_event_station.items())}
+        }
+
+
+def _matching_keys(file_path: str,
+                   key_fields: Dict[str, Tuple[str, ...]]) -> List[Tuple[str, Tuple, float, str]]:
+    """(event_id, key values, epoch seconds, station) of every event, sorted."""
+    seconds: Dict[str, float] = {}
+    keys = []
+    for line_number, event in enumerate(scan_jsonl(file_path), 1):
+        try:
+            event_id = event['event_id']
+            timestamp = event['timestamp']
+            data = event.get('event_data') or {}
+        except (KeyError, TypeError):
+            raise ValueError(f"{file_path}: event {line_number} has no event_id or timestamp")
+        when = seconds.get(timestamp)
+        if when is None:
+            when = seconds[timestamp] = parse_timestamp(timestamp).timestamp()
+        fields = key_fields.get(event_id, ('station_id',))
+        keys.append((event_id, tuple(str(data.get(name, '')) for name in fields), when,
+                     data.get('station_id') or STORE_WIDE))
+    keys.sort()
+    return keys
+
+
+def evaluate(labels_path: str, detected_path: str,
+             tolerances: Optional[Dict[str, float]] = None,
+             key_fields: Optional[Dict[str, Tuple[str, ...]]] = None) -> Evaluation:
+    """
+    Match detected events against labeled ones.
+
+    Args:
+        labels_path: Ground-truth events file
+        detected_path: Detector output to score
+        tolerances: event_id -> seconds, overriding TOLERANCE_SECONDS
+        key_fields: event_id -> fields, overriding KEY_FIELDS
+
+    Returns:
+        Evaluation with overall, per-event, per-station and per-pair scores
+    """
+    tolerances = {**TOLERANCE_SECONDS, **(tolerances or {})}
+    key_fields = {**KEY_FIELDS, **(key_fields or {})}
+    labels = _matching_keys(labels_path, key_fields)
+    detected = _matching_keys(detected_path, key_fields)
+    result = Evaluation()
+
+    i = j = 0
+    while i < len(labels) or j < len(detected):
+        if j == len(detected) or (i < len(labels) and labels[i][:2] < detected[j][:2]):
+            result.count(labels[i][0], labels[i][3], 'false_negatives')
+            i += 1
+        elif i == len(labels) or detected[j][:2] < labels[i][:2]:
+            result.count(detected[j][0], detected[j][3], 'false_positives')
+            j += 1
+        else:
+            # Same event_id and key: compare times
+            event_id, _, label_time, station = labels[i]
+            detected_time = detected[j][2]
+            tolerance = tolerances.get(event_id, DEFAULT_TOLERANCE)
+            if label_time < detected_time - tolerance:
+                result.count(event_id, station, 'false_negatives')
+                i += 1
+            elif detected_time < label_time - tolerance:
+                result.count(event_id, detected[j][3], 'false_positives')
+                j += 1
+            else:
+                result.count(event_id, station, 'true_positives')
+                i += 1
+                j += 1
+    return result
+
+
+def _print_table(title: str, scores: Dict, label: Callable[[object], str]):
+    print(f"\n{title:<22}{'TP':>7}{'FP':>7}{'FN':>7}{'precision':>11}{'recall':>8}{'F1':>8}")
+    print("-" * 70)
+    for key, score in sorted(scores.items()):
+        print(f"{label(key):<22}{score.true_positives:>7}{score.false_positives:>7}"
+              f"{score.false_negatives:>7}{score.precision:>11.3f}{score.recall:>8.3f}{score.f1:>8.3f}")
+
+
+def print_report(result: Evaluation, per_pair: bool = False):
+    """Print precision, recall and F1 per event type and per station."""
+    overall = result.overall
+    print(f"Overall: TP {overall.true_positives}  FP {overall.false_positives}  "
+          f"FN {overall.false_negatives}  precision {overall.precision:.3f}  "
+          f"recall {overall.recall:.3f}  F1 {overall.f1:.3f}")
+    _print_table('event_id', result.by_event, str)
+    _print_table('station', result.by_station, str)
+    if per_pair:
+        _print_table('event_id/station', result.by_event_station, lambda key: '/'.join(key))
+
+
+def _parse_overrides(specs: List[str], parser, convert) -> Dict:
+    """Parse repeated 'E00X=value' options."""
+    overrides = {}
+    for spec in specs:
+        event_id, _, value = spec.partition('=')
+        if not event_id or not value:
+            parser.error(f"expected EVENT_ID=VALUE, got {spec!r}")
+        try:
+            overrides[event_id] = convert(value)
+        except ValueError:
+            parser.error(f"bad value in {spec!r}")
+    return overrides
+
+
+def main():
+    """Evaluate a detector's events against ground truth from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Score Project Sentinel events against ground truth')
+    parser.add_argument('labels', help='Ground-truth events file (e.g. ground_truth.jsonl)')
+    parser.add_argument('detected', help='Detected events file to score')
+    parser.add_argument('--tolerance', action='append', default=[], metavar='EVENT_ID=SECONDS',
+                        help=f'Timestamp tolerance for an event type (repeatable; default '
+                             f'{DEFAULT_TOLERANCE:g}s, E004 10s, E007 60s)')
+    parser.add_argument('--key', action='append', default=[], metavar='EVENT_ID=FIELD,...',
+                        help='event_data fields that must match for an event type (repeatable)')
+    parser.add_argument('--by-event-station', action='store_true',
+                        help='Also print scores per event type and station')
+    parser.add_argument('--output', help='Write the scores as JSON')
+
+    args = parser.parse_args()
+
+    tolerances = _parse_overrides(args.tolerance, parser, float)
+    key_fields = _parse_overrides(args.key, parser,
+                                  lambda value: tuple(name for name in value.split(',') if name))
+
+    result = evaluate(args.labels, args.detected, tolerances, key_fields)
+    print_report(result, args.by_event_station)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result.to_dict(), f, indent=2)
+        print(f"\n  [OK] Scores written to: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
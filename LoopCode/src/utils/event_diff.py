@@ -0,0 +1,298 @@
+"""
+Golden-Output Diff for events.jsonl
+====================================
+
+Compares two event files regardless of line order, e.g. the output of a
+modified detector against evidence/output/final/events.jsonl.
+
+Algorithm:
+1. Canonicalize every event (sorted keys, compact separators) and give it
+   a match key of (timestamp, event_id, station_id or SKU)
+2. Sort each file by key with an external merge sort: sorted runs of at
+   most chunk_lines events are spilled to temporary files and merged
+3. Walk both sorted streams together one key at a time. Identical events
+   cancel out; leftovers with the same key are reported as changed, the
+   rest as added or removed
+
+Memory stays bounded by chunk_lines plus the events sharing one key, so
+multi-GB files can be compared.
+
+Author: Team 01
+Date: October 2025
+"""
+
+import heapq
+import itertools
+import json
+import sys
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+# Difference examples kept for the report
+MAX_EXAMPLES = 20
+
+
+def canonicalize(event: Dict) -> str:
+    """Serialize an event so equal events produce equal strings."""
+    return json.dumps(event, sort_keys=True, separators=(',', ':'))
+
+
+def match_key(event: Dict) -> str:
+    """
+    Key under which events from both files are compared.
+
+    Args:
+        event: Parsed event
+
+    Returns:
+        Tab-separated timestamp, event_id and station (or SKU)
+    """
+    data = event.get('event_data') or {}
+    group = data.get('station_id', data.get('SKU', ''))
+    return f"{event.get('timestamp', '')}\t{event.get('event_id', '')}\t{group}"
+
+
+def _read_events(file_path: str) -> Iterator[Tuple[str, str]]:
+    """Yield (match key, canonical event) for every line of a file."""
+    with open(file_path, 'rb') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{file_path}:{line_number}: invalid JSON: {e}")
+            yield match_key(event), canonicalize(event)
+
+
+def _read_run(run_path: Path) -> Iterator[Tuple[str, str]]:
+    """Yield (key, canonical event) pairs from a sorted run file."""
+    with open(run_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            key_time, key_id, key_group, canonical = line.rstrip('\n').split('\t', 3)
+            yield f"{key_time}\t{key_id}\t{key_group}", canonical
+
+
+def sorted_events(file_path: str, work_dir: str,
+                  chunk_lines: int = 100000) -> Iterator[Tuple[str, str]]:
+    """
+    Yield a file's events sorted by (match key, canonical form).
+
+    Args:
+        file_path: events.jsonl file
+        work_dir: Directory for temporary run files
+        chunk_lines: Maximum events held in memory at once
+
+    Returns:
+        Iterator of (match key, canonical event)
+    """
+    runs: List[Path] = []
+    buffer: List[Tuple[str, str]] = []
+
+    def spill():
+        buffer.sort()
+        run_path = Path(work_dir) / f"{Path(file_path).stem}.{id(runs)}.{len(runs)}.run"
+        with open(run_path, 'w', encoding='utf-8') as f:
+            for key, canonical in buffer:
+                f.write(f"{key}\t{canonical}\n")
+        runs.append(run_path)
+        buffer.clear()
+
+    for item in _read_events(file_path):
+        buffer.append(item)
+        if len(buffer) >= chunk_lines:
+            spill()
+
+    if not runs:
+        buffer.sort()
+        yield from buffer
+        return
+    if buffer:
+        spill()
+    yield from heapq.merge(*(_read_run(run) for run in runs))
+
+
+def _grouped(stream: Iterator[Tuple[str, str]]) -> Iterator[Tuple[str, List[str]]]:
+    """Group a sorted stream into (key, canonical events)."""
+    for key, items in itertools.groupby(stream, key=lambda item: item[0]):
+        yield key, [canonical for _, canonical in items]
+
+
+@dataclass
+class DiffResult:
+    """Summary of the differences between two event files"""
+    baseline_total: int = 0
+    candidate_total: int = 0
+    matched: int = 0
+    # (kind, event_id, station or SKU) -> count
+    counts: Counter = field(default_factory=Counter)
+    examples: List[Dict] = field(default_factory=list)
+
+    @property
+    def identical(self) -> bool:
+        """True if both files contain the same events."""
+        return not self.counts
+
+    def totals(self) -> Dict[str, int]:
+        """Number of added, removed and changed events."""
+        totals = {ADDED: 0, REMOVED: 0, CHANGED: 0}
+        for (kind, _, _), count in self.counts.items():
+            totals[kind] += count
+        return totals
+
+
+def diff_events(baseline_path: str, candidate_path: str,
+                chunk_lines: int = 100000,
+                on_difference: Optional[Callable[[Dict], None]] = None) -> DiffResult:
+    """
+    Compare two events files.
+
+    Args:
+        baseline_path: Expected (golden) events file
+        candidate_path: Events file to check
+        chunk_lines: Events per in-memory sort run
+        on_difference: Called with every difference record as it is found
+
+    Returns:
+        DiffResult
+    """
+    result = DiffResult()
+
+    def report(kind: str, key: str, baseline: Optional[str], candidate: Optional[str]):
+        _, event_id, group = key.split('\t')
+        result.counts[(kind, event_id, group)] += 1
+        record = {
+            'type': kind,
+            'baseline': json.loads(baseline) if baseline else None,
+            'candidate': json.loads(candidate) if candidate else None
+        }
+        if len(result.examples) < MAX_EXAMPLES:
+            result.examples.append(record)
+        if on_difference is not None:
+            on_difference(record)
+
+    with tempfile.TemporaryDirectory(prefix='sentinel-diff-') as work_dir:
+        baseline = _grouped(sorted_events(baseline_path, work_dir, chunk_lines))
+        candidate = _grouped(sorted_events(candidate_path, work_dir, chunk_lines))
+        base_item = next(baseline, None)
+        cand_item = next(candidate, None)
+
+        while base_item is not None or cand_item is not None:
+            if cand_item is None or (base_item is not None and base_item[0] < cand_item[0]):
+                key, base_events, cand_events = base_item[0], base_item[1], []
+                base_item = next(baseline, None)
+            elif base_item is None or cand_item[0] < base_item[0]:
+                key, base_events, cand_events = cand_item[0], [], cand_item[1]
+                cand_item = next(candidate, None)
+            else:
+                key, base_events, cand_events = base_item[0], base_item[1], cand_item[1]
+                base_item = next(baseline, None)
+                cand_item = next(candidate, None)
+
+            result.baseline_total += len(base_events)
+            result.candidate_total += len(cand_events)
+
+            # Identical events cancel out; both lists are already sorted
+            common = Counter(base_events) & Counter(cand_events)
+            result.matched += sum(common.values())
+            only_base = list((Counter(base_events) - common).elements())
+            only_cand = list((Counter(cand_events) - common).elements())
+
+            for base_event, cand_event in zip(only_base, only_cand):
+                report(CHANGED, key, base_event, cand_event)
+            for base_event in only_base[len(only_cand):]:
+                report(REMOVED, key, base_event, None)
+            for cand_event in only_cand[len(only_base):]:
+                report(ADDED, key, None, cand_event)
+
+    return result
+
+
+def changed_fields(record: Dict) -> Dict[str, Tuple]:
+    """
+    Fields of event_data that differ in a changed record.
+
+    Returns:
+        Dictionary of field -> (baseline value, candidate value)
+    """
+    before = record['baseline']['event_data']
+    after = record['candidate']['event_data']
+    return {k: (before.get(k), after.get(k))
+            for k in sorted(set(before) | set(after)) if before.get(k) != after.get(k)}
+
+
+def print_report(result: DiffResult, examples: int = 10):
+    """Print a diff summary grouped by event_id and station."""
+    totals = result.totals()
+    print(f"Baseline events:  {result.baseline_total}")
+    print(f"Candidate events: {result.candidate_total}")
+    print(f"Matching events:  {result.matched}")
+    print(f"Added: {totals[ADDED]}  Removed: {totals[REMOVED]}  Changed: {totals[CHANGED]}")
+    if result.identical:
+        return
+
+    rows: Dict[Tuple[str, str], Counter] = {}
+    for (kind, event_id, group), count in result.counts.items():
+        rows.setdefault((event_id, group), Counter())[kind] += count
+
+    print(f"\n{'event_id':<10}{'station/SKU':<16}{'added':>8}{'removed':>9}{'changed':>9}")
+    print("-" * 52)
+    for event_id, group in sorted(rows):
+        row = rows[(event_id, group)]
+        print(f"{event_id:<10}{group or '-':<16}{row[ADDED]:>8}{row[REMOVED]:>9}{row[CHANGED]:>9}")
+
+    if examples:
+        print("\nExamples:")
+        for record in result.examples[:examples]:
+            event = record['candidate'] or record['baseline']
+            where = f"{event['timestamp']} {event['event_id']}"
+            if record['type'] == CHANGED:
+                fields = ", ".join(f"{k}: {a!r} -> {b!r}" for k, (a, b) in changed_fields(record).items())
+                print(f"  changed {where}: {fields}")
+            else:
+                print(f"  {record['type']} {where}: {json.dumps(event['event_data'])}")
+
+
+def main():
+    """Compare two events files from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Diff two Project Sentinel events.jsonl files')
+    parser.add_argument('baseline', help='Expected events file (e.g. evidence/output/final/events.jsonl)')
+    parser.add_argument('candidate', help='Events file to compare')
+    parser.add_argument('--chunk-lines', type=int, default=100000,
+                        help='Events per in-memory sort run (default: 100000)')
+    parser.add_argument('--examples', type=int, default=10,
+                        help='Number of example differences to print (default: 10)')
+    parser.add_argument('--output', help='Write every difference to this JSONL file')
+
+    args = parser.parse_args()
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else None
+    try:
+        result = diff_events(
+            args.baseline, args.candidate, args.chunk_lines,
+            on_difference=(lambda record: output.write(json.dumps(record) + '\n')) if output else None
+        )
+    finally:
+        if output:
+            output.close()
+
+    print_report(result, args.examples)
+    if result.identical:
+        print("\n[OK] Outputs match")
+        return 0
+    print("\n[FAIL] Outputs differ")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""
+Indexed Event Store
+===================
+
+SQLite index over an events.jsonl file, so consumers can run filtered
+and aggregate queries without re-scanning the file.
+
+Each event is stored once with its raw JSON line plus indexed columns
+(timestamp, event_id, station_id, customer_id). SKUs go to a side table
+because some events name two products (barcode switching has the actual
+and the scanned SKU). The index remembers how many bytes of the file it
+covers: appended events (e.g. from the streaming detector) are indexed
+incrementally, and a file that was rewritten is indexed from scratch.
+
+Author: Team 01
+Date: October 2025
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Filters accepted by query and aggregate; lists are OR-ed, filters AND-ed
+FILTER_FIELDS = ('event_id', 'station_id', 'customer_id', 'sku')
+
+# event_data fields naming a product
+SKU_FIELDS = ('product_sku', 'SKU', 'actual_sku', 'scanned_sku')
+
+# Columns aggregate counts can be grouped by
+GROUP_FIELDS = ('event_id', 'station_id', 'customer_id')
+
+BUCKET_PATTERN = re.compile(r'^(\d+)(min|h|d)$')
+BUCKET_SECONDS = {'min': 60, 'h': 3600, 'd': 86400}
+
+# Rows inserted per transaction while indexing
+INDEX_BATCH = 5000
+
+# Bytes before the indexed offset compared to detect in-place rewrites
+TAIL_BYTES = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    station_id TEXT,
+    customer_id TEXT,
+    line TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS event_skus (
+    event INTEGER NOT NULL,
+    sku TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_event_id ON events (event_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_station ON events (station_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_customer ON events (customer_id);
+CREATE INDEX IF NOT EXISTS idx_event_skus ON event_skus (sku, event);
+"""
+
+
+def index_path_for(events_path: str) -> str:
+    """Default index file for an events.jsonl file."""
+    path = Path(events_path)
+    return str(path.with_name(path.stem + '.index.sqlite'))
+
+
+def parse_bucket(bucket: str) -> int:
+    """
+    Bucket width in seconds.
+
+    Args:
+        bucket: Width such as '1min', '15min', '1h' or '1d'
+
+    Raises:
+        ValueError: If the width is not understood
+    """
+    match = BUCKET_PATTERN.match(bucket)
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"bad bucket {bucket!r} (expected e.g. 5min, 1h, 1d)")
+    return int(match.group(1)) * BUCKET_SECONDS[match.group(2)]
+
+
+class EventStore:
+    """
+    Read-only query access to an events.jsonl file through a SQLite index.
+
+    Safe to share between threads: each thread gets its own connection and
+    indexing is serialized.
+    """
+
+    def __init__(self, events_path: str, index_path: Optional[str] = None):
+        """
+        Open (or create) the index for an events file.
+
+        Args:
+            events_path: Path to events.jsonl
+            index_path: Index database (default: <name>.index.sqlite next to the file)
+        """
+        self.events_path = Path(events_path)
+        self.index_path = Path(index_path or index_path_for(events_path))
+        self._local = threading.local()
+        self._index_lock = threading.Lock()
+        # Changes whenever new events are indexed (used as a cache key)
+        self.generation = 0
+        connection = self._connection()
+        connection.executescript(SCHEMA)
+        connection.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection to the index."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.index_path), timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _meta(self, connection: sqlite3.Connection) -> Dict[str, str]:
+        return dict(connection.execute('SELECT key, value FROM meta'))
+
+    def _tail(self, offset: int) -> str:
+        """Hex of the last indexed bytes, to notice a file rewritten in place."""
+        with open(self.events_path, 'rb') as f:
+            f.seek(max(0, offset - TAIL_BYTES))
+            return f.read(min(offset, TAIL_BYTES)).hex()
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the events file.
+
+        Returns:
+            Number of newly indexed events
+        """
+        with self._index_lock:
+            connection = self._connection()
+            meta = self._meta(connection)
+            try:
+                stat = self.events_path.stat()
+            except OSError:
+                stat = None
+
+            offset = int(meta.get('offset', 0))
+            identity = f"{stat.st_ino}:{stat.st_dev}" if stat else ''
+            if offset and (stat is None or stat.st_size < offset
+                           or meta.get('identity') != identity
+                           or meta.get('tail') != self._tail(offset)):
+                # File replaced, truncated or rewritten: start over
+                connection.execute('DELETE FROM events')
+                connection.execute('DELETE FROM event_skus')
+                self._save_meta(connection, identity, 0)
+                connection.commit()
+                self.generation += 1
+                offset = 0
+            if stat is None or stat.st_size == offset:
+                return 0
+
+            indexed = self._index_from(connection, identity, offset)
+            if indexed:
+                self.generation += 1
+            return indexed
+
+    def _index_from(self, connection: sqlite3.Connection, identity: str, offset: int) -> int:
+        """Index complete lines from a byte offset and commit in batches."""
+        indexed = 0
+        rows: List[Tuple] = []
+        skus: List[Tuple] = []
+        next_id = (connection.execute('SELECT MAX(id) FROM events').fetchone()[0] or 0) + 1
+
+        def commit(position: int):
+            connection.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)', rows)
+            connection.executemany('INSERT INTO event_skus VALUES (?, ?)', skus)
+            self._save_meta(connection, identity, position)
+            connection.commit()
+            rows.clear()
+            skus.clear()
+
+        with open(self.events_path, 'rb') as f:
+            f.seek(offset)
+            position = offset
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    # Partially written last line; picked up on the next refresh
+                    break
+                position += len(raw)
+                line = raw.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                    data = event.get('event_data') or {}
+                    row = (next_id, event['timestamp'], event['event_id'],
+                           data.get('station_id'), data.get('customer_id'), line.decode('utf-8'))
+                except (ValueError, KeyError, AttributeError):
+                    continue
+                rows.append(row)
+                for field in SKU_FIELDS:
+                    if data.get(field):
+                        skus.append((next_id, data[field]))
+                next_id += 1
+                indexed += 1
+                if len(rows) >= INDEX_BATCH:
+                    commit(position)
+            commit(position)
+        return indexed
+
+    def _save_meta(self, connection: sqlite3.Connection, identity: str, offset: int):
+        tail = self._tail(offset) if offset else ''
+        connection.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                               [('identity', identity), ('offset', str(offset)), ('tail', tail)])
+
+    @staticmethod
+    def _where(filters: Dict[str, Sequence[str]], start: Optional[str],
+               end: Optional[str]) -> Tuple[str, List]:
+        """SQL condition and parameters for a set of filters."""
+        clauses, params = [], []
+        for field in FILTER_FIELDS:
+            values = [v for v in filters.get(field) or [] if v]
+            if not values:
+                continue
+            marks = ', '.join('?' * len(values))
+            if field == 'sku':
+                clauses.append(f"id IN (SELECT event FROM event_skus WHERE sku IN ({marks}))")
+            else:
+                clauses.append(f"{field} IN ({marks})")
+            params.extend(values)
+        if start:
+            clauses.append('timestamp >= ?')
+            params.append(start)
+        if end:
+            clauses.append('timestamp <= ?')
+            params.append(end)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def query(self, filters: Optional[Dict[str, Sequence[str]]] = None,
+              start: Optional[str] = None, end: Optional[str] = None,
+              limit: Optional[int] = None, offset: int = 0,
+              descending: bool = False) -> Iterator[str]:
+        """
+        Stream matching events as raw JSON lines in timestamp order.
+
+        Args:
+            filters: Field -> accepted values, for fields in FILTER_FIELDS
+            start: First timestamp to include (inclusive)
+            end: Last timestamp to include (inclusive)
+            limit: Maximum number of events (all if None)
+            offset: Number of matching events to skip
+            descending: Newest first
+
+        Returns:
+            Iterator of JSON lines (without newline)
+        """
+        where, params = self._where(filters or {}, start, end)
+        order = 'DESC' if descending else 'ASC'
+        sql = f"SELECT line FROM events{where} ORDER BY timestamp {order}, id {order}"
+        if limit is not None or offset:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [-1 if limit is None else limit, offset]
+        cursor = self._connection().execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            for (line,) in rows:
+                yield line
+
+    def count(self, filters: Optional[Dict[str, Sequence[str]]] = None,
+              start: Optional[str] = None, end: Optional[str] = None) -> int:
+        """Number of matching events."""
+        where, params = self._where(filters or {}, start, end)
+        return self._connection().execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()[0]
+
+    def aggregate(self, bucket: str = '1h', group_by: Optional[str] = None,
+                  filters: Optional[Dict[str, Sequence[str]]] = None,
+                  start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        """
+        Count matching events per time bucket.
+
+        Args:
+            bucket: Bucket width such as '5min', '1h' or '1d'
+            group_by: Optional column in GROUP_FIELDS to split counts by
+            filters: Field -> accepted values, for fields in FILTER_FIELDS
+            start: First timestamp to include (inclusive)
+            end: Last timestamp to include (inclusive)
+
+        Returns:
+            List of {'bucket', 'count'} (plus the group_by field) in bucket order
+
+        Raises:
+            ValueError: On an unknown bucket width or group_by field
+        """
+        width = parse_bucket(bucket)
+        if group_by is not None and group_by not in GROUP_FIELDS:
+            raise ValueError(f"cannot group by {group_by!r} (expected one of {', '.join(GROUP_FIELDS)})")
+        where, params = self._where(filters or {}, start, end)
+        bucket_sql = (f"strftime('%Y-%m-%dT%H:%M:%S', "
+                      f"(CAST(strftime('%s', timestamp) AS INTEGER) / {width}) * {width}, 'unixepoch')")
+        group_sql = f", {group_by}" if group_by else ''
+        sql = (f"SELECT {bucket_sql} AS bucket{group_sql}, COUNT(*) FROM events{where} "
+               f"GROUP BY bucket{group_sql} ORDER BY bucket{group_sql}")
+        results = []
+        for row in self._connection().execute(sql, params):
+            item = {'bucket': row[0], 'count': row[-1]}
+            if group_by:
+                item[group_by] = row[1]
+            results.append(item)
+        return results
+
+    def summary(self) -> Dict:
+        """Event totals, counts per event_id and station, and the time range."""
+        connection = self._connection()
+        first, last, total = connection.execute(
+            'SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM events').fetchone()
+        return {
+            'events_file': str(self.events_path),
+            'total': total,
+            'first_timestamp': first,
+            'last_timestamp': last,
+            'event_counts': dict(connection.execute(
+                'SELECT event_id, COUNT(*) FROM events GROUP BY event_id ORDER BY event_id')),
+            'station_counts': dict(connection.execute(
+                'SELECT station_id, COUNT(*) FROM events WHERE station_id IS NOT NULL '
+                'GROUP BY station_id ORDER BY station_id'))
+        }
+
+    def close(self):
+        """Close this thread's connection."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
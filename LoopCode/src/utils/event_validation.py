@@ -0,0 +1,358 @@
+"""
+Streaming Validator for events.jsonl
+=====================================
+
+Validates detector output in a single pass with constant memory:
+- Every line is a JSON object with exactly timestamp, event_id and event_data
+- event_data matches the shape produced by the DetectedEvent.create_*
+  factory for that event_id (field names, event_name and value types)
+- Timestamps use the output format and never go backwards
+- No event appears twice
+
+Because output is sorted by timestamp, duplicates can only be adjacent,
+so only the events of the current timestamp are remembered. Large files
+can be split into newline-aligned chunks validated by worker processes.
+
+Author: Team 01
+Date: October 2025
+"""
+
+import heapq
+import inspect
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_models import DetectedEvent
+
+
+TIMESTAMP_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}$')
+TOP_LEVEL_KEYS = {'timestamp', 'event_id', 'event_data'}
+# Written only by detectors running with a versioned catalog
+OPTIONAL_KEYS = {'catalog_version'}
+
+# Errors kept per run; the rest are only counted
+MAX_REPORTED_ERRORS = 50
+
+
+def _build_schemas() -> Dict[str, Tuple[str, Dict[str, type]]]:
+    """
+    Derive the expected event_data shape for each event_id.
+
+    Each DetectedEvent.create_* factory is called with placeholder values
+    for its annotated parameters, so the schema always follows the code.
+
+    Returns:
+        Dictionary of event_id -> (event_name, {field: value type})
+    """
+    placeholders = {str: 'x', int: 0, float: 0.0}
+    schemas = {}
+    for name, factory in inspect.getmembers(DetectedEvent, inspect.isfunction):
+        if not name.startswith('create_'):
+            continue
+        params = inspect.signature(factory).parameters.values()
+        event = factory(**{p.name: placeholders.get(p.annotation, 'x') for p in params})
+        fields = {key: type(value) for key, value in event.event_data.items()}
+        schemas[event.event_id] = (event.event_data['event_name'], fields)
+    return schemas
+
+
+EVENT_SCHEMAS = _build_schemas()
+
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating an events file (or one chunk of it)"""
+    total: int = 0
+    counts: Counter = field(default_factory=Counter)
+    error_count: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    duplicates: int = 0
+    out_of_order: int = 0
+    first_timestamp: Optional[str] = None
+    last_timestamp: Optional[str] = None
+    # Events at the first and last timestamp -> line of their first occurrence,
+    # for checks across chunk boundaries
+    first_group: Dict[bytes, int] = field(default_factory=dict)
+    last_group: Dict[bytes, int] = field(default_factory=dict)
+    lines: int = 0
+
+    @property
+    def ok(self) -> bool:
+        """True if no problem was found."""
+        return self.error_count == 0 and self.duplicates == 0 and self.out_of_order == 0
+
+    def add_error(self, line_number: int, message: str):
+        """Record an error, keeping only the first MAX_REPORTED_ERRORS."""
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_number, message))
+
+
+def check_event(record) -> Optional[str]:
+    """
+    Check one parsed event against its schema.
+
+    Args:
+        record: Parsed JSON value of one line
+
+    Returns:
+        Error message, or None if the event is valid
+    """
+    if not isinstance(record, dict):
+        return 'line is not a JSON object'
+    if record.keys() != TOP_LEVEL_KEYS and record.keys() - OPTIONAL_KEYS != TOP_LEVEL_KEYS:
+        return f"top-level keys {sorted(record.keys())} != {sorted(TOP_LEVEL_KEYS)}"
+    version = record.get('catalog_version', 0)
+    if not isinstance(version, int) or isinstance(version, bool):
+        return f"bad catalog_version {version!r}"
+
+    timestamp = record['timestamp']
+    if not isinstance(timestamp, str) or not TIMESTAMP_PATTERN.match(timestamp):
+        return f"bad timestamp {timestamp!r}"
+
+    event_id = record['event_id']
+    schema = EVENT_SCHEMAS.get(event_id)
+    if schema is None:
+        return f"unknown event_id {event_id!r}"
+
+    event_name, fields = schema
+    data = record['event_data']
+    if not isinstance(data, dict):
+        return f"{event_id}: event_data is not an object"
+    if data.keys() != fields.keys():
+        missing = sorted(fields.keys() - data.keys())
+        extra = sorted(data.keys() - fields.keys())
+        return f"{event_id}: missing fields {missing}, unexpected fields {extra}"
+    if data['event_name'] != event_name:
+        return f"{event_id}: event_name {data['event_name']!r} != {event_name!r}"
+    for key, expected_type in fields.items():
+        value = data[key]
+        if expected_type is float:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        elif expected_type is int:
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        else:
+            valid = isinstance(value, expected_type)
+        if not valid:
+            return f"{event_id}: {key} should be {expected_type.__name__}, got {value!r}"
+    return None
+
+
+def validate_range(file_path: str, start: int = 0, end: Optional[int] = None) -> ValidationResult:
+    """
+    Validate the lines of a file that start within [start, end).
+
+    Args:
+        file_path: Path to events.jsonl
+        start: Byte offset where the range starts (must be a line start)
+        end: Byte offset where the range ends (None for end of file)
+
+    Returns:
+        ValidationResult with line numbers relative to the range
+    """
+    result = ValidationResult()
+    previous = None
+    group: Dict[bytes, int] = {}
+    first_group_done = False
+
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        position = start
+        for line in f:
+            if end is not None and position >= end:
+                break
+            position += len(line)
+            result.lines += 1
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                result.add_error(result.lines, f"invalid JSON: {e}")
+                continue
+            error = check_event(record)
+            if error:
+                result.add_error(result.lines, error)
+                continue
+
+            result.total += 1
+            result.counts[record['event_id']] += 1
+            timestamp = record['timestamp']
+
+            if previous is None:
+                result.first_timestamp = timestamp
+            elif timestamp < previous:
+                result.out_of_order += 1
+                result.add_error(result.lines, f"timestamp {timestamp} before {previous}")
+
+            if timestamp != previous:
+                if previous is not None and not first_group_done:
+                    result.first_group = group
+                    first_group_done = True
+                group = {}
+                previous = timestamp
+            if line in group:
+                result.duplicates += 1
+                result.add_error(result.lines, "duplicate event")
+            else:
+                group[line] = result.lines
+
+    if not first_group_done:
+        result.first_group = group
+    result.last_timestamp = previous
+    result.last_group = group
+    return result
+
+
+def split_ranges(file_path: str, chunks: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into newline-aligned byte ranges.
+
+    Args:
+        file_path: File to split
+        chunks: Number of ranges wanted
+
+    Returns:
+        List of (start, end) byte offsets
+    """
+    size = os.path.getsize(file_path)
+    if chunks <= 1 or size == 0:
+        return [(0, size)]
+
+    boundaries = [0]
+    with open(file_path, 'rb') as f:
+        for i in range(1, chunks):
+            f.seek(max(boundaries[-1], size * i // chunks))
+            f.readline()
+            position = f.tell()
+            if position >= size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _merge(results: List[ValidationResult]) -> ValidationResult:
+    """
+    Combine chunk results in file order, checking chunk boundaries.
+
+    Boundary problems are reported the way a single pass would report
+    them (one error per repeated event, at its own line), so the result
+    does not depend on how the file was split.
+    """
+    merged = ValidationResult()
+    line_offset = 0
+    # Events seen so far at merged.last_timestamp; spans several chunks when
+    # chunks lie entirely within one timestamp
+    open_group: Set[bytes] = set()
+    for chunk in results:
+        merged.total += chunk.total
+        merged.counts.update(chunk.counts)
+        merged.duplicates += chunk.duplicates
+        merged.out_of_order += chunk.out_of_order
+
+        boundary_errors = []
+        if chunk.first_timestamp is not None:
+            if merged.first_timestamp is None:
+                merged.first_timestamp = chunk.first_timestamp
+            continues_group = chunk.first_timestamp == merged.last_timestamp
+            if merged.last_timestamp is not None:
+                if chunk.first_timestamp < merged.last_timestamp:
+                    merged.out_of_order += 1
+                    boundary_errors.append((
+                        line_offset + min(chunk.first_group.values()),
+                        f"timestamp {chunk.first_timestamp} before {merged.last_timestamp}"
+                    ))
+                elif continues_group:
+                    repeated = sorted(line_number for line, line_number in chunk.first_group.items()
+                                      if line in open_group)
+                    merged.duplicates += len(repeated)
+                    for line_number in repeated:
+                        boundary_errors.append((line_offset + line_number, "duplicate event"))
+            if continues_group and chunk.last_timestamp == chunk.first_timestamp:
+                open_group.update(chunk.last_group)
+            else:
+                open_group = set(chunk.last_group)
+            merged.last_timestamp = chunk.last_timestamp
+
+        # Keep errors in line order, as a single pass would report them
+        merged.error_count += chunk.error_count + len(boundary_errors)
+        chunk_errors = [(line_number + line_offset, message) for line_number, message in chunk.errors]
+        for error in heapq.merge(boundary_errors, chunk_errors):
+            if len(merged.errors) < MAX_REPORTED_ERRORS:
+                merged.errors.append(error)
+        line_offset += chunk.lines
+    merged.lines = line_offset
+    return merged
+
+
+def validate_events_file(file_path: str, workers: int = 1) -> ValidationResult:
+    """
+    Validate an events.jsonl file.
+
+    Args:
+        file_path: Path to events.jsonl
+        workers: Number of processes; files are split into that many chunks
+
+    Returns:
+        ValidationResult with absolute line numbers
+    """
+    if workers <= 1:
+        return validate_range(file_path)
+
+    ranges = split_ranges(file_path, workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(validate_range, file_path, start, end) for start, end in ranges]
+        return _merge([future.result() for future in futures])
+
+
+def print_report(file_path: str, result: ValidationResult):
+    """Print a validation result."""
+    print(f"Validated {file_path}")
+    print(f"  Events: {result.total}")
+    if result.first_timestamp:
+        print(f"  Time range: {result.first_timestamp} -> {result.last_timestamp}")
+    for event_id, count in sorted(result.counts.items()):
+        print(f"  {event_id} ({EVENT_SCHEMAS[event_id][0]}): {count}")
+    print(f"  Errors: {result.error_count} (duplicates: {result.duplicates}, "
+          f"out of order: {result.out_of_order})")
+    for line_number, message in result.errors:
+        print(f"    line {line_number}: {message}")
+    if result.error_count > len(result.errors):
+        print(f"    ... {result.error_count - len(result.errors)} more")
+
+
+def main():
+    """Validate events files from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Validate Project Sentinel events.jsonl files')
+    parser.add_argument('files', nargs='+', help='events.jsonl files to validate')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Validate chunks of each file in parallel processes (default: 1)')
+
+    args = parser.parse_args()
+
+    all_ok = True
+    for file_path in args.files:
+        result = validate_events_file(file_path, args.workers)
+        print_report(file_path, result)
+        print(f"[{'OK' if result.ok else 'FAIL'}] {file_path}\n")
+        all_ok &= result.ok
+    return 0 if all_ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
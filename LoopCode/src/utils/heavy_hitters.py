@@ -0,0 +1,306 @@
+"""
+Heavy-Hitter Tracking of High-Risk Customers
+=============================================
+
+Ranks the customers behind repeated fraud events (E001, E002, E003)
+across stations and days in fixed memory, using the Space-Saving
+algorithm (Metwally et al.):
+
+- At most `capacity` customers are monitored, each with a count and an
+  overestimation error
+- A new customer arriving when all slots are taken replaces the customer
+  with the smallest count and inherits that count as its error
+- A monitored count is never lower than the true count and at most
+  `error` higher, and every error is at most total / capacity, so any
+  customer with more than total / capacity events is guaranteed to be kept
+
+The tracker is saved as JSON and reloaded on the next run. Each fed batch
+of events is fingerprinted, so re-running detection on the same data does
+not count its events twice.
+
+Author: Team 01
+Date: October 2025
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Fraud event types attributed to a customer
+FRAUD_EVENT_IDS = ('E001', 'E002', 'E003')
+
+# Customer ids that do not identify anyone (vision-only detections)
+ANONYMOUS_CUSTOMERS = {'', 'UNKNOWN', None}
+
+# Fingerprints of fed batches remembered for duplicate detection
+MAX_BATCH_FINGERPRINTS = 1000
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-k counter over a stream of keys.
+
+    Each monitored key holds [count, error, details]; details is a small
+    dictionary callers may use for per-key attributes.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize the counter.
+
+        Args:
+            capacity: Maximum number of keys monitored at once
+        """
+        self.capacity = capacity
+        self.total = 0
+        self._counters: Dict[str, list] = {}
+        # (count, key) entries; stale ones are skipped when popped
+        self._heap: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._counters
+
+    def add(self, key: str, weight: int = 1) -> Dict:
+        """
+        Count one occurrence of a key.
+
+        Args:
+            key: Item to count
+            weight: Number of occurrences
+
+        Returns:
+            The key's details dictionary
+        """
+        self.total += weight
+        counter = self._counters.get(key)
+        if counter is None:
+            if len(self._counters) < self.capacity:
+                counter = [0, 0, {}]
+            else:
+                # Replace the key with the smallest count
+                evicted_count = self._pop_min()
+                counter = [evicted_count, evicted_count, {}]
+            self._counters[key] = counter
+        counter[0] += weight
+        heapq.heappush(self._heap, (counter[0], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+        return counter[2]
+
+    def _pop_min(self) -> int:
+        """Remove the monitored key with the smallest count and return its count."""
+        while True:
+            count, key = heapq.heappop(self._heap)
+            counter = self._counters.get(key)
+            if counter is not None and counter[0] == count:
+                del self._counters[key]
+                return count
+
+    def _rebuild_heap(self):
+        """Drop stale heap entries."""
+        self._heap = [(counter[0], key) for key, counter in self._counters.items()]
+        heapq.heapify(self._heap)
+
+    @property
+    def max_error(self) -> int:
+        """Upper bound on any monitored count's overestimation."""
+        if len(self._counters) < self.capacity:
+            return 0
+        return min(counter[0] for counter in self._counters.values())
+
+    def top(self, n: Optional[int] = None) -> List[Dict]:
+        """
+        Monitored keys ranked by count.
+
+        Args:
+            n: Number of keys to return (all if None)
+
+        Returns:
+            List of dictionaries with key, count, error, guaranteed
+            (count - error, a lower bound on the true count) and details
+        """
+        ranked = sorted(self._counters.items(), key=lambda item: (-item[1][0], item[0]))
+        if n is not None:
+            ranked = ranked[:n]
+        return [{'key': key, 'count': count, 'error': error,
+                 'guaranteed': count - error, 'details': details}
+                for key, (count, error, details) in ranked]
+
+    def to_dict(self) -> Dict:
+        """Serializable state."""
+        return {
+            'capacity': self.capacity,
+            'total': self.total,
+            'counters': {key: list(counter) for key, counter in self._counters.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'SpaceSaving':
+        """Restore a counter saved with to_dict."""
+        counter = cls(state['capacity'])
+        counter.total = state['total']
+        counter._counters = {key: list(value) for key, value in state['counters'].items()}
+        counter._rebuild_heap()
+        return counter
+
+
+class RiskTracker:
+    """
+    Persistent top-N list of customers behind fraud events.
+
+    Per customer it keeps the fraud event count (with its error bound),
+    counts per event type, the stations involved and the first and last
+    event times.
+    """
+
+    def __init__(self, capacity: int = 1000, state_path: Optional[str] = None):
+        """
+        Initialize the tracker, loading saved state if it exists.
+
+        Args:
+            capacity: Customers monitored at once (memory bound)
+            state_path: JSON file the tracker is loaded from and saved to
+        """
+        self.state_path = Path(state_path) if state_path else None
+        self.counter = SpaceSaving(capacity)
+        self.batches: List[str] = []
+        if self.state_path is not None and self.state_path.exists():
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.counter = SpaceSaving.from_dict(state['counter'])
+            self.batches = state.get('batches', [])
+
+    @staticmethod
+    def _as_dict(event) -> Dict:
+        """Event as a dictionary (accepts DetectedEvent objects and parsed lines)."""
+        if isinstance(event, dict):
+            return event
+        return {'timestamp': event.timestamp, 'event_id': event.event_id, 'event_data': event.event_data}
+
+    def update(self, events: Iterable) -> int:
+        """
+        Feed a batch of events; non-fraud and anonymous events are ignored.
+
+        Args:
+            events: DetectedEvent objects or parsed event dictionaries
+
+        Returns:
+            Number of fraud events counted (0 if this batch was already fed)
+        """
+        fraud = []
+        for event in events:
+            event = self._as_dict(event)
+            data = event.get('event_data') or {}
+            if event.get('event_id') in FRAUD_EVENT_IDS and data.get('customer_id') not in ANONYMOUS_CUSTOMERS:
+                fraud.append(event)
+        if not fraud:
+            return 0
+
+        # The catalog version is left out so a file and its detector run match
+        lines = sorted(json.dumps([event['timestamp'], event['event_id'], event['event_data']],
+                                  sort_keys=True) for event in fraud)
+        fingerprint = hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()
+        if fingerprint in self.batches:
+            return 0
+        self.batches = (self.batches + [fingerprint])[-MAX_BATCH_FINGERPRINTS:]
+
+        for event in fraud:
+            data = event['event_data']
+            details = self.counter.add(data['customer_id'])
+            by_event = details.setdefault('by_event', {})
+            by_event[event['event_id']] = by_event.get(event['event_id'], 0) + 1
+            stations = details.setdefault('stations', [])
+            if data.get('station_id') and data['station_id'] not in stations:
+                stations.append(data['station_id'])
+            timestamp = event['timestamp']
+            details['first_seen'] = min(details.get('first_seen', timestamp), timestamp)
+            details['last_seen'] = max(details.get('last_seen', timestamp), timestamp)
+        return len(fraud)
+
+    def update_from_file(self, events_file: str) -> int:
+        """Feed the events of an events.jsonl file."""
+        with open(events_file, 'r', encoding='utf-8') as f:
+            return self.update(json.loads(line) for line in f if line.strip())
+
+    def top(self, n: int = 10) -> List[Dict]:
+        """
+        Ranked high-risk customers.
+
+        Returns:
+            List of dictionaries with rank, customer_id, fraud_events, error,
+            guaranteed, by_event, stations, first_seen and last_seen
+        """
+        ranked = []
+        for rank, item in enumerate(self.counter.top(n), 1):
+            details = item['details']
+            ranked.append({
+                'rank': rank,
+                'customer_id': item['key'],
+                'fraud_events': item['count'],
+                'error': item['error'],
+                'guaranteed': item['guaranteed'],
+                'by_event': dict(sorted(details.get('by_event', {}).items())),
+                'stations': sorted(details.get('stations', [])),
+                'first_seen': details.get('first_seen'),
+                'last_seen': details.get('last_seen')
+            })
+        return ranked
+
+    def save(self, state_path: Optional[str] = None):
+        """Write the tracker state (atomically replacing the previous file)."""
+        path = Path(state_path) if state_path else self.state_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {'counter': self.counter.to_dict(), 'batches': self.batches}
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+
+def print_top(tracker: RiskTracker, n: int = 10):
+    """Print the ranked high-risk customers."""
+    counter = tracker.counter
+    print(f"Fraud events tracked: {counter.total} "
+          f"({len(counter)}/{counter.capacity} customers monitored, max error {counter.max_error})")
+    print(f"\n{'rank':<6}{'customer':<12}{'events':>8}{'error':>7}  {'by type':<26}stations")
+    print("-" * 72)
+    for row in tracker.top(n):
+        by_event = ' '.join(f"{k}:{v}" for k, v in row['by_event'].items())
+        print(f"{row['rank']:<6}{row['customer_id']:<12}{row['fraud_events']:>8}{row['error']:>7}  "
+              f"{by_event:<26}{','.join(row['stations'])}")
+
+
+def main():
+    """Update and query a risk tracker from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Track high-risk customers from fraud events')
+    parser.add_argument('--state', required=True, help='Tracker state file (JSON)')
+    parser.add_argument('--update', nargs='*', default=[], metavar='EVENTS_FILE',
+                        help='events.jsonl files to feed into the tracker')
+    parser.add_argument('--capacity', type=int, default=1000,
+                        help='Customers monitored at once for a new tracker (default: 1000)')
+    parser.add_argument('--top', type=int, default=10, help='Number of customers to show (default: 10)')
+
+    args = parser.parse_args()
+
+    tracker = RiskTracker(args.capacity, args.state)
+    for events_file in args.update:
+        counted = tracker.update_from_file(events_file)
+        print(f"  [OK] {events_file}: {counted} fraud events counted"
+              + ("" if counted else " (none new)"))
+    if args.update:
+        tracker.save()
+    print_top(tracker, args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,11 +11,25 @@ Date: October 2025
 
 import csv
 import json
+import mmap
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Iterator, Optional, Sequence
 from datetime import datetime, timedelta
 
 
+# Parsed input files keyed by (resolved path, cache key), reused while unchanged
+_FILE_CACHE: 'OrderedDict[tuple, tuple]' = OrderedDict()
+_FILE_CACHE_LOCK = threading.Lock()
+
+# Cached files kept; a detection run loads 7, so this covers the last few data folders
+MAX_CACHED_FILES = 28
+
+_JSON_DECODER = json.JSONDecoder()
+
+
 def load_products_catalog(csv_path: str) -> Dict[str, Dict]:
     """
     Load products catalog from CSV file.
@@ -84,23 +98,117 @@ def load_customers_data(csv_path: str) -> Dict[str, Dict]:
     return customers
 
 
-def load_jsonl_file(file_path: str) -> List[Dict]:
+def scan_jsonl(file_path: str, prefilter: Optional[Sequence[bytes]] = None) -> Iterator[Any]:
+    """
+    Parse a JSONL file straight from a memory map.
+    
+    Newlines are located in the mapped bytes, so the file is never read
+    into line strings that are then stripped. Each kept line is decoded
+    once and handed to the JSON decoder (json.loads would decode bytes
+    itself, and measured slower). With a prefilter, lines containing none
+    of the given byte strings are skipped before any copy or decoding;
+    the check is a plain substring match, so callers needing an exact
+    field match should still check the parsed record.
+    
+    Args:
+        file_path: Path to JSONL file
+        prefilter: Byte strings of which a line must contain at least one
+        
+    Returns:
+        Iterator of parsed JSON objects
+    """
+    decode = _JSON_DECODER.decode
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            find = mapped.find
+            start = 0
+            while start < size:
+                end = find(b'\n', start)
+                if end < 0:
+                    end = size
+                if end > start and (prefilter is None
+                                    or any(find(needle, start, end) >= 0 for needle in prefilter)):
+                    line = mapped[start:end].decode('utf-8')
+                    if not line.isspace():
+                        yield decode(line)
+                start = end + 1
+
+
+def field_prefilter(field: str, values: Sequence[str]) -> List[bytes]:
+    """
+    Prefilter byte strings matching "field": "value" pairs.
+    
+    Both the default json.dumps spacing and compact separators are covered.
+    
+    Args:
+        field: JSON key, e.g. 'station_id' or 'dataset'
+        values: Accepted string values
+        
+    Returns:
+        Byte strings for scan_jsonl's prefilter
+    """
+    needles = []
+    for value in values:
+        encoded = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        key = json.dumps(field, ensure_ascii=False).encode('utf-8')
+        needles += [key + b': ' + encoded, key + b':' + encoded]
+    return needles
+
+
+def load_jsonl_file(file_path: str, prefilter: Optional[Sequence[bytes]] = None) -> List[Dict]:
     """
     Load data from JSONL (JSON Lines) file.
     
     Args:
         file_path: Path to JSONL file
+        prefilter: Optional byte strings a line must contain one of (see scan_jsonl)
         
     Returns:
         List of parsed JSON objects
     """
-    data = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                data.append(json.loads(line))
-    return data
+    return list(scan_jsonl(file_path, prefilter))
+
+
+def load_cached(file_path: str, loader: Callable[[str], Any],
+                key: Optional[str] = None) -> Any:
+    """
+    Load a file through a loader, reusing the previous result while the file is unchanged.
+    
+    The cache is process-wide and validated against the file's modification
+    time and size, so long-running processes (such as the dashboard) only
+    re-parse inputs that actually changed between detection runs. Only the
+    MAX_CACHED_FILES most recently used files are kept. Cached values are
+    shared between callers and must be treated as read-only.
+    
+    Args:
+        file_path: Path to the input file
+        loader: Function that parses the file and returns its contents
+        key: Distinguishes different loaders of the same file (defaults to loader name)
+        
+    Returns:
+        Parsed file contents
+    """
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cache_key = (str(path), key or getattr(loader, '__qualname__', repr(loader)))
+    
+    with _FILE_CACHE_LOCK:
+        entry = _FILE_CACHE.get(cache_key)
+        if entry is not None and entry[0] == signature:
+            _FILE_CACHE.move_to_end(cache_key)
+            return entry[1]
+    
+    value = loader(str(path))
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE[cache_key] = (signature, value)
+        _FILE_CACHE.move_to_end(cache_key)
+        while len(_FILE_CACHE) > MAX_CACHED_FILES:
+            _FILE_CACHE.popitem(last=False)
+    return value
 
 
 def parse_timestamp(timestamp_str: str) -> datetime:
@@ -0,0 +1,234 @@
+"""
+Ingestion-Stage Stream Reduction
+=================================
+
+Collapses redundant sensor records before they reach the detectors.
+
+RFIDDeduplicator: an RFID reader reports the same EPC many times per
+second while a tag is in its field. Reads of the same (station, EPC)
+that follow each other within a window are merged into one RFIDReading
+with first seen (timestamp), last seen and a read count. Open records
+are kept in last-seen order and closed as soon as the stream moves past
+their window, with a hard cap on open records, so memory stays bounded.
+
+Reads without an EPC are station heartbeats used for crash detection
+and pass through unchanged.
+
+VisionBurstAggregator: the vision system reports a prediction for every
+frame, so one item at the scanner yields a burst of predictions with
+slightly different accuracies. Predictions of the same (station,
+product) that follow each other within a window become one
+ProductRecognition whose accuracy is the burst maximum, with the mean
+accuracy, last seen time and frame count alongside.
+
+Author: Team 01
+Date: October 2025
+"""
+
+import sys
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Hashable, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_models import RFIDReading, ProductRecognition
+
+
+def _epoch_seconds(timestamp: str) -> float:
+    """Seconds since the epoch for an ISO timestamp."""
+    return datetime.fromisoformat(timestamp).timestamp()
+
+
+class _BurstCollapser:
+    """
+    Sliding-window merging of repeated records that share a key.
+
+    Input must be in timestamp order (as files and live streams are).
+    Subclasses define the key and how a record is opened and extended.
+
+    Records are returned as (sequence, record) pairs, where sequence is
+    the arrival index of the record's first input, so callers can keep
+    arrival order among records with equal timestamps.
+    """
+
+    def __init__(self, window_seconds: float, max_open: int):
+        """
+        Initialize the collapser.
+
+        Args:
+            window_seconds: Records at most this far apart are merged
+            max_open: Maximum records held open; the oldest is closed beyond this
+        """
+        self.window_seconds = window_seconds
+        self.max_open = max_open
+        self.reads_in = 0
+        self.records_out = 0
+        # key -> [record, last seen in epoch seconds, sequence], in last-seen order
+        self._open: 'OrderedDict[Hashable, list]' = OrderedDict()
+
+    def _key(self, record) -> Optional[Hashable]:
+        """Merge key of a record; None passes the record through."""
+        raise NotImplementedError
+
+    def _open_record(self, record):
+        """Copy of a record that starts a new burst."""
+        raise NotImplementedError
+
+    def _extend(self, opened, record):
+        """Merge a repeated record into an open one."""
+        raise NotImplementedError
+
+    def add(self, record) -> List[Tuple[int, object]]:
+        """
+        Add one record.
+
+        Args:
+            record: Record in timestamp order
+
+        Returns:
+            (sequence, record) pairs closed by this one (possibly including itself)
+        """
+        sequence = self.reads_in
+        self.reads_in += 1
+        key = self._key(record)
+        if key is None:
+            self.records_out += 1
+            return [(sequence, record)]
+
+        now = _epoch_seconds(record.timestamp)
+        closed = self._close_before(now - self.window_seconds)
+
+        entry = self._open.get(key)
+        if entry is not None:
+            self._extend(entry[0], record)
+            entry[1] = now
+            self._open.move_to_end(key)
+        else:
+            # Copy so records shared with a file cache are never mutated
+            self._open[key] = [self._open_record(record), now, sequence]
+            if len(self._open) > self.max_open:
+                opened, _, first = self._open.popitem(last=False)[1]
+                closed.append((first, opened))
+                self.records_out += 1
+        return closed
+
+    def _close_before(self, cutoff: float) -> List[Tuple[int, object]]:
+        """Close open records last seen before a cutoff time."""
+        closed = []
+        while self._open:
+            key, (record, last_seen, sequence) = next(iter(self._open.items()))
+            if last_seen >= cutoff:
+                break
+            del self._open[key]
+            closed.append((sequence, record))
+        self.records_out += len(closed)
+        return closed
+
+    def open_records(self) -> List[Tuple[int, object]]:
+        """(sequence, record) pairs still open (may receive more input)."""
+        return [(entry[2], entry[0]) for entry in self._open.values()]
+
+    def flush(self) -> List[Tuple[int, object]]:
+        """Close and return all open (sequence, record) pairs."""
+        closed = self.open_records()
+        self._open.clear()
+        self.records_out += len(closed)
+        return closed
+
+    @property
+    def reduction(self) -> float:
+        """Records in per record out so far."""
+        return self.reads_in / self.records_out if self.records_out else 1.0
+
+
+class RFIDDeduplicator(_BurstCollapser):
+    """Collapses repeated reads of the same tag at a station."""
+
+    def __init__(self, window_seconds: float = 5.0, max_open: int = 100000):
+        super().__init__(window_seconds, max_open)
+
+    def _key(self, reading: RFIDReading) -> Optional[Tuple[str, str]]:
+        return (reading.station_id, reading.epc) if reading.epc else None
+
+    def _open_record(self, reading: RFIDReading) -> RFIDReading:
+        return replace(reading, last_seen=reading.timestamp, read_count=1)
+
+    def _extend(self, record: RFIDReading, reading: RFIDReading):
+        record.last_seen = reading.timestamp
+        record.read_count += 1
+
+
+class VisionBurstAggregator(_BurstCollapser):
+    """
+    Aggregates bursts of per-frame predictions of one product at a station.
+
+    The aggregated accuracy is the burst maximum; mean_accuracy holds the mean.
+    """
+
+    def __init__(self, window_seconds: float = 2.0, max_open: int = 100000):
+        super().__init__(window_seconds, max_open)
+
+    def _key(self, prediction: ProductRecognition) -> Optional[Tuple[str, str]]:
+        if not prediction.predicted_product:
+            return None
+        return prediction.station_id, prediction.predicted_product
+
+    def _open_record(self, prediction: ProductRecognition) -> ProductRecognition:
+        return replace(prediction, last_seen=prediction.timestamp, frame_count=1,
+                       mean_accuracy=prediction.accuracy)
+
+    def _extend(self, record: ProductRecognition, prediction: ProductRecognition):
+        total = record.mean_accuracy * record.frame_count + prediction.accuracy
+        record.frame_count += 1
+        record.mean_accuracy = round(total / record.frame_count, 4)
+        record.accuracy = max(record.accuracy, prediction.accuracy)
+        record.last_seen = prediction.timestamp
+
+
+def in_arrival_order(pairs: Iterable[Tuple[int, object]]) -> list:
+    """Records from (sequence, record) pairs sorted by timestamp, then arrival."""
+    return [record for _, record in sorted(pairs, key=lambda p: (p[1].timestamp, p[0]))]
+
+
+def _collapse(collapser: _BurstCollapser, records: Iterable) -> list:
+    """Run records through a collapser and sort the result by first-seen time."""
+    collapsed = []
+    for record in records:
+        collapsed.extend(collapser.add(record))
+    collapsed.extend(collapser.flush())
+    return in_arrival_order(collapsed)
+
+
+def deduplicate_rfid(readings: Iterable[RFIDReading], window_seconds: float = 5.0,
+                     max_open: int = 100000) -> List[RFIDReading]:
+    """
+    Collapse repeated reads in a list of RFID readings.
+
+    Args:
+        readings: RFID readings in timestamp order
+        window_seconds: Reads of the same (station, EPC) at most this far apart are merged
+        max_open: Maximum records held open at once
+
+    Returns:
+        Collapsed readings sorted by first-seen timestamp
+    """
+    return _collapse(RFIDDeduplicator(window_seconds, max_open), readings)
+
+
+def aggregate_vision_bursts(predictions: Iterable[ProductRecognition], window_seconds: float = 2.0,
+                            max_open: int = 100000) -> List[ProductRecognition]:
+    """
+    Merge bursts of per-frame vision predictions.
+
+    Args:
+        predictions: Product recognitions in timestamp order
+        window_seconds: Predictions of the same (station, product) at most this far apart are merged
+        max_open: Maximum bursts held open at once
+
+    Returns:
+        One prediction per burst, sorted by first-seen timestamp
+    """
+    return _collapse(VisionBurstAggregator(window_seconds, max_open), predictions)
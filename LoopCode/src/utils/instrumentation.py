@@ -0,0 +1,212 @@
+"""
+Run Instrumentation for Project Sentinel
+=========================================
+
+Records wall time, CPU time, records in/out and (optionally) the
+tracemalloc peak of every pipeline stage and detector call. A recorder
+is only created when instrumentation is enabled, so a disabled run pays
+a single None check per step.
+
+Author: Team 01
+Date: October 2025
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# File name of the run report written next to events.jsonl
+RUN_REPORT_NAME = 'run_report.json'
+
+
+def count_records(value: Any) -> int:
+    """
+    Number of records in a detector input or output.
+
+    Args:
+        value: List, dictionary, data model instance or None
+
+    Returns:
+        Length of collections, 1 for single objects, 0 for None
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (list, tuple, dict, set)):
+        return len(value)
+    return 1
+
+
+class Span:
+    """Measurements of one stage or detector call"""
+
+    def __init__(self, stage: str, name: Optional[str], records_in: Optional[int]):
+        self.stage = stage
+        self.name = name
+        self.records_in = records_in
+        self.records_out: Optional[int] = None
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_bytes: Optional[int] = None
+        self.children: List['Span'] = []
+        self._traced_start = 0
+        self._traced_peak = 0
+
+    def to_dict(self) -> Dict:
+        """Convert span to a JSON-serializable dictionary."""
+        record = {
+            'stage': self.stage,
+            'name': self.name,
+            'records_in': self.records_in,
+            'records_out': self.records_out,
+            'wall_seconds': round(self.wall_seconds, 6),
+            'cpu_seconds': round(self.cpu_seconds, 6),
+            'peak_bytes': self.peak_bytes
+        }
+        if self.children:
+            record['calls'] = [child.to_dict() for child in self.children]
+        return record
+
+
+class RunRecorder:
+    """
+    Collects spans for one detection run.
+
+    Stages contain the detector calls (or file loads) made while they
+    are open. Stage record counts default to the sum of their calls.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        Initialize the recorder.
+
+        Args:
+            trace_memory: Record tracemalloc peaks (adds noticeable overhead)
+        """
+        self.trace_memory = trace_memory
+        self.stages: List[Span] = []
+        self.started_at: Optional[str] = None
+        self.wall_seconds = 0.0
+        self._run_start: Optional[float] = None
+        self._open: List[Span] = []
+        self._started_tracing = False
+
+    def reset(self):
+        """Forget all recorded spans."""
+        self.stages = []
+        self.started_at = None
+        self.wall_seconds = 0.0
+        self._run_start = None
+        self._open = []
+
+    def _update_peaks(self):
+        """Propagate the current traced peak to all open spans."""
+        _, peak = tracemalloc.get_traced_memory()
+        for span in self._open:
+            span._traced_peak = max(span._traced_peak, peak)
+
+    @contextmanager
+    def span(self, stage: str, name: Optional[str] = None,
+             records_in: Optional[int] = None):
+        """
+        Measure a stage (name=None) or a call within the open stage.
+
+        The yielded span's records_out may be set by the caller.
+        """
+        if self._run_start is None:
+            self._run_start = time.perf_counter()
+            self.started_at = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+            if self.trace_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+
+        span = Span(stage, name, records_in)
+        if self._open:
+            self._open[-1].children.append(span)
+        else:
+            self.stages.append(span)
+
+        if self.trace_memory:
+            self._update_peaks()
+            tracemalloc.reset_peak()
+            span._traced_start, span._traced_peak = tracemalloc.get_traced_memory()
+        self._open.append(span)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield span
+        finally:
+            span.wall_seconds = time.perf_counter() - wall_start
+            span.cpu_seconds = time.process_time() - cpu_start
+            if self.trace_memory:
+                self._update_peaks()
+                span.peak_bytes = span._traced_peak - span._traced_start
+            self._open.pop()
+            if span.children:
+                if span.records_in is None:
+                    span.records_in = sum(c.records_in or 0 for c in span.children)
+                if span.records_out is None:
+                    span.records_out = sum(c.records_out or 0 for c in span.children)
+            self.wall_seconds = time.perf_counter() - self._run_start
+
+    def stop(self):
+        """Stop memory tracing if this recorder started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def to_dict(self) -> Dict:
+        """Convert the run to a JSON-serializable report."""
+        return {
+            'started_at': self.started_at,
+            'wall_seconds': round(self.wall_seconds, 6),
+            'trace_memory': self.trace_memory,
+            'stages': [stage.to_dict() for stage in self.stages]
+        }
+
+    def save(self, report_path: str):
+        """
+        Write the run report as JSON.
+
+        Args:
+            report_path: Path of the report file
+        """
+        path = Path(report_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def format_table(self) -> str:
+        """
+        Format the run as a human-readable table.
+
+        Returns:
+            Multi-line table with one row per stage and call
+        """
+        lines = [
+            f"{'stage / call':<34}{'in':>10}{'out':>8}{'wall s':>10}{'cpu s':>10}{'peak MB':>10}",
+            "-" * 82
+        ]
+        rows = []
+        for stage in self.stages:
+            rows.append((stage.stage, stage))
+            rows.extend((f"  {child.name}", child) for child in stage.children)
+        for label, span in rows:
+            peak = f"{span.peak_bytes / 1e6:.2f}" if span.peak_bytes is not None else '-'
+            lines.append(
+                f"{label:<34}{span.records_in or 0:>10,}{span.records_out or 0:>8,}"
+                f"{span.wall_seconds:>10.4f}{span.cpu_seconds:>10.4f}{peak:>10}"
+            )
+        lines.append("-" * 82)
+        lines.append(f"{'total':<52}{self.wall_seconds:>10.4f}")
+        return "\n".join(lines)
+
+
+def report_path_for(events_path: str) -> str:
+    """Path of the run report that belongs to an events.jsonl file."""
+    return str(Path(events_path).parent / RUN_REPORT_NAME)
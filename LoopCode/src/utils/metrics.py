@@ -0,0 +1,282 @@
+"""
+Operational Metrics for Project Sentinel
+=========================================
+
+Prometheus text-format metrics served from a stdlib http.server thread.
+
+Hot-path counters are owned by a single thread (CounterBatch) and only
+merged into the shared registry every few thousand increments, so
+ingestion never takes a lock per record. Gauges such as queue depth,
+per-station lag and memory are read through callbacks when /metrics is
+scraped, so they cost nothing between scrapes.
+
+Author: Team 01
+Date: October 2025
+"""
+
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Default latency buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Format label pairs as {name="value",...}."""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, safe to observe from any thread"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = sorted(buckets)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple, List] = {}
+
+    def observe(self, value: float, labels: Tuple[Tuple[str, str], ...] = ()):
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value
+            labels: Label pairs identifying the series
+        """
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts, then sum and count
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def samples(self, name: str) -> List[str]:
+        """Render the histogram's sample lines."""
+        lines = []
+        with self._lock:
+            snapshot = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        for labels, counts, total, count in sorted(snapshot):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = labels + (('le', _format_value(bound)),)
+                lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Collection of counters, callback gauges and histograms.
+
+    Metrics are rendered in registration order.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        self._gauges: Dict[str, Callable[[], Dict[Tuple, float]]] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def counter(self, name: str, help_text: str):
+        """Register a counter."""
+        with self._lock:
+            self._meta.setdefault(name, ('counter', help_text))
+            self._counters.setdefault(name, defaultdict(float))
+
+    def add_counts(self, name: str, counts: Dict[Tuple, float]):
+        """
+        Merge a batch of counter increments.
+
+        Args:
+            name: Registered counter name
+            counts: Label pairs -> increment
+        """
+        with self._lock:
+            series = self._counters[name]
+            for labels, amount in counts.items():
+                series[labels] += amount
+
+    def gauge(self, name: str, help_text: str, read: Callable[[], Dict[Tuple, float]]):
+        """
+        Register a gauge whose values are read at scrape time.
+
+        Args:
+            name: Metric name
+            help_text: HELP text
+            read: Returns label pairs -> value
+        """
+        with self._lock:
+            self._meta[name] = ('gauge', help_text)
+            self._gauges[name] = read
+
+    def histogram(self, name: str, help_text: str,
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        """Register (or get) a histogram."""
+        with self._lock:
+            if name not in self._histograms:
+                self._meta[name] = ('histogram', help_text)
+                self._histograms[name] = Histogram(buckets)
+            return self._histograms[name]
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            meta = list(self._meta.items())
+            counters = {name: dict(series) for name, series in self._counters.items()}
+
+        lines = []
+        for name, (kind, help_text) in meta:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == 'counter':
+                for labels, value in sorted(counters[name].items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            elif kind == 'gauge':
+                try:
+                    values = self._gauges[name]()
+                except Exception:
+                    values = {}
+                for labels, value in sorted(values.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            else:
+                lines.extend(self._histograms[name].samples(name))
+        return '\n'.join(lines) + '\n'
+
+
+class CounterBatch:
+    """
+    Counter increments owned by one thread and merged in batches.
+
+    Increments touch only a plain dictionary; the registry lock is taken
+    once per flush_every increments (and on explicit flush()).
+    """
+
+    def __init__(self, registry: MetricsRegistry, name: str, help_text: str,
+                 label: str, flush_every: int = 5000):
+        """
+        Initialize the batch and register its counter.
+
+        Args:
+            registry: Registry to merge into
+            name: Counter name
+            help_text: HELP text
+            label: Name of the single label the counter is split by
+            flush_every: Increments between merges
+        """
+        self.registry = registry
+        self.name = name
+        self.label = label
+        self.flush_every = flush_every
+        self._pending: Dict[str, float] = defaultdict(float)
+        self._updates = 0
+        registry.counter(name, help_text)
+
+    def inc(self, label_value: str, amount: float = 1):
+        """Increment the counter for a label value."""
+        self._pending[label_value] += amount
+        self._updates += 1
+        if self._updates >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Merge pending increments into the registry."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, defaultdict(float)
+        self._updates = 0
+        self.registry.add_counts(
+            self.name, {((self.label, value),): amount for value, amount in pending.items()})
+
+
+def resident_memory_bytes() -> Dict[Tuple, float]:
+    """Current resident set size of this process (empty if unavailable)."""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return {(): int(line.split()[1]) * 1024}
+    except OSError:
+        pass
+    return {}
+
+
+class MetricsServer:
+    """Serves a registry at /metrics from a background thread"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = '127.0.0.1', port: int = 9108):
+        """
+        Initialize the server (not started).
+
+        Args:
+            registry: Registry to expose
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split('?')[0] != '/metrics':
+                    handler.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                handler.send_response(200)
+                handler.send_header('Content-Type', CONTENT_TYPE)
+                handler.send_header('Content-Length', str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                # Scrapes are frequent; keep the console quiet
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Bound (host, port)."""
+        return self._server.server_address[:2]
+
+    def start(self):
+        """Start serving on a daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='sentinel-metrics', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
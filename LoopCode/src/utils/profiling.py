@@ -0,0 +1,183 @@
+"""
+Run Profiling for Project Sentinel
+===================================
+
+Profiles a whole detection run with cProfile, keeping a separate
+profile for each detector call (section), and samples the running
+thread's call stack at a fixed interval to produce collapsed-stack
+output that flamegraph.pl, speedscope and similar tools can read.
+
+Output files in the profile directory:
+    run.pstats              Whole run (all sections merged)
+    run.collapsed           Sampled stacks, one "frame;frame;... count" per line
+    sections/<name>.pstats  One cProfile per detector section
+
+Author: Team 01
+Date: October 2025
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Root frame for samples taken outside any section
+MAIN_SECTION = 'main'
+
+
+class RunProfiler:
+    """
+    cProfile plus stack-sampling profiler for one detection run.
+
+    Sections switch cProfile to a per-section profile while they are open
+    and prefix sampled stacks with the section name, so each detector
+    shows up as its own subtree in a flamegraph.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        """
+        Initialize the profiler.
+
+        Args:
+            interval: Seconds between stack samples
+        """
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._main = cProfile.Profile()
+        self._sections: Dict[str, cProfile.Profile] = {}
+        self._section: Optional[str] = None
+        self._running = False
+        self._target_thread: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+
+    def start(self):
+        """Start profiling the calling thread."""
+        if self._running:
+            return
+        self._running = True
+        self._target_thread = threading.get_ident()
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample_loop,
+                                         name='sentinel-profiler', daemon=True)
+        self._sampler.start()
+        self._main.enable()
+
+    def stop(self):
+        """Stop profiling."""
+        if not self._running:
+            return
+        self._main.disable()
+        self._running = False
+        self._stop_sampling.set()
+        self._sampler.join()
+
+    @contextmanager
+    def section(self, name: str):
+        """
+        Profile a block as a named section.
+
+        Nested sections are folded into the outer one.
+        """
+        if not self._running or self._section is not None:
+            yield
+            return
+
+        profile = self._sections.setdefault(name, cProfile.Profile())
+        self._main.disable()
+        self._section = name
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._section = None
+            self._main.enable()
+
+    def _sample_loop(self):
+        """Sample the target thread's stack until stopped."""
+        while not self._stop_sampling.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+                frame = frame.f_back
+            stack.append(self._section or MAIN_SECTION)
+            self.samples[';'.join(reversed(stack))] += 1
+
+    def stats(self, section: Optional[str] = None) -> pstats.Stats:
+        """
+        Get cProfile statistics.
+
+        Args:
+            section: Section name, or None for the whole run
+
+        Returns:
+            pstats.Stats for the section or the merged run
+        """
+        if section is not None:
+            return pstats.Stats(self._sections[section], stream=io.StringIO())
+        stats = pstats.Stats(self._main, stream=io.StringIO())
+        for profile in self._sections.values():
+            stats.add(profile)
+        return stats
+
+    @property
+    def section_names(self) -> List[str]:
+        """Names of the profiled sections in first-seen order."""
+        return list(self._sections)
+
+    def save(self, profile_dir: str) -> Dict[str, str]:
+        """
+        Write pstats and collapsed-stack files.
+
+        Args:
+            profile_dir: Directory for the profile files
+
+        Returns:
+            Dictionary of output kind -> file path
+        """
+        directory = Path(profile_dir)
+        sections_dir = directory / 'sections'
+        sections_dir.mkdir(parents=True, exist_ok=True)
+
+        run_stats = directory / 'run.pstats'
+        self.stats().dump_stats(str(run_stats))
+        for name in self._sections:
+            self.stats(name).dump_stats(str(sections_dir / f"{name}.pstats"))
+
+        collapsed = directory / 'run.collapsed'
+        with open(collapsed, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+
+        return {
+            'pstats': str(run_stats),
+            'collapsed': str(collapsed),
+            'sections': str(sections_dir)
+        }
+
+    def format_summary(self, limit: int = 15) -> str:
+        """
+        Format the functions with the highest cumulative time.
+
+        Args:
+            limit: Number of functions to list
+
+        Returns:
+            pstats text output
+        """
+        stream = io.StringIO()
+        stats = self.stats()
+        stats.stream = stream
+        stats.sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
@@ -0,0 +1,401 @@
+"""
+One-Pass Threshold Sweep
+========================
+
+Evaluates a grid of values for detector thresholds without rerunning the
+pipeline once per value. The input is loaded once and every candidate
+record gets its score once (weight deviation, vision accuracy, queue
+length, dwell time, inventory difference, activity gap). For a rule like
+"flag when score > t", the events at any threshold are the candidates
+past t in sorted score order, so each grid point is a binary search.
+
+With ground-truth labels (the data generator's ground_truth.jsonl), each
+candidate is matched to a label by its event key (timestamp, event_id,
+station or SKU), and every grid point also gets true positives,
+precision and recall.
+
+One parameter is swept at a time. The detector's other thresholds keep
+their configured store-wide values; station overrides are not applied.
+
+Usage:
+    python utils/threshold_sweep.py --data-dir ../../benchmarks/data/scale_1
+    python utils/threshold_sweep.py --data-dir data/input --labels truth.jsonl \\
+        --grid weight_discrepancies.tolerance_percent=5:30:2.5
+
+Author: Team 01
+Date: October 2025
+"""
+
+import bisect
+import contextlib
+import io
+import json
+import math
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_models import DetectedEvent
+from algorithms.vectorized import unmatched_predictions, switched_pairs, activity_gaps
+from utils.event_diff import match_key
+from utils.thresholds import ThresholdRules
+
+# Comparison that turns a score into an event
+ABOVE = '>'
+AT_LEAST = '>='
+AT_MOST = '<='
+
+
+class ThresholdSweep:
+    """
+    Scored candidate events of one threshold, answering any set of cut points.
+    """
+
+    def __init__(self, parameter: str, event_id: str, rule: str, base_value: float,
+                 candidates: List[Tuple[float, DetectedEvent]]):
+        """
+        Sort the candidates by score.
+
+        Args:
+            parameter: Swept threshold as detector.parameter
+            event_id: Event type the detector emits
+            rule: ABOVE, AT_LEAST or AT_MOST (how a score compares to the threshold)
+            base_value: Configured value of the threshold
+            candidates: (score, event) for every record that can become an event
+        """
+        self.parameter = parameter
+        self.event_id = event_id
+        self.rule = rule
+        self.base_value = base_value
+        candidates = sorted(candidates, key=lambda c: c[0])
+        self.scores = [score for score, _ in candidates]
+        self.events = [event for _, event in candidates]
+        self.labels: Optional[int] = None
+        # Prefix sums of true positives in score order
+        self._tp_prefix: Optional[List[int]] = None
+
+    def label(self, label_keys: Counter):
+        """
+        Mark candidates that match a ground-truth event.
+
+        A key with n labels matches at most n candidates: the first n in the
+        order they are flagged as the threshold loosens.
+
+        Args:
+            label_keys: match_key -> number of ground-truth events with that key
+        """
+        self.labels = sum(count for key, count in label_keys.items()
+                          if key.split('\t')[1] == self.event_id)
+        positions = range(len(self.events))
+        if self.rule != AT_MOST:
+            positions = reversed(positions)
+        remaining = dict(label_keys)
+        matched = [0] * len(self.events)
+        for i in positions:
+            event = self.events[i]
+            key = match_key({'timestamp': event.timestamp, 'event_id': event.event_id,
+                             'event_data': event.event_data})
+            if remaining.get(key, 0) > 0:
+                remaining[key] -= 1
+                matched[i] = 1
+        self._tp_prefix = [0]
+        for flag in matched:
+            self._tp_prefix.append(self._tp_prefix[-1] + flag)
+
+    def _selected(self, threshold: float) -> Tuple[int, int]:
+        """[start, end) of the sorted candidates flagged at a threshold."""
+        if self.rule == ABOVE:
+            return bisect.bisect_right(self.scores, threshold), len(self.scores)
+        if self.rule == AT_LEAST:
+            return bisect.bisect_left(self.scores, threshold), len(self.scores)
+        return 0, bisect.bisect_right(self.scores, threshold)
+
+    def evaluate(self, thresholds: Sequence[float]) -> List[Dict]:
+        """
+        Event counts (and quality when labeled) at each threshold.
+
+        Returns:
+            One dictionary per threshold with threshold, events and, when
+            labeled, true_positives, precision, recall and f1
+        """
+        rows = []
+        for threshold in thresholds:
+            start, end = self._selected(threshold)
+            row = {'threshold': threshold, 'events': end - start}
+            if self._tp_prefix is not None:
+                tp = self._tp_prefix[end] - self._tp_prefix[start]
+                precision = tp / row['events'] if row['events'] else 0.0
+                recall = tp / self.labels if self.labels else 0.0
+                f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+                row.update(true_positives=tp, precision=round(precision, 4),
+                           recall=round(recall, 4), f1=round(f1, 4))
+            rows.append(row)
+        return rows
+
+
+def _weight_percent(transaction, products_catalog: Dict[str, Dict]) -> Optional[float]:
+    """Percent deviation from the catalog weight, or None if it cannot be checked."""
+    product = products_catalog.get(transaction.sku)
+    if product is None or not product['weight'] > 0:
+        return None
+    return abs(transaction.weight_g - product['weight']) / product['weight'] * 100
+
+
+def _weight_discrepancy_candidates(detector, values: Dict) -> List[Tuple[float, DetectedEvent]]:
+    candidates = []
+    for transaction in detector.pos_transactions:
+        percent = _weight_percent(transaction, detector.products_catalog)
+        if percent is not None:
+            candidates.append((percent, DetectedEvent.create_weight_discrepancy(
+                transaction.timestamp, transaction.station_id, transaction.customer_id,
+                transaction.sku, detector.products_catalog[transaction.sku]['weight'],
+                transaction.weight_g)))
+    return candidates
+
+
+def _success_candidates(detector, values: Dict) -> List[Tuple[float, DetectedEvent]]:
+    rfid_skus = {(reading.station_id, reading.sku) for reading in detector.rfid_readings}
+    candidates = []
+    for transaction in detector.pos_transactions:
+        if (transaction.status.lower() != 'success'
+                or (transaction.station_id, transaction.sku) not in rfid_skus):
+            continue
+        percent = _weight_percent(transaction, detector.products_catalog)
+        candidates.append((-math.inf if percent is None else percent,
+                           DetectedEvent.create_success_operation(
+                               transaction.timestamp, transaction.station_id,
+                               transaction.customer_id, transaction.sku)))
+    return candidates
+
+
+def _vision_candidates(detector, values: Dict) -> List[Tuple[float, DetectedEvent]]:
+    predictions = detector.product_recognitions
+    rows = unmatched_predictions(predictions, detector.pos_transactions,
+                                 np.arange(len(predictions)),
+                                 values['window_before_seconds'], values['window_after_seconds'])
+    return [(predictions[i].accuracy, DetectedEvent.create_scanner_avoidance(
+        predictions[i].timestamp, predictions[i].station_id, "UNKNOWN",
+        predictions[i].predicted_product)) for i in rows]
+
+
+def _barcode_candidates(detector, values: Dict) -> List[Tuple[float, DetectedEvent]]:
+    predictions, transactions = detector.product_recognitions, detector.pos_transactions
+    candidates = []
+    for i, j in zip(*switched_pairs(transactions, predictions)):
+        transaction = transactions[j]
+        candidates.append((predictions[i].accuracy, DetectedEvent.create_barcode_switching(
+            transaction.timestamp, transaction.station_id, transaction.customer_id,
+            predictions[i].predicted_product, transaction.sku)))
+    return candidates
+
+
+def _long_queue_candidates(detector, values: Dict) -> List[Tuple[float, DetectedEvent]]:
+    return [(q.customer_count, DetectedEvent.create_long_queue(q.timestamp, q.station_id, q.customer_count))
+            for q in detector.queue_monitoring]
+
+
+def _long_wait_candidates(detector, values: Dict) -> List[Tuple[float, DetectedEvent]]:
+    return [(q.average_dwell_time, DetectedEvent.create_long_wait_time(
+        q.timestamp, q.station_id, q.average_dwell_time)) for q in detector.queue_monitoring]
+
+
+def _staffing_candidates(score: Callable, detector, values: Dict) -> List[Tuple[float, DetectedEvent]]:
+    customer_threshold = values['customer_threshold']
+    return [(score(q, values), DetectedEvent.create_staffing_needs(
+        q.timestamp, q.station_id,
+        "Manager" if q.customer_count >= customer_threshold * 1.5 else "Cashier"))
+        for q in detector.queue_monitoring]
+
+
+def _inventory_candidates(detector, values: Dict) -> List[Tuple[float, DetectedEvent]]:
+    snapshots = detector.inventory_snapshots
+    if len(snapshots) < 2:
+        return []
+    initial, final = snapshots[0].inventory, snapshots[-1]
+    sold = Counter(transaction.sku for transaction in detector.pos_transactions)
+    candidates = []
+    for sku, quantity in initial.items():
+        expected = max(quantity - sold[sku], 0) if sold[sku] else quantity
+        actual = final.inventory.get(sku, 0)
+        candidates.append((abs(expected - actual), DetectedEvent.create_inventory_discrepancy(
+            final.timestamp, sku, expected, actual)))
+    return candidates
+
+
+def _crash_candidates(detector, values: Dict) -> List[Tuple[float, DetectedEvent]]:
+    timestamps, stations, gaps = activity_gaps(detector.build_station_timeline())
+    return [(gaps[i], DetectedEvent.create_system_crash(timestamps[i], stations[i], int(gaps[i])))
+            for i in np.flatnonzero(np.trunc(gaps) >= values['min_crash_duration'])]
+
+
+# detector.parameter -> (event_id, rule, candidate builder)
+SWEEPABLE = {
+    'success_operations.weight_tolerance': ('E000', AT_MOST, _success_candidates),
+    'scanner_avoidance_vision.confidence_threshold': ('E001', AT_LEAST, _vision_candidates),
+    'barcode_switching.accuracy_threshold': ('E002', AT_LEAST, _barcode_candidates),
+    'weight_discrepancies.tolerance_percent': ('E003', ABOVE, _weight_discrepancy_candidates),
+    'system_crashes.min_gap_seconds': ('E004', AT_LEAST, _crash_candidates),
+    'long_queues.max_customers_threshold': ('E005', ABOVE, _long_queue_candidates),
+    'long_wait_times.max_wait_time_threshold': ('E006', ABOVE, _long_wait_candidates),
+    # The other staffing threshold flags a record regardless of the swept one
+    'staffing_needs.customer_threshold': ('E008', AT_LEAST, lambda detector, values: _staffing_candidates(
+        lambda q, v: q.customer_count if q.average_dwell_time < v['wait_time_threshold'] else math.inf,
+        detector, values)),
+    'staffing_needs.wait_time_threshold': ('E008', AT_LEAST, lambda detector, values: _staffing_candidates(
+        lambda q, v: q.average_dwell_time if q.customer_count < v['customer_threshold'] else math.inf,
+        detector, values)),
+    'inventory_discrepancies.tolerance': ('E007', ABOVE, _inventory_candidates)
+}
+
+# Grids swept when none is given: (start, stop, step), stop included
+DEFAULT_GRIDS = {
+    'success_operations.weight_tolerance': (5.0, 30.0, 2.5),
+    'scanner_avoidance_vision.confidence_threshold': (0.5, 0.95, 0.05),
+    'barcode_switching.accuracy_threshold': (0.5, 0.95, 0.05),
+    'weight_discrepancies.tolerance_percent': (2.5, 30.0, 2.5),
+    'system_crashes.min_gap_seconds': (30, 600, 30),
+    'long_queues.max_customers_threshold': (2, 10, 1),
+    'long_wait_times.max_wait_time_threshold': (120, 600, 30),
+    'staffing_needs.customer_threshold': (2, 10, 1),
+    'staffing_needs.wait_time_threshold': (120, 600, 30),
+    'inventory_discrepancies.tolerance': (0, 10, 1)
+}
+
+
+def grid_values(start: float, stop: float, step: float) -> List[float]:
+    """Values from start to stop (inclusive) in steps."""
+    if step <= 0:
+        raise ValueError(f"grid step must be positive, got {step}")
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    return [round(start + i * step, 10) for i in range(max(count, 0))]
+
+
+def parse_grid(spec: str) -> Tuple[str, List[float]]:
+    """
+    Parse 'detector.parameter=v1,v2,...' or 'detector.parameter=start:stop:step'.
+
+    Raises:
+        ValueError: On an unknown parameter or malformed values
+    """
+    parameter, _, values = spec.partition('=')
+    if parameter not in SWEEPABLE:
+        raise ValueError(f"cannot sweep {parameter!r} (expected one of {', '.join(SWEEPABLE)})")
+    try:
+        if ':' in values:
+            return parameter, grid_values(*(float(v) for v in values.split(':')))
+        return parameter, [float(v) for v in values.split(',') if v.strip()]
+    except (TypeError, ValueError):
+        raise ValueError(f"bad grid {spec!r} (expected v1,v2,... or start:stop:step)")
+
+
+def load_label_keys(labels_path: str) -> Counter:
+    """match_key counts of a ground-truth events file."""
+    with open(labels_path, 'r', encoding='utf-8') as f:
+        return Counter(match_key(json.loads(line)) for line in f if line.strip())
+
+
+def run_sweep(detector, grids: Dict[str, List[float]], rules: Optional[ThresholdRules] = None,
+              label_keys: Optional[Counter] = None) -> Dict[str, Dict]:
+    """
+    Sweep thresholds over a loaded EventDetector's data.
+
+    Args:
+        detector: EventDetector after load_data()
+        grids: detector.parameter -> threshold values
+        rules: Configured thresholds the other parameters keep (defaults if None)
+        label_keys: Ground-truth match_key counts (no quality metrics if None)
+
+    Returns:
+        detector.parameter -> {'event_id', 'base_value', 'candidates', 'labels', 'results'}
+    """
+    rules = rules or ThresholdRules()
+    report = {}
+    for parameter, thresholds in grids.items():
+        event_id, rule, build = SWEEPABLE[parameter]
+        name, param = parameter.split('.')
+        values = rules.values(name)
+        sweep = ThresholdSweep(parameter, event_id, rule, values[param], build(detector, values))
+        if label_keys is not None:
+            sweep.label(label_keys)
+        report[parameter] = {
+            'event_id': event_id,
+            'base_value': sweep.base_value,
+            'candidates': len(sweep.scores),
+            'labels': sweep.labels,
+            'results': sweep.evaluate(thresholds)
+        }
+    return report
+
+
+def print_report(report: Dict[str, Dict]):
+    """Print one table per swept parameter (* marks the configured value)."""
+    for parameter, sweep in report.items():
+        print(f"\n{parameter} ({sweep['event_id']}, {sweep['candidates']} candidates"
+              + (f", {sweep['labels']} labels)" if sweep['labels'] is not None else ")"))
+        labeled = sweep['labels'] is not None
+        header = f"  {'threshold':>10}{'events':>9}"
+        if labeled:
+            header += f"{'TP':>7}{'precision':>11}{'recall':>8}{'F1':>8}"
+        print(header)
+        for row in sweep['results']:
+            mark = '*' if row['threshold'] == sweep['base_value'] else ' '
+            line = f" {mark}{row['threshold']:>10g}{row['events']:>9}"
+            if labeled:
+                line += (f"{row['true_positives']:>7}{row['precision']:>11.3f}"
+                         f"{row['recall']:>8.3f}{row['f1']:>8.3f}")
+            print(line)
+
+
+def main():
+    """Sweep detector thresholds over a dataset."""
+    import argparse
+    from event_detector import EventDetector
+
+    parser = argparse.ArgumentParser(description='Evaluate grids of detector thresholds in one pass')
+    parser.add_argument('--data-dir', required=True, help='Directory containing input data')
+    parser.add_argument('--labels', help='Ground-truth events file (default: <data-dir>/ground_truth.jsonl if present)')
+    parser.add_argument('--grid', action='append', default=[], metavar='PARAM=VALUES',
+                        help='detector.parameter=v1,v2,... or =start:stop:step (repeatable; '
+                             'default: every sweepable parameter over a built-in grid)')
+    parser.add_argument('--thresholds', metavar='CONFIG_FILE',
+                        help='Threshold configuration for the parameters not being swept')
+    parser.add_argument('--store', help='Store in the threshold configuration whose overrides apply')
+    parser.add_argument('--output', help='Also write the results as JSON')
+
+    args = parser.parse_args()
+
+    try:
+        grids = dict(parse_grid(spec) for spec in args.grid)
+    except ValueError as e:
+        parser.error(str(e))
+    if not grids:
+        grids = {parameter: grid_values(*grid) for parameter, grid in DEFAULT_GRIDS.items()}
+    rules = ThresholdRules.load(args.thresholds, args.store) if args.thresholds else ThresholdRules()
+
+    labels_path = args.labels
+    if labels_path is None and (Path(args.data_dir) / 'ground_truth.jsonl').exists():
+        labels_path = str(Path(args.data_dir) / 'ground_truth.jsonl')
+    label_keys = load_label_keys(labels_path) if labels_path else None
+
+    detector = EventDetector(args.data_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        detector.load_data()
+    print(f"  [OK] Loaded {args.data_dir}" + (f", labels from {labels_path}" if labels_path else ""))
+
+    report = run_sweep(detector, grids, rules, label_keys)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n  [OK] Sweep results written to: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
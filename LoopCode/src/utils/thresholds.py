@@ -0,0 +1,344 @@
+"""
+Detection Threshold Configuration
+=================================
+
+Loads detector thresholds from a JSON file so they can be tuned per store
+and per station without code changes. The built-in defaults are the
+detector functions' own keyword defaults; a file overrides them in layers,
+later layers winning:
+
+    "thresholds"                              every store and station
+    "stores"[store]["thresholds"]             the store being processed
+    "stations"[station]                       a station in any store
+    "stores"[store]["stations"][station]      a station of that store
+
+For example:
+
+    {
+      "thresholds": {"weight_discrepancies": {"tolerance_percent": 12.0}},
+      "stores": {
+        "colombo-01": {
+          "thresholds": {"long_queues": {"max_customers_threshold": 6}},
+          "stations": {"SCC1": {"long_wait_times": {"max_wait_time_threshold": 240}}}
+        }
+      }
+    }
+
+The layers are resolved once, when the file is loaded: each detector gets
+its store-wide values plus groups of stations whose values differ. A run
+calls the detector once per group with the group's values bound as plain
+keyword arguments, so the per-record checks compare against constants and
+never look into the configuration.
+
+Author: Team 01
+Date: October 2025
+"""
+
+import functools
+import inspect
+import json
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from algorithms.fraud_detection import (
+    detect_scanner_avoidance_vision, detect_barcode_switching,
+    detect_weight_discrepancies, detect_success_operations
+)
+from algorithms.queue_analyzer import (
+    detect_long_queues, detect_long_wait_times,
+    predict_staffing_needs, manage_station_status
+)
+from algorithms.inventory_monitor import detect_inventory_discrepancies
+from algorithms.anomaly_detector import detect_system_crashes
+
+# Detector name -> (reference implementation, tunable keyword parameters)
+TUNABLE_DETECTORS = {
+    'success_operations': (detect_success_operations, ('weight_tolerance',)),
+    'scanner_avoidance_vision': (detect_scanner_avoidance_vision,
+                                 ('confidence_threshold', 'window_before_seconds', 'window_after_seconds')),
+    'barcode_switching': (detect_barcode_switching, ('accuracy_threshold',)),
+    'weight_discrepancies': (detect_weight_discrepancies, ('tolerance_percent',)),
+    'long_queues': (detect_long_queues, ('max_customers_threshold',)),
+    'long_wait_times': (detect_long_wait_times, ('max_wait_time_threshold',)),
+    'staffing_needs': (predict_staffing_needs, ('customer_threshold', 'wait_time_threshold')),
+    'station_status': (manage_station_status, ('open_threshold', 'close_threshold')),
+    'inventory_discrepancies': (detect_inventory_discrepancies, ('tolerance',)),
+    'system_crashes': (detect_system_crashes, ('min_gap_seconds', 'min_crash_duration'))
+}
+
+# Detectors working on store-wide data, which cannot differ per station
+STORE_LEVEL_DETECTORS = {'inventory_discrepancies'}
+
+# Detector name -> (order of its events, argument that order follows):
+#   'record'    one event at most per record, in the argument's order
+#   'station'   station by station, in order of first appearance in the argument
+#   'timeline'  as 'station', over the argument sorted by timestamp
+EVENT_ORDER = {
+    'success_operations': ('record', 0),
+    'scanner_avoidance_vision': ('record', 0),
+    'barcode_switching': ('station', 1),
+    'weight_discrepancies': ('record', 0),
+    'long_queues': ('record', 0),
+    'long_wait_times': ('record', 0),
+    'staffing_needs': ('record', 0),
+    'station_status': ('station', 0),
+    'system_crashes': ('timeline', 0)
+}
+
+
+def default_thresholds() -> Dict[str, Dict[str, float]]:
+    """Built-in thresholds (the detector functions' keyword defaults)."""
+    defaults = {}
+    for name, (func, params) in TUNABLE_DETECTORS.items():
+        signature = inspect.signature(func).parameters
+        defaults[name] = {param: signature[param].default for param in params}
+    return defaults
+
+
+def _station_of(record) -> Optional[str]:
+    """Station of a data model instance or timeline dictionary."""
+    if isinstance(record, dict):
+        return record.get('station_id', 'UNKNOWN')
+    return getattr(record, 'station_id', None)
+
+
+def _timestamp_of(record) -> str:
+    """Timestamp of a data model instance or timeline dictionary."""
+    if isinstance(record, dict):
+        return record.get('timestamp', '')
+    return record.timestamp
+
+
+def _station_ranks(records: List, by_time: bool = False) -> Dict[Optional[str], int]:
+    """Stations numbered in order of first appearance (over records sorted by timestamp if by_time)."""
+    if by_time:
+        records = sorted(records, key=_timestamp_of)
+    ranks = {}
+    for record in records:
+        ranks.setdefault(_station_of(record), len(ranks))
+    return ranks
+
+
+def _source_positions(events: List, records: List, positions: List[int]) -> List[int]:
+    """
+    Input position of the record each event was raised for.
+
+    Events must follow the records' order, one event at most per record, and
+    carry the record's station and timestamp. An event without a matching
+    record (and every event after it) sorts after all records.
+    """
+    keys = []
+    i = 0
+    for event in events:
+        station = event.event_data.get('station_id')
+        while i < len(records) and (_station_of(records[i]) != station
+                                    or _timestamp_of(records[i]) != event.timestamp):
+            i += 1
+        keys.append(positions[i] if i < len(records) else len(positions))
+        i += 1
+    return keys
+
+
+class ThresholdRules:
+    """
+    Compiled threshold configuration for one store.
+    """
+
+    def __init__(self, config: Optional[Dict] = None, store: Optional[str] = None,
+                 source: Optional[str] = None):
+        """
+        Resolve a configuration for a store.
+
+        Args:
+            config: Parsed configuration file (built-in defaults if None)
+            store: Store whose overrides apply (only file-wide ones if None)
+            source: Where the configuration came from, for messages
+
+        Raises:
+            ValueError: On an unknown store, detector or parameter, or a
+                non-numeric value
+        """
+        config = config or {}
+        self.store = store
+        self.source = source or '<config>'
+        stores = config.get('stores') or {}
+        if store is not None and store not in stores:
+            raise ValueError(f"{self.source}: unknown store {store!r}"
+                             f" (configured: {', '.join(sorted(stores)) or 'none'})")
+        store_config = stores.get(store) or {}
+
+        # Detector -> parameter -> value for the whole store
+        self.defaults = default_thresholds()
+        for layer, path in ((config.get('thresholds'), 'thresholds'),
+                            (store_config.get('thresholds'), f"stores.{store}.thresholds")):
+            self._apply(self.defaults, layer, path)
+
+        # Detector -> station -> parameter -> value, only where it differs from the store
+        self.station_values: Dict[str, Dict[str, Dict[str, float]]] = {}
+        stations = {}
+        for layer, path in ((config.get('stations'), 'stations'),
+                            (store_config.get('stations'), f"stores.{store}.stations")):
+            for station, overrides in (layer or {}).items():
+                resolved = stations.setdefault(station, {})
+                self._apply(resolved, overrides, f"{path}.{station}", station_level=True)
+        for station, overrides in stations.items():
+            for name, values in overrides.items():
+                effective = {**self.defaults[name], **values}
+                if effective != self.defaults[name]:
+                    self.station_values.setdefault(name, {})[station] = effective
+
+        # Detector -> (station -> group number, keyword arguments of each group)
+        self._groups: Dict[str, Tuple[Dict[str, int], List[Dict[str, float]]]] = {}
+        for name, by_station in self.station_values.items():
+            group_kwargs = [self.defaults[name]]
+            station_group = {}
+            for station, values in sorted(by_station.items()):
+                if values not in group_kwargs:
+                    group_kwargs.append(values)
+                station_group[station] = group_kwargs.index(values)
+            self._groups[name] = (station_group, group_kwargs)
+
+    def _apply(self, target: Dict, layer: Optional[Dict], path: str, station_level: bool = False):
+        """Validate one layer of overrides and merge it into target."""
+        for name, values in (layer or {}).items():
+            if name not in TUNABLE_DETECTORS:
+                raise ValueError(f"{self.source}: {path}: unknown detector {name!r}")
+            if station_level and name in STORE_LEVEL_DETECTORS:
+                raise ValueError(f"{self.source}: {path}: {name} thresholds apply to the whole store")
+            params = TUNABLE_DETECTORS[name][1]
+            for param, value in (values or {}).items():
+                if param not in params:
+                    raise ValueError(f"{self.source}: {path}.{name}: unknown parameter {param!r}"
+                                     f" (expected one of {', '.join(params)})")
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ValueError(f"{self.source}: {path}.{name}.{param}: expected a number, got {value!r}")
+                target.setdefault(name, {})[param] = value
+
+    @classmethod
+    def load(cls, path: str, store: Optional[str] = None) -> 'ThresholdRules':
+        """Read and compile a configuration file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config, store, source=str(path))
+
+    def values(self, name: str, station: Optional[str] = None) -> Dict[str, float]:
+        """Effective thresholds of a detector, for a station or store-wide."""
+        by_station = self.station_values.get(name, {})
+        if station is not None and station in by_station:
+            return dict(by_station[station])
+        return dict(self.defaults.get(name, {}))
+
+    def bind(self, name: str, detector: Callable) -> Callable:
+        """
+        Detector callable with this configuration's thresholds applied.
+
+        Without station overrides the store-wide values are bound with
+        functools.partial. Otherwise the returned function splits every list
+        argument by station group, calls the detector once per group and
+        merges the groups' events back into the order a single call would
+        have produced (see EVENT_ORDER).
+
+        Args:
+            name: Detector name (as used by EventDetector)
+            detector: Detector function of either backend
+
+        Returns:
+            Function taking the detector's positional arguments
+        """
+        if name not in self.defaults:
+            return detector
+        if name not in self._groups:
+            return functools.partial(detector, **self.defaults[name])
+
+        station_group, group_kwargs = self._groups[name]
+        specialized = [functools.partial(detector, **kwargs) for kwargs in group_kwargs]
+        order, order_arg = EVENT_ORDER[name]
+
+        def run_by_group(*args):
+            split_args = []
+            for arg in args:
+                if not isinstance(arg, list):
+                    split_args.append([arg] * len(specialized))
+                    continue
+                parts = [[] for _ in specialized]
+                for record in arg:
+                    parts[station_group.get(_station_of(record), 0)].append(record)
+                split_args.append(parts)
+
+            # Input positions of each group's records in the argument the order follows
+            positions = [[] for _ in specialized]
+            if order == 'record':
+                for position, record in enumerate(args[order_arg]):
+                    positions[station_group.get(_station_of(record), 0)].append(position)
+            else:
+                ranks = _station_ranks(args[order_arg], by_time=(order == 'timeline'))
+
+            keyed = []
+            for group, func in enumerate(specialized):
+                group_args = [parts[group] for parts in split_args]
+                if not any(isinstance(arg, list) and arg for arg in group_args):
+                    continue
+                events = func(*group_args)
+                if order == 'record':
+                    keys = _source_positions(events, group_args[order_arg], positions[group])
+                else:
+                    keys = [ranks.get(event.event_data.get('station_id'), len(ranks))
+                            for event in events]
+                keyed.extend(zip(keys, events))
+
+            # Stable, so events of one record or station keep the detector's order
+            keyed.sort(key=lambda pair: pair[0])
+            return [event for _, event in keyed]
+
+        return run_by_group
+
+    def describe(self) -> List[Dict]:
+        """Effective thresholds as rows of detector, parameter, value and station values."""
+        rows = []
+        for name, values in self.defaults.items():
+            by_station = self.station_values.get(name, {})
+            for param, value in values.items():
+                rows.append({
+                    'detector': name,
+                    'parameter': param,
+                    'value': value,
+                    'stations': {station: station_values[param]
+                                 for station, station_values in sorted(by_station.items())
+                                 if station_values[param] != value}
+                })
+        return rows
+
+
+def main():
+    """Show effective thresholds or write the defaults as a starting configuration."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Detection threshold configuration')
+    parser.add_argument('config', nargs='?', help='Threshold configuration file (JSON)')
+    parser.add_argument('--store', help='Store whose overrides apply')
+    parser.add_argument('--write-defaults', metavar='FILE',
+                        help='Write the built-in thresholds as a configuration file')
+
+    args = parser.parse_args()
+
+    if args.write_defaults:
+        with open(args.write_defaults, 'w', encoding='utf-8') as f:
+            json.dump({'thresholds': default_thresholds(), 'stations': {}, 'stores': {}}, f, indent=2)
+            f.write('\n')
+        print(f"  [OK] Default thresholds written to: {args.write_defaults}")
+        return 0
+
+    rules = ThresholdRules.load(args.config, args.store) if args.config else ThresholdRules()
+    print(f"{'detector':<26}{'parameter':<26}{'value':>8}  station overrides")
+    print("-" * 80)
+    for row in rules.describe():
+        overrides = ', '.join(f"{station}={value:g}" for station, value in row['stations'].items())
+        print(f"{row['detector']:<26}{row['parameter']:<26}{row['value']:>8g}  {overrides}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Pandas Backend Equivalence Tests
+================================
+
+The pandas backend (algorithms/vectorized.py) must write exactly the
+events.jsonl the python backend writes, on the competition data, on
+generated data, with the ingestion collapsers enabled and on inputs
+with empty streams. Its speedup is checked by
+"python benchmark.py --scales 50 --compare-backends", not here.
+
+Run from LoopCode:
+    python -m pytest -q tests
+
+Author: Team 01
+Date: October 2025
+"""
+
+import contextlib
+import io
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from event_detector import EventDetector
+from utils.data_generator import GeneratorConfig, generate_dataset
+
+COMPETITION_DATA = SRC_DIR / 'data' / 'input'
+
+STREAM_FILES = ('pos_transactions.jsonl', 'rfid_readings.jsonl', 'product_recognition.jsonl',
+                'queue_monitoring.jsonl', 'inventory_snapshots.jsonl')
+
+
+def detect(data_dir: Path, output: Path, backend: str, **options) -> bytes:
+    """Run the full pipeline with a backend and return events.jsonl."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    detector = EventDetector(str(data_dir), backend=backend, **options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        detector.load_data()
+        detector.run_all_detections()
+        detector.save_events(str(output))
+    return output.read_bytes()
+
+
+def assert_backends_match(data_dir: Path, tmp_path: Path, **options):
+    expected = detect(data_dir, tmp_path / 'python.jsonl', 'python', **options)
+    actual = detect(data_dir, tmp_path / 'pandas.jsonl', 'pandas', **options)
+    assert actual == expected
+
+
+@pytest.fixture(scope='module')
+def generated_data(tmp_path_factory) -> Path:
+    data_dir = tmp_path_factory.mktemp('generated')
+    generate_dataset(str(data_dir), GeneratorConfig(stations=6, hours=1.0, seed=3))
+    return data_dir
+
+
+def test_competition_data(tmp_path):
+    assert_backends_match(COMPETITION_DATA, tmp_path)
+
+
+def test_generated_data(generated_data, tmp_path):
+    assert_backends_match(generated_data, tmp_path)
+
+
+@pytest.mark.parametrize('options', [
+    {'rfid_dedup_window': 5.0},
+    {'vision_burst_window': 1.0},
+    {'rfid_dedup_window': 5.0, 'vision_burst_window': 1.0},
+], ids=['rfid-dedup', 'vision-burst', 'both'])
+def test_collapsed_ingestion(options, generated_data, tmp_path):
+    assert_backends_match(COMPETITION_DATA, tmp_path / 'competition', **options)
+    assert_backends_match(generated_data, tmp_path / 'generated', **options)
+
+
+@pytest.mark.parametrize('emptied', [(name,) for name in STREAM_FILES] + [STREAM_FILES],
+                         ids=[name.split('.')[0] for name in STREAM_FILES] + ['all'])
+def test_empty_streams(emptied, tmp_path):
+    data_dir = tmp_path / 'input'
+    shutil.copytree(COMPETITION_DATA, data_dir)
+    for name in emptied:
+        (data_dir / name).write_bytes(b'')
+    assert_backends_match(data_dir, tmp_path)
+
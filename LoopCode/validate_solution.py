@@ -12,9 +12,13 @@ Usage:
 """
 
 import os
+import sys
 from pathlib import Path
 import re
 
+# Add src to path
+sys.path.append(str(Path(__file__).parent / "src"))
+
 
 class Colors:
     OK = '\033[92m'
@@ -238,6 +242,43 @@ def validate_screenshots():
         return True
 
 
+def validate_outputs():
+    """Validate the events.jsonl files in the evidence folders"""
+    print("\n" + "="*70)
+    print("VALIDATING EVENT OUTPUTS")
+    print("="*70 + "\n")
+    
+    from utils.event_validation import validate_events_file
+    
+    root = Path(__file__).parent
+    all_ok = True
+    found = 0
+    
+    for dataset_type in ("test", "final"):
+        events_file = root / "evidence" / "output" / dataset_type / "events.jsonl"
+        if not events_file.exists():
+            print_warn(f"output/{dataset_type}/events.jsonl not found")
+            all_ok = False
+            continue
+        
+        found += 1
+        result = validate_events_file(str(events_file))
+        counts = ", ".join(f"{k}: {v}" for k, v in sorted(result.counts.items()))
+        if result.ok:
+            print_ok(f"output/{dataset_type}/events.jsonl: {result.total} valid events ({counts})")
+        else:
+            print_fail(f"output/{dataset_type}/events.jsonl: {result.error_count} problem(s) "
+                       f"in {result.total} events")
+            for line_number, message in result.errors[:10]:
+                print(f"  - line {line_number}: {message}")
+            all_ok = False
+    
+    if found == 0:
+        print_info("Run the event detector to generate outputs")
+    
+    return all_ok
+
+
 def main():
     """Main validation function"""
     print("\n" + "="*70)
@@ -247,6 +288,7 @@ def main():
     results = {
         "Structure": validate_structure(),
         "Algorithms": validate_algorithms(),
+        "Outputs": validate_outputs(),
         "Submission Guide": validate_submission_guide(),
         "Screenshots": validate_screenshots()
     }